@@ -0,0 +1,417 @@
+"""Dosya analizi.
+
+Word raporlarından ve nesting ekran görüntülerinden (OCR) metni çıkarır;
+alanlar (süre, X/Y, kalınlık, malzeme) `cikarici` ile bulunur. Toplu analiz süreç havuzunda
+çalışır; her dosyanın bir süre sınırı vardır.
+
+Sonuçlar dosya içeriğinin özetine (çıkarıcı sürümü ve malzeme listesiyle
+birlikte) göre önce
+bellekte, sonra diskte saklanır; aynı dosya ikinci kez OCR'a girmez.
+"""
+import concurrent.futures as cf
+import hashlib
+import io
+import itertools
+import json
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+import pytesseract
+from PIL import Image
+
+from cikarici import alanlari_bul
+from olcum import olcum
+
+# Word desteği
+try:
+    from docx import Document
+except ImportError:
+    pass
+
+ISCI_SAYISI = os.cpu_count() or 1
+DOSYA_SURESI = 30  # sn; dosya başına OCR sınırı
+# Çıkarma kuralları değişince artırılır; eski önbellek kayıtları kullanılmaz
+CIKARICI_SURUM = 6
+
+# OCR ön işleme
+HEDEF_GENISLIK = (1000, 2000)  # px; görüntü bu aralığa ölçeklenir
+HARF_YUKSEKLIGI = (6, 80)      # px; bunun dışındaki şekiller yazı sayılmaz
+HEDEF_HARF = 24                # px; tesseract'a giden satırların harf boyu
+BEYAZ_LISTE = "0123456789:.,|x-/ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyzÇĞİÖŞÜçğıöşü"
+# Sadece yazı satırları okunur: tek blok (psm 6) ve karakter listesi
+OCR_AYARI = f"--oem 1 --psm 6 -c tessedit_char_whitelist={BEYAZ_LISTE}"
+
+_kilit = threading.Lock()
+_havuz = None
+_is_no = itertools.count()  # işlerin havuzlar arası tekil numarası
+_baslayan = None  # işçide: başlangıç bildirimlerinin kuyruğu
+
+
+def metin_cikar(dosya, tip, zaman_asimi=0):
+    """Word dosyasının ya da resmin (OCR) metni; hata olursa fırlatır"""
+    if tip == "docx":
+        doc = Document(dosya)
+        text_list = [p.text for p in doc.paragraphs]
+        for table in doc.tables:
+            for row in table.rows:
+                text_list.append(" ".join([cell.text for cell in row.cells]))
+        return "\n".join(text_list)
+
+    return ocr_metni(np.array(Image.open(dosya).convert("L")), zaman_asimi)
+
+
+# --- OCR ÖN İŞLEME ---
+def olcekle(gri):
+    """Çok büyük ekran görüntülerini küçültür, küçükleri büyütür"""
+    w = gri.shape[1]
+    alt, ust = HEDEF_GENISLIK
+    if alt <= w <= ust: return gri
+    oran = ust / w if w > ust else min(alt / w, 3.0)
+    return cv2.resize(gri, None, fx=oran, fy=oran, interpolation=cv2.INTER_AREA if oran < 1 else cv2.INTER_CUBIC)
+
+
+def on_isle(gri):
+    """Ölçekler, koyu temayı çevirir ve uyarlamalı eşikler (yazı siyah, zemin beyaz).
+    (gri, ikili) döner"""
+    gri = olcekle(gri)
+    if gri.mean() < 127: gri = 255 - gri
+    yumusak = cv2.medianBlur(gri, 3)  # sensör/JPEG gürültüsü
+    return gri, cv2.adaptiveThreshold(yumusak, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 31, 15)
+
+
+def yazi_bolgeleri(ikili):
+    """Yazı satırlarının kutuları (x, y, w, h) ve tahmini harf boyu.
+
+    Harf boyutundaki bileşenler tutulur; çizim alanındaki parça hatları gibi
+    büyük ya da uzun ince şekiller atılır. Kalan harfler yatayda genişletilip
+    kelime/satır kutularına birleştirilir.
+    """
+    _, etiketler, stats, _ = cv2.connectedComponentsWithStats(255 - ikili, connectivity=8)
+    w, h, alan = stats[:, cv2.CC_STAT_WIDTH], stats[:, cv2.CC_STAT_HEIGHT], stats[:, cv2.CC_STAT_AREA]
+    alt, ust = HARF_YUKSEKLIGI
+    harf = (h >= alt) & (h <= ust) & (w <= 3 * h) & (alan >= 0.1 * w * h)
+    harf[0] = False  # zemin
+    if not harf.any(): return [], 0
+
+    boy = int(np.median(h[harf]))
+    maske = harf[etiketler].astype(np.uint8) * 255
+    cekirdek = cv2.getStructuringElement(cv2.MORPH_RECT, (max(2 * boy, 3), 1))
+    satirlar = cv2.dilate(maske, cekirdek)
+    sayi, kume, kutular, _ = cv2.connectedComponentsWithStats(satirlar, connectivity=8)
+    # Her kutuda kaç harf var; tek başına kalan kırıntılar (yay parçaları vb.) atılır
+    merkez = stats[harf][:, :2] + stats[harf][:, 2:4] // 2
+    harf_sayisi = np.bincount(kume[merkez[:, 1], merkez[:, 0]], minlength=sayi)
+    uygun = (harf_sayisi >= 3) & (kutular[:, 3] >= boy * 0.5) & (kutular[:, 3] <= boy * 3)
+    uygun[0] = False
+    return [tuple(int(v) for v in k[:4]) for k in kutular[uygun]], boy
+
+
+def satirlari_birlestir(gri, kutular, boy, bosluk=10):
+    """Kutuları satırlara gruplar; her satırı soldan sağa, satırları alt alta
+    tek bir beyaz görüntüye dizer (tesseract tek çağrıda okur)"""
+    satirlar = []
+    for k in sorted(kutular, key=lambda k: k[1] + k[3] / 2):
+        orta = k[1] + k[3] / 2
+        if satirlar and abs(orta - satirlar[-1][0]) <= boy * 0.6:
+            satirlar[-1][1].append(k)
+        else:
+            satirlar.append([orta, [k]])
+
+    parcalar = []
+    for _, grup in satirlar:
+        grup.sort(key=lambda k: k[0])
+        yukseklik = max(k[3] for k in grup)
+        genislik = sum(k[2] + boy for k in grup)
+        satir = np.full((yukseklik, genislik), 255, dtype=np.uint8)
+        x = 0
+        for kx, ky, kw, kh in grup:
+            satir[:kh, x:x + kw] = gri[ky:ky + kh, kx:kx + kw]
+            x += kw + boy
+        parcalar.append(satir)
+
+    genislik = max(p.shape[1] for p in parcalar) + 2 * bosluk
+    yukseklik = sum(p.shape[0] + bosluk for p in parcalar) + bosluk
+    tuval = np.full((yukseklik, genislik), 255, dtype=np.uint8)
+    y = bosluk
+    for p in parcalar:
+        tuval[y:y + p.shape[0], bosluk:bosluk + p.shape[1]] = p
+        y += p.shape[0] + bosluk
+    return tuval
+
+
+def satir_goruntusu(gri, kutular, boy):
+    """Satırları dizer, harf boyunu HEDEF_HARF'e getirir ve ikiler"""
+    tuval = satirlari_birlestir(gri, kutular, boy)
+    oran = HEDEF_HARF / boy
+    if not 0.75 <= oran <= 1.5:
+        tuval = cv2.resize(tuval, None, fx=oran, fy=oran, interpolation=cv2.INTER_AREA if oran < 1 else cv2.INTER_CUBIC)
+    tuval = cv2.medianBlur(tuval, 3)
+    return cv2.threshold(tuval, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)[1]
+
+
+def ocr_metni(gri, zaman_asimi=0):
+    """Gri görüntünün yalnızca yazı satırlarını okur; satır bulunamazsa tamamını"""
+    gri, ikili = on_isle(gri)
+    kutular, boy = yazi_bolgeleri(ikili)
+    if not kutular:
+        return pytesseract.image_to_string(Image.fromarray(ikili), timeout=zaman_asimi)
+    goruntu = Image.fromarray(satir_goruntusu(gri, kutular, boy))
+    return pytesseract.image_to_string(goruntu, config=OCR_AYARI, timeout=zaman_asimi)
+
+
+# --- SONUÇ ÖNBELLEĞİ ---
+class SonucOnbellegi:
+    """Sınırlı bellek içi LRU + yeniden başlatmada kalan disk kaydı"""
+
+    def __init__(self, klasor, boyut=512):
+        self.klasor = klasor
+        self.boyut = boyut
+        self._bellek = OrderedDict()
+        self._kilit = threading.Lock()
+
+    def _yol(self, anahtar):
+        return os.path.join(self.klasor, anahtar + ".json")
+
+    def al(self, anahtar):
+        with self._kilit:
+            if anahtar in self._bellek:
+                self._bellek.move_to_end(anahtar)
+                return dict(self._bellek[anahtar])
+        try:
+            with open(self._yol(anahtar), encoding="utf-8") as f:
+                veriler = json.load(f)
+        except (OSError, ValueError):
+            return None
+        self._bellege_koy(anahtar, veriler)
+        return dict(veriler)
+
+    def koy(self, anahtar, veriler):
+        self._bellege_koy(anahtar, dict(veriler))
+        try:
+            os.makedirs(self.klasor, exist_ok=True)
+            gecici = self._yol(anahtar) + f".{os.getpid()}.tmp"
+            with open(gecici, "w", encoding="utf-8") as f:
+                json.dump(veriler, f)
+            os.replace(gecici, self._yol(anahtar))
+        except OSError:
+            pass  # disk yazılamazsa bellekteki kayıt yeter
+
+    def _bellege_koy(self, anahtar, veriler):
+        with self._kilit:
+            self._bellek[anahtar] = veriler
+            self._bellek.move_to_end(anahtar)
+            while len(self._bellek) > self.boyut:
+                self._bellek.popitem(last=False)
+
+
+onbellek = SonucOnbellegi(os.environ.get("ANALIZ_ONBELLEK", os.path.join(".onbellek", "analiz")))
+
+
+def icerik_anahtari(ham, malzemeler=None):
+    anahtar = f"{hashlib.sha256(ham).hexdigest()}-v{CIKARICI_SURUM}"
+    if malzemeler:
+        anahtar += "-" + hashlib.sha256("\n".join(malzemeler).encode()).hexdigest()[:12]
+    return anahtar
+
+
+def analiz_et(dosya, tip, malzemeler=None):
+    ham = dosya.getvalue() if hasattr(dosya, "getvalue") else dosya.read()
+    anahtar = icerik_anahtari(ham, malzemeler)
+    veriler = onbellek.al(anahtar)
+    olcum().onbellek("ocr", veriler is not None)
+    if veriler is not None: return veriler
+    try:
+        with olcum().olc("analiz.dosya"):
+            veriler = alanlari_bul(metin_cikar(io.BytesIO(ham), tip), malzemeler)
+    except Exception as e:
+        olcum().hata("analiz_et", e, tip=tip, bayt=len(ham))
+        return alanlari_bul("", malzemeler)
+    onbellek.koy(anahtar, veriler)
+    return veriler
+
+
+# --- TOPLU ANALİZ ---
+def dosya_tipi(ad):
+    return "docx" if ad.lower().endswith(".docx") else "img"
+
+
+def _isci_baslat(baslayan):
+    global _baslayan
+    # Her işçi tek çekirdek kullansın; tesseract'ın kendi iş parçacıkları çekirdekleri boğmasın
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+    _baslayan = baslayan
+    baslayan.put((None, os.getpid(), time.time()))
+
+
+def _isci(no, ad, ham, zaman_asimi, malzemeler):
+    # Süre sınırı işin kuyrukta beklediği süreyi saymasın diye başlangıç bildirilir
+    _baslayan.put((no, os.getpid(), time.time()))
+    bas = time.perf_counter()
+    try:
+        veriler, hata = alanlari_bul(metin_cikar(io.BytesIO(ham), dosya_tipi(ad), zaman_asimi), malzemeler), None
+    except Exception as e:
+        veriler, hata = None, f"{type(e).__name__}: {e}"
+    return {"Dosya": ad, "veriler": veriler, "hata": hata, "sure": time.perf_counter() - bas}
+
+
+class _Havuz:
+    """Paylaşılan işçi havuzu, onu kullanan çağrı sayısı ve işçilerin bildirdikleri"""
+
+    def __init__(self):
+        # Streamlit çok iş parçacıklı; fork yerine spawn
+        baglam = multiprocessing.get_context("spawn")
+        self._baslayan = baglam.SimpleQueue()
+        self.havuz = cf.ProcessPoolExecutor(ISCI_SAYISI, mp_context=baglam,
+                                            initializer=_isci_baslat, initargs=(self._baslayan,))
+        self.kullanan = 0
+        self.emekli = False
+        self.pidler = set()
+        self.baslangic = {}  # iş no -> işçide başladığı an (time.time)
+        self._okuma = threading.Lock()
+
+    def topla(self):
+        """İşçilerin bildirdiği PID ve iş başlangıçlarını okur"""
+        with self._okuma:
+            while not self._baslayan.empty():
+                no, pid, an = self._baslayan.get()
+                self.pidler.add(pid)
+                if no is not None: self.baslangic[no] = an
+
+    def kapat(self):
+        """Asılı işçiler dahil havuzu kapatır"""
+        self.topla()
+        for pid in self.pidler:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except OSError:
+                pass
+        self.havuz.shutdown(wait=False, cancel_futures=True)
+
+
+def _havuz_al():
+    global _havuz
+    with _kilit:
+        if _havuz is None: _havuz = _Havuz()
+        _havuz.kullanan += 1
+        return _havuz
+
+
+def _emekli_et(h):
+    """Havuzu yeni işlere kapatır; son kullanan da bırakınca asılı işçileriyle kapatılır"""
+    global _havuz
+    with _kilit:
+        h.emekli = True
+        if _havuz is h: _havuz = None
+
+
+def _havuzu_birak(h):
+    """Çağrı havuzla işini bitirdi; emekli havuzu son bırakan kapatır.
+
+    Böylece bir çağrının zaman aşımı diğer çağrıların işlerini kesmez.
+    """
+    with _kilit:
+        h.kullanan -= 1
+        if not (h.emekli and h.kullanan == 0): return
+    h.kapat()
+
+
+def toplu_analiz(dosyalar, zaman_asimi=DOSYA_SURESI, malzemeler=None):
+    """(ad, bayt) çiftlerini paralel analiz eder; her dosyanın sonucunu bitince verir.
+
+    Sonuç: "Dosya", "veriler" (başarısızsa None), "hata", "sure", "onbellek".
+    Önbellektekiler havuza gitmez, aynı içerik bir kez işlenir; `malzemeler`
+    yoksa varsayılan liste. Havuz çökerse yarım kalanlar bir kez daha denenir.
+    """
+    malzemeler = tuple(malzemeler) if malzemeler else None
+    bekleyen = {}  # içerik anahtarı -> aynı içerikli dosya adları
+    ilk = {}
+    for ad, ham in dosyalar:
+        anahtar = icerik_anahtari(ham, malzemeler)
+        veriler = onbellek.al(anahtar)
+        olcum().onbellek("ocr", veriler is not None)
+        if veriler is not None:
+            yield {"Dosya": ad, "veriler": veriler, "hata": None, "sure": 0.0, "onbellek": True}
+            continue
+        bekleyen.setdefault(anahtar, []).append(ad)
+        ilk.setdefault(anahtar, ham)
+    if not bekleyen: return
+
+    h = _havuz_al()
+    tutulan = [h]  # bu çağrının aldığı havuzlar; sonunda hepsi bırakılır
+    isler, denenen = {}, set()  # iş -> (anahtar, havuz, no); yeniden gönderilen anahtarlar
+
+    def gonder(anahtar):
+        no = next(_is_no)
+        if h.emekli: yenile(h)
+        try:
+            is_ = h.havuz.submit(_isci, no, bekleyen[anahtar][0], ilk[anahtar], zaman_asimi, malzemeler)
+        except (cf.process.BrokenProcessPool, RuntimeError):
+            yenile(h)
+            is_ = h.havuz.submit(_isci, no, bekleyen[anahtar][0], ilk[anahtar], zaman_asimi, malzemeler)
+        isler[is_] = (anahtar, h, no)
+
+    def yenile(eski):
+        """Bozulan havuzu emekli edip yenisini alır (zaten değiştirildiyse bir şey yapmaz)"""
+        nonlocal h
+        if h is not eski: return
+        _emekli_et(h)
+        h = _havuz_al()
+        tutulan.append(h)
+
+    def basladi(havuz, no):
+        havuz.topla()
+        return havuz.baslangic.get(no)
+
+    for anahtar in bekleyen:
+        gonder(anahtar)
+    # OCR süresini işçi kendisi sınırlar; bu sınır sadece takılan işçiler için emniyet.
+    # Saat, iş işçide başlayınca işler; kuyrukta (başka çağrıların arkasında) beklemek sayılmaz
+    sinir = zaman_asimi + 5
+    try:
+        while isler:
+            biten, _ = cf.wait(isler, timeout=1.0, return_when=cf.FIRST_COMPLETED)
+            if not biten:
+                simdi = time.time()
+                for is_, (anahtar, havuz, no) in list(isler.items()):
+                    baslangic = basladi(havuz, no)
+                    if baslangic is not None and simdi - baslangic > sinir:
+                        isler.pop(is_)
+                        olcum().olay("hata", yer="toplu_analiz", hata="Zaman aşımı", dosya=bekleyen[anahtar][0])
+                        for ad in bekleyen[anahtar]:
+                            yield {"Dosya": ad, "veriler": None, "hata": "Zaman aşımı", "sure": None, "onbellek": False}
+                        # Takılan işçi yuvasını tutar; havuz yeni işlere kapanır
+                        yenile(havuz)
+                    elif baslangic is None and havuz.emekli:
+                        # Emekli havuzda henüz başlamamış iş yeni havuza taşınır (eski kopyası beklenmez)
+                        isler.pop(is_)
+                        is_.cancel()
+                        gonder(anahtar)
+                continue
+            for is_ in biten:
+                anahtar, havuz, _ = isler.pop(is_)
+                try:
+                    sonuc = is_.result()
+                except cf.process.BrokenProcessPool as e:
+                    if anahtar not in denenen:
+                        # Havuz çöktü (belki başka bir çağrının dosyası yüzünden): yeni havuzda bir kez daha
+                        denenen.add(anahtar)
+                        yenile(havuz)
+                        gonder(anahtar)
+                        continue
+                    sonuc = {"veriler": None, "hata": f"{type(e).__name__}: {e}", "sure": None}
+                except Exception as e:
+                    sonuc = {"veriler": None, "hata": f"{type(e).__name__}: {e}", "sure": None}
+                if sonuc["veriler"] is not None: onbellek.koy(anahtar, sonuc["veriler"])
+                if sonuc["sure"] is not None: olcum().sure("analiz.dosya", sonuc["sure"])
+                if sonuc["hata"]: olcum().olay("hata", yer="toplu_analiz", hata=sonuc["hata"], dosya=bekleyen[anahtar][0])
+                for ad in bekleyen[anahtar]:
+                    yield {**sonuc, "Dosya": ad, "onbellek": False}
+    finally:
+        for havuz in tutulan:
+            _havuzu_birak(havuz)
@@ -1,24 +1,29 @@
 import streamlit as st
 import pandas as pd
-from github import Github
-import io
+import hmac
+import os
+import uuid
 from datetime import datetime
-import time
-from PIL import Image
-import cv2
-import pytesseract
-import numpy as np
-import requests
 
-# Word desteği
-try:
-    from docx import Document
-except ImportError:
-    pass
+from arama import SiparisIndeksi, siparis_indeksi
+from hesap import fiyat_ayarlari
+from kur import kur_servisi
+from kuyruk import yazici
+from olcum import olcum
+from sepet import Sepet
+from veri import Islem, anlik_oku, gizli_ayar, load_data, save_data, siparis_oku
+from yerlesim import sepet_yerlesimi
 
 # --- SAYFA AYARLARI ---
 st.set_page_config(page_title="ÖZÇELİK ENDÜSTRİ", layout="wide", page_icon="🏭")
 
+# --- ÖLÇÜM ---
+# Her çalıştırmanın süre dökümü; sayfa, menünün bu çalıştırmadaki değeri
+if 'oturum' not in st.session_state: st.session_state.oturum = uuid.uuid4().hex[:8]
+olcum().calistirma_basla(st.session_state.oturum, st.session_state.get("menu", "Hesaplama"))
+# Performans sayfası yalnızca anahtar tanımlıysa ve girilince görünür
+YONETICI_ANAHTARI = os.environ.get("YONETICI_ANAHTARI") or gizli_ayar("yonetici").get("anahtar")
+
 # --- CSS (ÖZEL RENK AYARLARI - İSTEĞİNE GÖRE DÜZENLENDİ) ---
 st.markdown("""
     <style>
@@ -66,156 +71,49 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
-# --- GITHUB BAĞLANTISI ---
-def get_repo():
-    token = st.secrets["github"]["token"]
-    repo_name = st.secrets["github"]["repo_name"]
-    return Github(token).get_repo(repo_name)
-
-def load_data(filename):
-    """Veriyi okur"""
-    try:
-        repo = get_repo()
-        content = repo.get_contents(filename).decoded_content.decode()
-        df = pd.read_csv(io.StringIO(content))
-        
-        # Sütun Düzeltmeleri
-        if "musteri" in filename:
-            rename_map = {"Firma Adı": "Firma", "Yetkili Kişi": "Yetkili", "Telefon": "Tel"}
-            df.rename(columns=rename_map, inplace=True)
-            for col in ["Firma", "Yetkili", "Tel", "Adres"]:
-                if col not in df.columns: df[col] = "-"
-                
-        if "siparis" in filename:
-            rename_map = {"İş Adı": "İş", "Müşteri Adı": "Müşteri"}
-            df.rename(columns=rename_map, inplace=True)
-            for col in ["Tarih", "Müşteri", "İş", "Tutar", "Detay"]:
-                if col not in df.columns: df[col] = "-"
-
-        if "malz" in filename:
-            rename_map = {"Malzeme": "Ad", "Birim Fiyat": "Fiyat", "Yoğunluk": "Yog"}
-            df.rename(columns=rename_map, inplace=True)
-            if "Ad" not in df.columns: df["Ad"] = "Siyah Sac"
-            if "Fiyat" not in df.columns: df["Fiyat"] = 30.0
-            if "Yog" not in df.columns: df["Yog"] = 7.85
-            if "Birim" in df.columns: df = df.drop(columns=["Birim"])
-
-        return df
-    except:
-        # Varsayılanlar
-        if "ayar" in filename: return pd.DataFrame([
-            {"Key":"kar", "Val":25.0}, {"Key":"kdv", "Val":20.0}, 
-            {"Key":"lazer_dk", "Val":25.0}, {"Key":"abkant", "Val":15.0}
-        ])
-        if "malz" in filename: return pd.DataFrame([
-            {"Ad":"Siyah Sac", "Fiyat":32.0, "Yog":7.85},
-            {"Ad":"Paslanmaz", "Fiyat":180.0, "Yog":7.93},
-            {"Ad":"Galvaniz", "Fiyat":45.0, "Yog":7.85},
-            {"Ad":"ST52", "Fiyat":38.0, "Yog":7.85},
-            {"Ad":"Hardox 400", "Fiyat":90.0, "Yog":7.85},
-            {"Ad":"Hardox 450", "Fiyat":120.0, "Yog":7.85},
-            {"Ad":"Hardox 500", "Fiyat":150.0, "Yog":7.85}
-        ])
-        if "siparis" in filename: return pd.DataFrame(columns=["Tarih", "Müşteri", "İş", "Tutar", "Detay"])
-        if "musteri" in filename: return pd.DataFrame(columns=["Firma", "Yetkili", "Tel", "Adres"])
-        return pd.DataFrame()
-
-def save_data(filename, df):
-    """Veriyi kaydeder"""
-    repo = get_repo()
-    try:
-        contents = repo.get_contents(filename)
-        repo.update_file(contents.path, "Update", df.to_csv(index=False), contents.sha)
-    except:
-        repo.create_file(filename, "New", df.to_csv(index=False))
-
 # --- AYARLARI ÇEK ---
+# Yerel kopyadan gelir, depodan arka planda tazelenir
 if 'db_ayar' not in st.session_state:
-    st.session_state.db_ayar = load_data("ayarlar.csv")
+    st.session_state.db_ayar = anlik_oku("ayarlar.csv")
     
 if 'db_malz' not in st.session_state:
-    st.session_state.db_malz = load_data("malzemeler.csv")
+    st.session_state.db_malz = anlik_oku("malzemeler.csv")
 
 # Değişkenleri Yükle
-try:
-    df_a = st.session_state.db_ayar.set_index("Key")
-    KAR = float(df_a.loc["kar", "Val"])
-    KDV_ORAN = float(df_a.loc["kdv", "Val"])
-    LAZER_DK = float(df_a.loc["lazer_dk", "Val"])
-    ABKANT_TL = float(df_a.loc["abkant", "Val"])
-except:
-    KAR, KDV_ORAN, LAZER_DK, ABKANT_TL = 25.0, 20.0, 25.0, 15.0
-
-if 'canli_dolar' not in st.session_state: st.session_state.canli_dolar = 34.50
-if 'sepet' not in st.session_state: st.session_state.sepet = []
+ayar = fiyat_ayarlari(st.session_state.db_ayar)
+KAR, KDV_ORAN, LAZER_DK, ABKANT_TL = ayar["kar"], ayar["kdv"], ayar["lazer_dk"], ayar["abkant"]
 
-# --- ANALİZ ---
-def sure_cevir(zaman_str):
-    try:
-        parts = list(map(int, str(zaman_str).strip().split(':')))
-        if len(parts) == 3: return (parts[0] * 60) + parts[1] + (parts[2] / 60)
-        elif len(parts) == 2: return parts[0] + (parts[1] / 60)
-        return 0.0
-    except: return 0.0
+SAYFA_BOYUTU = 50  # Sipariş Geçmişi'nde bir sayfadaki kayıt
 
-def analiz_et(dosya, tip):
-    veriler = {"x":0.0, "y":0.0, "sure":0.0, "kal":2.0, "malz":"Siyah Sac"}
-    text = ""
-    try:
-        if tip == "docx":
-            doc = Document(dosya)
-            text_list = [p.text for p in doc.paragraphs]
-            for table in doc.tables:
-                for row in table.rows:
-                    text_list.append(" ".join([cell.text for cell in row.cells]))
-            text = "\n".join(text_list)
-        else:
-            img_np = np.array(Image.open(dosya))
-            if len(img_np.shape) == 3: img_gray = cv2.cvtColor(img_np, cv2.COLOR_RGB2GRAY)
-            else: img_gray = img_np
-            _, img_thresh = cv2.threshold(img_gray, 150, 255, cv2.THRESH_BINARY)
-            text = pytesseract.image_to_string(Image.fromarray(img_thresh))
-
-        zaman = re.search(r'(?:Kesim|Cut|Time).*?(\d{2}:\d{2}:\d{2})', text, re.IGNORECASE)
-        if zaman: veriler["sure"] = sure_cevir(zaman.group(1))
-        
-        x = re.search(r'X\s*[:|]?\s*(\d{3,5}[.,]\d+)', text)
-        y = re.search(r'Y\s*[:|]?\s*(\d{3,5}[.,]\d+)', text)
-        if x: veriler["x"] = float(x.group(1).replace(',', '.'))
-        if y: veriler["y"] = float(y.group(1).replace(',', '.'))
-        kal = re.search(r'x\s*(\d+[.,]?\d*)\s*$', text, re.MULTILINE)
-        if not kal: kal = re.search(r'3000\s*x\s*1500\s*x\s*(\d+[.,]?\d*)', text)
-        if kal: veriler["kal"] = float(kal.group(1).replace(',', '.'))
-        
-        tl = text.lower()
-        if "hardox" in tl:
-            if "400" in tl: veriler["malz"] = "Hardox 400"
-            elif "500" in tl: veriler["malz"] = "Hardox 500"
-            else: veriler["malz"] = "Hardox 450"
-        elif "st52" in tl: veriler["malz"] = "ST52"
-        elif "paslanmaz" in tl: veriler["malz"] = "Paslanmaz"
-        elif "galvaniz" in tl: veriler["malz"] = "Galvaniz"
-        
-    except: pass
-    return veriler
+kur = kur_servisi()
+if 'sepet' not in st.session_state: st.session_state.sepet = Sepet()
 
 # --- ARAYÜZ (SOL MENÜ) ---
 with st.sidebar:
     st.image("https://ozcelikendustri.com/wp-content/uploads/2021/01/logo-1.png", width=200)
     st.title("ÖZÇELİK")
-    menu = st.radio("Menü", ["Hesaplama", "Sipariş Geçmişi", "Ayarlar"])
+    sayfalar = ["Hesaplama", "Sipariş Geçmişi", "Ayarlar"]
+    if st.session_state.get("yonetici"): sayfalar.append("Performans")
+    menu = st.radio("Menü", sayfalar, key="menu")
     
     st.markdown("---")
     
     # --- BİLGİ PANELİ ---
     if st.button("🔄 Canlı Dolar Çek"):
-        try:
-            r = requests.get("https://api.exchangerate-api.com/v4/latest/USD").json()
-            st.session_state.canli_dolar = float(r["rates"]["TRY"])
-            st.success("Güncellendi")
-        except: st.error("Çekilemedi")
+        kur.tetikle()
+        st.toast("Kur arka planda güncelleniyor")
     
-    st.info(f"💲 **Dolar:** {st.session_state.canli_dolar:.2f} TL")
+    yas = kur.yas()
+    if yas is None:
+        st.warning("💲 **Dolar:** bilinmiyor")
+        st.caption("Kur hiç çekilemedi; dolar fiyatlı malzemeler fiyatlanmaz")
+    elif yas > kur.sure:
+        st.warning(f"💲 **Dolar:** {kur.deger:.2f} TL (eski)")
+        st.caption(f"{yas / 60:.0f} dk önce güncellendi")
+    else:
+        st.info(f"💲 **Dolar:** {kur.deger:.2f} TL")
+        st.caption(f"{yas / 60:.0f} dk önce güncellendi")
+    if kur.hata: st.caption(f"⚠️ Son deneme başarısız: {kur.hata}")
     st.write(f"📈 **Kâr:** %{KAR}")
     st.write(f"✂️ **Lazer:** {LAZER_DK} TL/dk")
     st.write(f"📐 **Büküm:** {ABKANT_TL} TL/vuruş")
@@ -225,9 +123,34 @@ with st.sidebar:
     
     if 'db_malz' in st.session_state and not st.session_state.db_malz.empty:
         for index, row in st.session_state.db_malz.iterrows():
-            st.write(f"▪️ **{row['Ad']}:** {row['Fiyat']} TL")
+            st.write(f"▪️ **{row['Ad']}:** {row['Fiyat']} {row.get('Para', 'TL')}")
     else:
         st.write("Veri yok")
+    
+    # --- KAYIT DURUMU ---
+    durum = yazici().durum()
+    if durum["hata"]:
+        st.error(f"⚠️ {durum['bekleyen']} kayıt yazılamadı, tekrar denenecek.\n\n{durum['hata']}")
+        if st.button("🔁 Şimdi Dene"): yazici().tetikle()
+    elif durum["bekleyen"]:
+        st.caption(f"⏳ {durum['bekleyen']} kayıt yazılıyor...")
+    if durum["bekletilen"]:
+        st.warning(f"⛔ {len(durum['bekletilen'])} kayıt tekrar tekrar yazılamadığı için bekletiliyor:\n\n"
+                   + "\n".join(f"- {k['mesaj']}: {k['hata']}" for k in durum["bekletilen"]))
+        if st.button("🔁 Bekletilenleri Yeniden Dene"): yazici().yeniden_dene()
+
+    # --- YÖNETİCİ ---
+    if YONETICI_ANAHTARI and not st.session_state.get("yonetici"):
+        with st.expander("🔒 Yönetici"):
+            girilen = st.text_input("Anahtar", type="password")
+            if girilen and hmac.compare_digest(girilen.encode(), str(YONETICI_ANAHTARI).encode()):
+                st.session_state.yonetici = True
+                st.rerun()
+            elif girilen:
+                st.caption("Anahtar yanlış")
+
+if "bildirim" in st.session_state:
+    st.toast(st.session_state.pop("bildirim"), icon="✅")
 
 # ==================================================
 # 1. HESAPLAMA
@@ -236,7 +159,7 @@ if menu == "Hesaplama":
     st.header("Teklif Hesaplayıcı")
     
     # MÜŞTERİ SEÇİMİ
-    df_mus = load_data("musteriler.csv")
+    df_mus = anlik_oku("musteriler.csv")
     kayitli_list = []
     if not df_mus.empty and "Firma" in df_mus.columns:
         kayitli_list = df_mus["Firma"].tolist()
@@ -288,23 +211,35 @@ if menu == "Hesaplama":
             if st.button("Listeye Ekle"):
                 if i_en and i_boy and i_kal:
                     carp = 1000 if birim == "m" else (10 if birim == "cm" else 1)
-                    st.session_state.sepet.append({
+                    st.session_state.sepet.ekle([{
                         "Malzeme": i_malz, "Kalınlık": float(i_kal),
                         "En": float(i_en) * carp, "Boy": float(i_boy) * carp,
                         "Adet": int(i_adet or 1), "Süre": float(i_sure or 0),
                         "Büküm": int(i_bukum or 0), "Sil": False
-                    })
+                    }])
                     st.rerun()
                 else: st.error("Ölçü girin.")
 
         with tab_dos:
             files = st.file_uploader("Dosya Yükle", type=['png', 'jpg', 'jpeg', 'docx'], accept_multiple_files=True)
-            if st.button("Analiz Et ve Ekle"):
-                for f in files:
-                    vals = {}
-                    if f.name.endswith('.docx'): vals = analiz_et(f, "docx")
-                    else: vals = analiz_et(f, "img")
-                    st.session_state.sepet.append({
+            if st.button("Analiz Et ve Ekle") and files:
+                from analiz import toplu_analiz  # OpenCV/tesseract ilk analizde yüklenir
+                ilerleme = st.progress(0.0, text="Analiz ediliyor...")
+                tablo = st.empty()
+                sonuclar, parcalar = [], []
+                malzemeler = st.session_state.db_malz["Ad"].dropna().astype(str).tolist()
+                for i, r in enumerate(toplu_analiz([(f.name, f.getvalue()) for f in files], malzemeler=malzemeler), 1):
+                    vals = r["veriler"]
+                    sonuclar.append({
+                        "Dosya": r["Dosya"], "Durum": "✅" if vals else f"❌ {r['hata']}",
+                        "Süre (sn)": r["sure"], "Önbellek": r["onbellek"],
+                        **{k: v for k, v in (vals or {}).items() if k not in ("guven", "kural")},
+                        "Güven": min(vals["guven"].values()) if vals else None
+                    })
+                    ilerleme.progress(i / len(files), text=f"{i}/{len(files)} · {r['Dosya']}")
+                    tablo.dataframe(pd.DataFrame(sonuclar), use_container_width=True)
+                    if not vals: continue
+                    parcalar.append({
                         "Malzeme": vals.get("malz", "Siyah Sac"),
                         "Kalınlık": vals.get("kal", 2.0),
                         "En": vals.get("y", 1000.0),
@@ -314,16 +249,24 @@ if menu == "Hesaplama":
                         "Büküm": 0,
                         "Sil": False
                     })
-                st.success("Eklendi")
+                st.session_state.sepet.ekle(parcalar)
+                st.session_state.analiz_sonuc = sonuclar
                 st.rerun()
+            
+            if st.session_state.get("analiz_sonuc"):
+                sonuclar = st.session_state.analiz_sonuc
+                hatali = sum(1 for r in sonuclar if r["Durum"] != "✅")
+                if hatali: st.warning(f"{hatali} dosya okunamadı.")
+                else: st.success("Eklendi")
+                st.dataframe(pd.DataFrame(sonuclar), use_container_width=True)
 
-    # Sepet
-    if st.session_state.sepet:
+    # Sepet: sadece değişen satırlar yeniden fiyatlanır, toplamlar canlı
+    sepet = st.session_state.sepet
+    if len(sepet):
         st.markdown("### 🛒 Liste")
-        df_sepet = pd.DataFrame(st.session_state.sepet)
-        
         edited_df = st.data_editor(
-            df_sepet,
+            sepet.taban,
+            key=f"sepet_{sepet.nesil}",
             num_rows="dynamic",
             use_container_width=True,
             column_config={
@@ -334,105 +277,110 @@ if menu == "Hesaplama":
             }
         )
         
-        if st.button("💰 HESAPLA", type="primary"):
-            final_sepet = [r for r in edited_df.to_dict('records') if not r.get("Sil")]
-            
-            toplam_tl = 0
-            toplam_kg = 0
-            
-            try:
-                df_m = st.session_state.db_malz.set_index("Ad")
-            except:
-                st.error("Malzeme veritabanı hatası.")
-                st.stop()
-            
-            for item in final_sepet:
-                try:
-                    # Malzeme Fiyatını Al (Sadece TL)
-                    if item["Malzeme"] in df_m.index:
-                        m_info = df_m.loc[item["Malzeme"]]
-                        m_fiyat = float(m_info["Fiyat"])
-                        m_yog = float(m_info["Yog"])
-                    else:
-                        m_fiyat = 30.0
-                        m_yog = 7.85
-                    
-                    hacim = item["En"] * item["Boy"] * item["Kalınlık"]
-                    kg = (hacim * m_yog) / 1_000_000 * item["Adet"]
-                    
-                    tutar_malz = kg * m_fiyat
-                    tutar_iscilik = (item["Süre"] * item["Adet"] * LAZER_DK) + (item["Büküm"] * item["Adet"] * ABKANT_TL)
-                    
-                    toplam_tl += tutar_malz + tutar_iscilik
-                    toplam_kg += kg
-                except: pass
-            
-            karli = toplam_tl * (1 + KAR/100)
-            kdv = karli * (KDV_ORAN/100)
-            son_fiyat = karli + kdv
-            
-            st.session_state.sonuc = {"kg": toplam_kg, "ham": toplam_tl, "son": son_fiyat, "items": final_sepet}
+        if sepet.guncelle(edited_df):
+            st.rerun()  # satır eklendi/silindi: editör yeni tabanla açılsın
+        try:
+            # Kur hiç çekilemediyse dolar fiyatlı satırlar varsayılan kurla değil, "Kur yok" ile reddedilir
+            dolar = None if kur.yas() is None else kur.deger
+            res = sepet.fiyatla(st.session_state.db_malz, KAR, KDV_ORAN, LAZER_DK, ABKANT_TL, dolar)
+        except ValueError as e:
+            st.error(f"Malzeme veritabanı hatası: {e}")
+            st.stop()
 
-        if 'sonuc' in st.session_state:
-            res = st.session_state.sonuc
-            st.divider()
-            c1, c2, c3 = st.columns(3)
-            c1.metric("Ağırlık", f"{res['kg']:.1f} kg")
-            c2.metric("Maliyet", f"{res['ham']:,.0f} TL")
-            c3.metric("TEKLİF (+KDV)", f"{res['son']:,.0f} TL")
-            
-            st.divider()
-            c_save, c_clear = st.columns([2,1])
-            not_txt = c_save.text_input("İş Notu:")
-            
-            if c_save.button("💾 MÜŞTERİYE KAYDET"):
-                with st.spinner("Kaydediliyor..."):
-                    # 1. Müşteriyi Kaydet (Eğer yoksa)
-                    df_m = load_data("musteriler.csv")
-                    # Sütun yoksa oluştur (HATA ÖNLEYİCİ)
-                    if "Firma" not in df_m.columns: 
-                        df_m = pd.DataFrame(columns=["Firma", "Yetkili", "Tel", "Adres"])
-                        
-                    if aktif_musteri not in df_m["Firma"].values:
-                        new_m = pd.DataFrame([{"Firma": aktif_musteri, "Yetkili": "-", "Tel": "-", "Adres": "-"}])
-                        save_data("musteriler.csv", pd.concat([df_m, new_m], ignore_index=True))
-                    
-                    # 2. Siparişi Kaydet
-                    df_s = load_data("siparisler.csv")
-                    new_s = pd.DataFrame([{
-                        "Tarih": datetime.now().strftime("%d-%m-%Y %H:%M"),
-                        "Müşteri": aktif_musteri,
-                        "İş": not_txt or "Genel",
-                        "Tutar": round(res["son"], 2),
-                        "Detay": f"{len(res['items'])} parça"
-                    }])
-                    save_data("siparisler.csv", pd.concat([df_s, new_s], ignore_index=True))
-                    st.success("Kaydedildi!")
-                    st.session_state.sepet = []
-                    del st.session_state.sonuc
-                    time.sleep(1)
-                    st.rerun()
-            
-            if c_clear.button("🗑️ TEMİZLE"):
-                st.session_state.sepet = []
-                if 'sonuc' in st.session_state: del st.session_state.sonuc
-                st.rerun()
+        st.divider()
+        c1, c2 = st.columns(2)
+        tam_plaka = c1.toggle("Tam plaka fiyatla", help="Malzeme, kullanılan plakaların tamamı (fire dahil) üzerinden fiyatlanır")
+        yerlesim_goster = c2.toggle("🧩 Plaka yerleşimini göster")
+        yer = None
+        if tam_plaka or yerlesim_goster:
+            # Yerleşim yalnızca fiyatlanan satırlar değişince yeniden hesaplanır;
+            # grup sonuçları önbellekte, sadece değişen grup yeniden yerleşir
+            onceki = st.session_state.get("yerlesim")
+            if onceki is None or onceki[0] is not sepet or onceki[1] != sepet.surum:
+                onceki = (sepet, sepet.surum, sepet_yerlesimi(res["satirlar"]))
+                st.session_state.yerlesim = onceki
+            yer = onceki[2]
+        if tam_plaka:
+            fire = float(yer["Fire Tutarı"].sum())
+            res = dict(res, kg=res["kg"] + float(yer["Fire Kg"].sum()), ham=res["ham"] + fire,
+                       son=res["son"] + fire * (1 + KAR / 100) * (1 + KDV_ORAN / 100))
+        c1, c2, c3 = st.columns(3)
+        c1.metric("Ağırlık", f"{res['kg']:.1f} kg")
+        c2.metric("Maliyet", f"{res['ham']:,.0f} TL")
+        c3.metric("TEKLİF (+KDV)", f"{res['son']:,.0f} TL")
+        
+        if not res["reddedilen"].empty:
+            st.warning(f"{len(res['reddedilen'])} satır hesaba katılmadı:")
+            st.dataframe(res["reddedilen"][["Malzeme", "En", "Boy", "Kalınlık", "Adet", "Sebep"]], use_container_width=True)
+        
+        with st.expander("📋 Satır Dökümü"):
+            st.dataframe(res["satirlar"][["Malzeme", "Kalınlık", "En", "Boy", "Adet", "Kg", "Malzeme Tutarı", "Lazer Tutarı", "Büküm Tutarı", "Tutar"]], use_container_width=True)
+        
+        if yerlesim_goster:
+            st.markdown(f"#### 🧩 Plaka Yerleşimi ({int(yer['Plaka Sayısı'].sum())} plaka)")
+            st.dataframe(yer, use_container_width=True, hide_index=True,
+                         column_config={c: st.column_config.NumberColumn(format="%.1f") for c in ["Plaka Kg", "Parça Kg", "Fire Kg", "Fire Tutarı"]})
+            if yer["Sığmayan"].any(): st.caption("Sığmayan parçalar plakasız, kendi ölçüsüyle fiyatlandı.")
+            if yer["Tahmini"].any(): st.caption("Tahmini: süre ya da parça sınırı yüzünden plaka sayısı kısmen alandan hesaplandı.")
+        
+        st.divider()
+        c_save, c_clear = st.columns([2,1])
+        not_txt = c_save.text_input("İş Notu:")
+        
+        if c_save.button("💾 MÜŞTERİYE KAYDET"):
+            # Müşteri (yoksa) ve sipariş tek commit'te, arka planda
+            new_m = pd.DataFrame([{"Firma": aktif_musteri, "Yetkili": "-", "Tel": "-", "Adres": "-"}])
+            new_s = pd.DataFrame([{
+                "Tarih": datetime.now().strftime("%d-%m-%Y %H:%M"),
+                "Müşteri": aktif_musteri,
+                "İş": not_txt or "Genel",
+                "Tutar": round(res["son"], 2),
+                "Detay": f"{res['satir_sayisi']} parça"
+            }])
+            Islem(f"Sipariş: {aktif_musteri}") \
+                .ekle("musteriler.csv", new_m, benzersiz="Firma") \
+                .ekle("siparisler.csv", new_s) \
+                .kuyruga_al()
+            st.session_state.bildirim = "Kaydedildi!"
+            st.session_state.sepet = Sepet()
+            st.rerun()
+        
+        if c_clear.button("🗑️ TEMİZLE"):
+            st.session_state.sepet = Sepet()
+            st.rerun()
 
 # ==================================================
 # 2. SİPARİŞ GEÇMİŞİ
 # ==================================================
 elif menu == "Sipariş Geçmişi":
     st.header("📜 Geçmiş İşler")
-    df = load_data("siparisler.csv")
-    
+    c1, c2, c3, c4 = st.columns([3, 2, 1, 1])
+    search = c1.text_input("🔍 Ara:")
+    tarih = c2.date_input("Tarih Aralığı", value=(), format="DD.MM.YYYY")
+    en_az = c3.number_input("En Az (TL)", value=None, min_value=0.0)
+    en_cok = c4.number_input("En Çok (TL)", value=None, min_value=0.0)
+    bas, son = (tuple(tarih) + (None, None))[:2]
+
+    if bas is None:
+        df = load_data("siparisler.csv")
+        indeks = siparis_indeksi(df)
+    else:
+        # Tarih seçiliyse depo yalnızca aralığı okur; küçük tabloya ayrı indeks kurulur
+        df = siparis_oku(bas, son).reset_index(drop=True)
+        indeks = SiparisIndeksi()
+        indeks.ekle(df)
+
     if df.empty:
-        st.warning("Henüz kayıt yok.")
+        st.warning("Henüz kayıt yok." if bas is None else "Bu aralıkta kayıt yok.")
     else:
-        search = st.text_input("🔍 Ara:")
-        if search:
-            mask = df.apply(lambda x: x.astype(str).str.contains(search, case=False)).any(axis=1)
-            df = df[mask]
-        
+        konumlar = indeks.ara(search, None, None, en_az, en_cok)
+        sayfa_sayisi = max(1, -(-len(konumlar) // SAYFA_BOYUTU))
+        c1, c2 = st.columns([1, 5])
+        sayfa = c1.number_input("Sayfa", min_value=1, max_value=sayfa_sayisi, value=1)
+        c2.caption(f"{len(konumlar)} kayıt · {sayfa}/{sayfa_sayisi}. sayfa")
+        df = df.iloc[konumlar[(sayfa - 1) * SAYFA_BOYUTU: sayfa * SAYFA_BOYUTU]]
+
+        df = df.set_index("ID")
         df["Sil"] = False
         cols = ["Sil", "Tarih", "Müşteri", "İş", "Tutar"]
         if "Detay" in df.columns: cols.append("Detay")
@@ -441,14 +389,9 @@ elif menu == "Sipariş Geçmişi":
         edited_hist = st.data_editor(df[mevcut_cols], hide_index=True, use_container_width=True)
         
         if st.button("🗑️ Seçili Kayıtları Sil"):
-            to_delete = edited_hist[edited_hist["Sil"]]
-            if not to_delete.empty:
-                full_df = load_data("siparisler.csv")
-                def create_key(row): return f"{row['Tarih']}_{row['Müşteri']}_{row['Tutar']}"
-                full_df['key'] = full_df.apply(create_key, axis=1)
-                to_delete['key'] = to_delete.apply(create_key, axis=1)
-                new_df = full_df[~full_df['key'].isin(to_delete['key'])].drop(columns=['key'])
-                save_data("siparisler.csv", new_df)
+            silinecek = edited_hist.index[edited_hist["Sil"]]
+            if len(silinecek):
+                Islem(f"{len(silinecek)} sipariş silindi").sil("siparisler.csv", silinecek).kuyruga_al()
                 st.success("Silindi!")
                 st.rerun()
 
@@ -458,7 +401,7 @@ elif menu == "Sipariş Geçmişi":
 elif menu == "Ayarlar":
     st.header("⚙️ Ayarlar")
     
-    tab1, tab2 = st.tabs(["Genel", "Malzemeler (TL)"])
+    tab1, tab2 = st.tabs(["Genel", "Malzemeler"])
     
     with tab1:
         c1, c2 = st.columns(2)
@@ -484,7 +427,8 @@ elif menu == "Ayarlar":
             num_rows="dynamic", 
             use_container_width=True,
             column_config={
-                "Fiyat": st.column_config.NumberColumn("Fiyat (TL)", format="%.2f")
+                "Fiyat": st.column_config.NumberColumn("Fiyat (/Kg)", format="%.2f"),
+                "Para": st.column_config.SelectboxColumn("Para", options=["TL", "USD"], default="TL", required=True)
             }
         )
         if st.button("Malzemeleri Kaydet"):
@@ -492,3 +436,58 @@ elif menu == "Ayarlar":
             st.session_state.db_malz = edited # Güncelle
             st.success("Güncellendi!")
             st.rerun()
+
+# ==================================================
+# 4. PERFORMANS (YÖNETİCİ)
+# ==================================================
+elif menu == "Performans" and st.session_state.get("yonetici"):
+    st.header("Performans")
+    o = olcum()
+    anlik = o.anlik()
+    calistirmalar = anlik["calistirmalar"][::-1]
+
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("Çalıştırma", len(calistirmalar))
+    c2.metric("GitHub İsteği", anlik["sayaclar"].get("github.istek", 0))
+    kalan = anlik["degerler"].get("github.kalan_hak")
+    c3.metric("GitHub Kalan Hak", kalan[0] if kalan else "-")
+    c4.metric("Bekleyen Kayıt", yazici().durum()["bekleyen"])
+    yas = kur.yas()
+    st.caption(f"Kur yaşı: {'-' if yas is None else f'{yas / 60:.0f} dk'} · "
+               f"Hata: {anlik['sayaclar'].get('olay.hata', 0)} · "
+               f"Günlük: {o.dosya or 'kapalı'}")
+
+    st.subheader("Son Çalıştırmalar")
+    if calistirmalar:
+        st.dataframe(pd.DataFrame([{
+            "Zaman": datetime.fromtimestamp(c["zaman"]).strftime("%H:%M:%S"), "Oturum": c["oturum"],
+            "Sayfa": c["sayfa"], "Süre (ms)": c["sure_ms"], "Tamam": c["tamam"],
+            "En Uzun": next(iter(c["dokum_ms"]), "-"),
+        } for c in calistirmalar]), use_container_width=True, hide_index=True)
+        sec = st.selectbox("Döküm", range(len(calistirmalar)),
+                           format_func=lambda i: f"{calistirmalar[i]['sayfa']} · {calistirmalar[i]['sure_ms']:.0f} ms · "
+                                                 f"{datetime.fromtimestamp(calistirmalar[i]['zaman']):%H:%M:%S}")
+        c = calistirmalar[sec]
+        dokum = pd.DataFrame([{"Ölçüm": ad, "Süre (ms)": ms, "Sayı": c["sayi"].get(ad, 0)}
+                              for ad, ms in c["dokum_ms"].items()])
+        if dokum.empty: st.caption("Bu çalıştırmada ölçülen iş yok.")
+        else: st.dataframe(dokum, use_container_width=True, hide_index=True)
+    else:
+        st.caption("Henüz tamamlanan çalıştırma yok.")
+
+    st.subheader("Süreler (p50 / p95)")
+    st.dataframe(pd.DataFrame(o.sure_tablosu()), use_container_width=True, hide_index=True,
+                 column_config={k: st.column_config.NumberColumn(format="%.1f")
+                                for k in ["p50 (ms)", "p95 (ms)", "En çok (ms)"]})
+
+    st.subheader("Önbellekler")
+    oranlar = o.isabet_oranlari()
+    st.dataframe(pd.DataFrame([{"Önbellek": ad, "İsabet": i, "Kaçırma": k, "Oran (%)": round(oran * 100, 1)}
+                               for ad, (i, k, oran) in oranlar.items()], columns=["Önbellek", "İsabet", "Kaçırma", "Oran (%)"]),
+                 use_container_width=True, hide_index=True)
+
+    with st.expander("Sayaçlar ve anlık değerler"):
+        st.json({"sayaclar": dict(sorted(anlik["sayaclar"].items())),
+                 "degerler": {ad: d for ad, (d, _) in sorted(anlik["degerler"].items())}})
+
+olcum().calistirma_bitir()
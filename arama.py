@@ -0,0 +1,140 @@
+"""Sipariş geçmişi arama indeksi.
+
+Her satırın metni Türkçe harf farkları katlanarak (İ/ı/i, ş/s ...) bir kez
+kelimelere ayrılır ve kelime -> satırlar indeksine konur. Kelimeler ayrıca
+üçlü harf gruplarıyla indekslenir: aranan parçanın üçlülerini içeren aday
+kelimeler bulunur, sözlüğün tamamı taranmaz. Eşleşen kelimelerin satırları
+birleştirilip kesiştirilir. Tarih ve tutar süzgeçleri önceden ayrıştırılmış
+dizilerde çalışır.
+
+İndeks süreç boyunca paylaşılır. Yeni gelen tablo eskisinin devamıysa
+(indekslenen satırların kimlik özeti aynıysa, sadece sona satır
+eklenmişse) yalnızca yeni satırlar indekslenir; aksi halde baştan kurulur.
+"""
+import threading
+from collections import defaultdict
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from cikarici import katla
+from olcum import olcum
+
+KOLONLAR = ["Tarih", "Müşteri", "İş", "Tutar", "Detay"]
+TARIH_BICIMI = "%d-%m-%Y %H:%M"
+
+_kilit = threading.Lock()
+_indeks = None
+
+
+class SiparisIndeksi:
+    """Sipariş tablosu üzerinde kelime indeksi ve süzgeç dizileri"""
+
+    def __init__(self):
+        self.kelime = {}  # katlanmış kelime -> artan satır numaraları
+        self.zaman = np.empty(0, dtype="datetime64[ns]")
+        self.tutar = np.empty(0, dtype=float)
+        self.ozet = 0     # indekslenen satırların kimlik özeti
+        self._kelimeler = []  # kelime numarası -> kelime
+        self._ucluler = defaultdict(list)  # üç harf (kısa kelimede kelimenin kendisi) -> kelime numaraları
+
+    @property
+    def n(self):
+        return len(self.tutar)
+
+    def ekle(self, df):
+        """Satırları indeksin sonuna ekler"""
+        if df.empty: return
+        satirlar = np.arange(self.n, self.n + len(df))
+        parcalar = defaultdict(list)
+        # Her sütunun farklı değerleri bir kez katlanıp bölünür
+        for c in [c for c in KOLONLAR if c in df.columns]:
+            kod, degerler = pd.factorize(df[c].astype(str))
+            for deger, satir in zip(degerler, _grupla(kod, len(degerler), satirlar)):
+                for k in set(katla(deger).split()):
+                    parcalar[k].append(satir)
+        for k, liste in parcalar.items():
+            eski = self.kelime.get(k)
+            yeni = liste[0] if len(liste) == 1 else np.unique(np.concatenate(liste))
+            self.kelime[k] = yeni if eski is None else np.concatenate([eski, yeni])
+            if eski is None: self._uclu_ekle(k)
+
+        zaman = pd.to_datetime(df["Tarih"], format=TARIH_BICIMI, errors="coerce").to_numpy(dtype="datetime64[ns]")
+        self.zaman = np.concatenate([self.zaman, zaman])
+        self.tutar = np.concatenate([self.tutar, pd.to_numeric(df["Tutar"], errors="coerce").to_numpy(dtype=float)])
+        self.ozet = (self.ozet + _kimlik_ozeti(df, self.n - len(df))) & _MASKE
+
+    def _uclu_ekle(self, k):
+        no = len(self._kelimeler)
+        self._kelimeler.append(k)
+        for u in {k[i:i + 3] for i in range(len(k) - 2)} if len(k) >= 3 else (k,):
+            self._ucluler[u].append(no)
+
+    def _parca_satirlari(self, parca):
+        """İçinde `parca` geçen herhangi bir kelimeye sahip satırlar"""
+        if len(parca) >= 3:
+            # Parçanın bütün üçlülerini içeren adaylar; sonra gerçekten geçiyor mu
+            listeler = sorted((self._ucluler.get(parca[i:i + 3], ()) for i in range(len(parca) - 2)), key=len)
+            adaylar = set(listeler[0]).intersection(*listeler[1:])
+            eslesen = [self._kelimeler[no] for no in adaylar if parca in self._kelimeler[no]]
+        else:
+            # Kısa parça: onu içeren her kelimenin bir üçlüsü (ya da kendisi) de onu içerir
+            eslesen = {self._kelimeler[no] for u, liste in self._ucluler.items() if parca in u for no in liste}
+        if not eslesen: return np.empty(0, dtype=int)
+        return np.unique(np.concatenate([self.kelime[k] for k in eslesen]))
+
+    def ara(self, sorgu="", bas=None, son=None, en_az=None, en_cok=None):
+        """Uyan satırların konumları (artan sırada).
+
+        Sorgudaki her parça satırdaki bir kelimenin içinde geçmelidir.
+        `bas`/`son` tarih (son gün dahil), `en_az`/`en_cok` tutar sınırlarıdır.
+        """
+        maske = np.ones(self.n, dtype=bool)
+        if bas is not None: maske &= self.zaman >= np.datetime64(bas, "ns")
+        if son is not None:
+            if isinstance(son, date) and not hasattr(son, "hour"): son = son + timedelta(days=1)
+            maske &= self.zaman < np.datetime64(son, "ns")
+        if en_az is not None: maske &= self.tutar >= en_az
+        if en_cok is not None: maske &= self.tutar <= en_cok
+
+        for parca in katla(sorgu).split():
+            uyan = np.zeros_like(maske)
+            satirlar = self._parca_satirlari(parca)
+            uyan[satirlar[satirlar < len(uyan)]] = True
+            maske &= uyan
+        return np.flatnonzero(maske)
+
+
+def _grupla(kod, sayi, satirlar):
+    """Kod başına (artan sıralı) satır dizileri"""
+    sira = np.argsort(kod, kind="stable")
+    return np.split(satirlar[sira], np.cumsum(np.bincount(kod, minlength=sayi))[:-1])
+
+
+_MASKE = (1 << 64) - 1
+
+
+def _kimlik_ozeti(df, bas=0):
+    """Kimlik (yoksa tarih) sütununun sıraya duyarlı özeti; `bas` ilk satırın konumu"""
+    kolon = df["ID"] if "ID" in df.columns else df["Tarih"]
+    h = pd.util.hash_pandas_object(kolon.astype(str), index=False, categorize=False).to_numpy()
+    agirlik = np.arange(bas, bas + len(h), dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    return int((h * agirlik).sum(dtype=np.uint64))
+
+
+def siparis_indeksi(df):
+    """Tabloya uygun paylaşılan indeks; devam eden tabloda sadece yeni satırlar eklenir"""
+    global _indeks
+    with _kilit:
+        indeks = _indeks
+        devam = (indeks is not None and len(df) >= indeks.n and indeks.n > 0
+                 and _kimlik_ozeti(df.iloc[:indeks.n]) == indeks.ozet)
+        if not devam:
+            indeks = SiparisIndeksi()
+        olcum().onbellek("arama.indeks", devam)
+        if len(df) > indeks.n:
+            with olcum().olc("arama.indeks_ekle"):
+                indeks.ekle(df.iloc[indeks.n:])
+        _indeks = indeks
+        return indeks
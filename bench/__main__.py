@@ -0,0 +1,370 @@
+"""Ölçüm takımı.
+
+Uygulamanın sıcak yollarını sentetik veriyle, ağsız ve tekrarlanabilir
+biçimde ölçer: okuma/kayıt (SQLite ve süreç içi sahte GitHub deposu),
+geçmişte arama, silme, fiyatlama ve `analiz_et`. Her ölçüm `tekrar` kez
+koşulur; ortanca, en az ve en çok süre ile (GitHub'da) çağrı başına API
+isteği raporlanır.
+
+Sonuç JSON olarak yazılabilir ve bir önceki çalıştırmayla
+karşılaştırılabilir; ortanca süresi `esik` katından fazla uzayan ya da
+isteği artan ölçüm gerileme sayılır ve çıkış kodu 1 olur. Kayıtlı metin
+örneklerinden (`bench.ornekler.METIN_ORNEKLERI`) biri yanlış çıkarsa ya da
+harfleri `analiz.BEYAZ_LISTE` dışında kalırsa da çıkış kodu 1'dir.
+
+    python -m bench [bolum ...] [--json] [--cikti sonuc.json] [--onceki eski.json]
+        [--olcek 1] [--tekrar 5] [--gecikme 0] [--esik 1.25]
+
+Bölümler: veri, arama, silme, fiyat, analiz (verilmezse hepsi). Tek konulu
+ölçümler ayrıca `bench.baslangic`, `bench.ocr` ve `bench.yerlesim`'dedir.
+
+Çalışırken yerel kopya, kuyruk, kur ve analiz önbelleği geçici bir klasöre
+yönlendirilir; gerçek depoya ve ağa dokunulmaz.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BOLUMLER = ["veri", "arama", "silme", "fiyat", "analiz"]
+ESIK = 1.25     # ortanca bu kattan fazla uzarsa gerileme
+GURULTU = 1.0   # ms; bundan küçük farklar gerileme sayılmaz
+
+
+# --- ÖLÇME ---
+def olc(fonk, tekrar, hazirla=None):
+    """fonk'u tekrar kez koşar (hazirla verilirse her seferinde önce o); süreler ms"""
+    sureler = []
+    for _ in range(tekrar):
+        arg = hazirla() if hazirla else None
+        bas = time.perf_counter()
+        fonk(arg) if hazirla else fonk()
+        sureler.append((time.perf_counter() - bas) * 1000)
+    return {"tekrar": tekrar, "ms": round(statistics.median(sureler), 3),
+            "en_az_ms": round(min(sureler), 3), "en_cok_ms": round(max(sureler), 3)}
+
+
+class Kayit:
+    """Bir bölümün ölçüm satırları"""
+
+    def __init__(self, bolum, tekrar, repo=None):
+        self.bolum, self.tekrar, self.repo = bolum, tekrar, repo
+        self.satirlar = []
+
+    def __call__(self, ad, fonk, hazirla=None, tekrar=None, **ek):
+        tekrar = tekrar or self.tekrar
+        once = sum(self.repo.istekler.values()) if self.repo else 0
+        s = {"bolum": self.bolum, "ad": ad, **olc(fonk, tekrar, hazirla), **ek}
+        if self.repo: s["istek"] = round((sum(self.repo.istekler.values()) - once) / tekrar, 2)
+        self.satirlar.append(s)
+        return s
+
+
+def _depolar(dosyalar, klasor, gecikme):
+    """Aynı veriyle doldurulmuş (ad, depo, sahte repo) çiftleri"""
+    import pandas as pd
+
+    from bench.sahte_github import SahteRepo, bagla
+    from depo_sqlite import SqliteDepo
+    from veri import duzelt
+
+    sqlite = SqliteDepo(os.path.join(klasor, f"bench-{time.monotonic_ns()}.db"))
+    tablolar = {}
+    for yol, metin in dosyalar.items():
+        filename = "siparisler.csv" if yol.startswith("siparisler/") else yol
+        tablolar.setdefault(filename, []).append(duzelt(filename, pd.read_csv(io.StringIO(metin))))
+    sqlite.uygula("kurulum", [("yaz", f, pd.concat(t, ignore_index=True), None) for f, t in tablolar.items()])
+    yield "sqlite", sqlite, None
+
+    repo = SahteRepo(dosyalar, gecikme)
+    with bagla(repo) as github:
+        yield "github", github, repo
+
+
+def _siparis(n, tohum):
+    import pandas as pd
+
+    from bench.sentetik import siparisler
+    df = siparisler(n, ["Bench Makina Ltd. Şti."], tohum=tohum)
+    return df.drop(columns=["ID"]).assign(Tarih=pd.Timestamp.now().strftime("%d-%m-%Y %H:%M"))
+
+
+# --- BÖLÜMLER ---
+def veri_bolumu(a, klasor):
+    """Soğuk/ılık okuma ve tek commit'lik kayıt"""
+    import pandas as pd
+
+    from bench.sahte_github import onbellegi_bosalt, sikistirmayi_bekle
+    from bench.sentetik import depo_dosyalari, musteriler
+    from kuyruk import Yazici
+    from veri import Islem, varsayilan
+
+    satir = int(20_000 * a.olcek)
+    dosyalar = depo_dosyalari(musteri=int(500 * a.olcek), siparis=satir)
+    sonuc = []
+    for tur, depo, repo in _depolar(dosyalar, klasor, a.gecikme):
+        k = Kayit("veri", a.tekrar, repo)
+        soguk = onbellegi_bosalt if repo else (lambda: None)
+        k(f"{tur}.oku_siparis_soguk", lambda _: depo.oku("siparisler.csv"), soguk, satir=satir)
+        k(f"{tur}.oku_siparis", lambda: depo.oku("siparisler.csv"), satir=satir)
+        k(f"{tur}.oku_musteri", lambda: depo.oku("musteriler.csv"))
+        son = pd.Timestamp.now()
+        k(f"{tur}.siparis_son_90_gun", lambda: depo.siparisler(bas=son - pd.Timedelta(days=90), son=son))
+
+        sayac = iter(range(10 ** 6))
+
+        def kaydet(_):
+            n = next(sayac)
+            yeni_m = musteriler(1, tohum=10_000 + n)
+            Islem("bench kayıt", depo).ekle("musteriler.csv", yeni_m, benzersiz="Firma") \
+                .ekle("siparisler.csv", _siparis(1, n)).kaydet()
+        k(f"{tur}.kaydet_siparis", kaydet, lambda: sikistirmayi_bekle())
+        k(f"{tur}.kaydet_ayarlar",
+          lambda: Islem("bench ayar", depo).yaz("ayarlar.csv", varsayilan("ayarlar.csv")).kaydet())
+        sikistirmayi_bekle()
+
+        # Arayüzün gördüğü: kayıt günlüğe yazılıp sıraya konunca onaylanır
+        yazici = Yazici(os.path.join(klasor, f"kuyruk-{tur}.jsonl"), depo)
+        k(f"{tur}.kuyruga_al", lambda adimlar: yazici.ekle("bench kuyruk", adimlar),
+          lambda: Islem("bench kuyruk").ekle("siparisler.csv", _siparis(1, 0)).adimlar)
+        yazici.bekle(30)
+        sikistirmayi_bekle()
+        sonuc += k.satirlar
+    return sonuc
+
+
+def arama_bolumu(a, klasor):
+    """İndeks kurma, devam eden tabloya ekleme ve sorgular"""
+    import pandas as pd
+
+    import arama
+    from bench.sentetik import musteriler, siparisler
+
+    satir = int(50_000 * a.olcek)
+    df = siparisler(satir, musteriler(500)["Firma"])
+    k = Kayit("arama", a.tekrar)
+    k("indeks_kur", lambda: arama.SiparisIndeksi().ekle(df), satir=satir)
+
+    arama._indeks = None
+    indeks = arama.siparis_indeksi(df)
+    ek = pd.concat([df, siparisler(10, ["Yeni Müşteri A.Ş."], tohum=1)], ignore_index=True)
+    k("indeks_devam_10_satir", lambda _: arama.siparis_indeksi(ek), lambda: setattr(arama, "_indeks", indeks))
+    k("indeks_ayni_tablo", lambda: arama.siparis_indeksi(ek))
+
+    indeks = arama.siparis_indeksi(ek)
+    son = pd.Timestamp.now().date()
+    for ad, sorgu in [("bos", {}), ("kelime", {"sorgu": "flanş"}), ("iki_kelime", {"sorgu": "kocaeli braket"}),
+                      ("kelime_parcasi", {"sorgu": "aş"}),
+                      ("tarih_tutar", {"bas": son - pd.Timedelta(days=90), "son": son, "en_az": 1000, "en_cok": 20000}),
+                      ("kelime_tarih", {"sorgu": "makina", "bas": son - pd.Timedelta(days=365), "son": son})]:
+        k(f"ara_{ad}", lambda: indeks.ara(**sorgu), sonuc=len(indeks.ara(**sorgu)))
+    return k.satirlar
+
+
+def silme_bolumu(a, klasor):
+    """Seçili siparişleri silip geçmişi yeniden okuma"""
+    from bench.sahte_github import sikistirmayi_bekle
+    from bench.sentetik import depo_dosyalari
+    from veri import Islem
+
+    satir = int(20_000 * a.olcek)
+    sonuc = []
+    for tur, depo, repo in _depolar(depo_dosyalari(siparis=satir, tohum=1), klasor, a.gecikme):
+        k = Kayit("silme", a.tekrar, repo)
+        kimlikler = iter(list(depo.oku("siparisler.csv")["ID"]))
+        for n in (1, 50):
+            k(f"{tur}.sil_{n}", lambda secim: Islem("bench sil", depo).sil("siparisler.csv", secim).kaydet(),
+              lambda: [next(kimlikler) for _ in range(n)])
+            sikistirmayi_bekle()
+        k(f"{tur}.oku_silme_sonrasi", lambda: depo.oku("siparisler.csv"), satir=len(depo.oku("siparisler.csv")))
+        if repo:
+            k(f"{tur}.sikistir", lambda: depo.sikistir(), tekrar=1)
+            k(f"{tur}.oku_sikistirma_sonrasi", lambda: depo.oku("siparisler.csv"))
+        sonuc += k.satirlar
+    return sonuc
+
+
+def fiyat_bolumu(a, klasor):
+    """sepet_hesapla, artımlı sepet ve toplu teklif parçası"""
+    from bench.sentetik import malzemeler, sepet
+    from hesap import VARSAYILAN_AYARLAR, sepet_hesapla
+    from sepet import Sepet
+    from toplu_teklif import parca_fiyatla
+
+    ayar = VARSAYILAN_AYARLAR
+    df_malz = malzemeler(30)
+    dolar = 35.0
+    k = Kayit("fiyat", a.tekrar)
+    for n in (100, 2000, 20_000):
+        n = max(1, int(n * a.olcek))
+        df = sepet(n, df_malz)
+        k(f"sepet_hesapla_{n}",
+          lambda: sepet_hesapla(df, df_malz, ayar["kar"], ayar["kdv"], ayar["lazer_dk"], ayar["abkant"], dolar), satir=n)
+
+    n = max(1, int(2000 * a.olcek))
+    df = sepet(n, df_malz)
+
+    def dolu_sepet():
+        s = Sepet()
+        s.ekle(df)
+        return s
+    fiyatla = lambda s: s.fiyatla(df_malz, ayar["kar"], ayar["kdv"], ayar["lazer_dk"], ayar["abkant"], dolar)
+    k(f"sepet_ilk_fiyat_{n}", fiyatla, dolu_sepet, satir=n)
+
+    s = dolu_sepet()
+    fiyatla(s)
+    sayac = iter(range(10 ** 6))
+
+    def tek_hucre(_):
+        duzenlenen = s.taban.copy()
+        duzenlenen.iloc[next(sayac) % n, duzenlenen.columns.get_loc("Adet")] += 1
+        s.taban = duzenlenen
+        s.guncelle(duzenlenen)
+        fiyatla(s)
+    k(f"sepet_tek_hucre_{n}", tek_hucre, lambda: None, satir=n)
+
+    parca = sepet(max(1, int(100_000 * a.olcek)), df_malz).drop(columns=["Sil"])
+    kaynak = (df_malz, ayar, dolar)
+    k(f"toplu_parca_{len(parca)}", lambda: parca_fiyatla(parca, kaynak, baslik=True), satir=len(parca))
+    return k.satirlar
+
+
+def analiz_bolumu(a, klasor):
+    """analiz_et: Word ve resim, önbelleksiz ve önbellekten"""
+    import numpy as np
+    import pytesseract
+    from PIL import Image
+
+    import analiz
+    from bench.ocr import dogru_alan
+    from bench.ornekler import METIN_ORNEKLERI, liste_disi, metin_dogru, resim_ornekleri
+    from bench.sentetik import docx_ornekleri
+
+    k = Kayit("analiz", a.tekrar)
+    for ad, metin, beklenen in METIN_ORNEKLERI:
+        k(f"metin.{ad}", lambda: analiz.alanlari_bul(metin),
+          dogru=metin_dogru(analiz.alanlari_bul(metin), beklenen), alan=len(beklenen),
+          liste_disi=len(liste_disi(metin, analiz.BEYAZ_LISTE)))
+    ornekler = [("docx", o) for o in docx_ornekleri()] + [("img", o) for o in resim_ornekleri()]
+    try:
+        pytesseract.get_tesseract_version()
+        tesseract = True
+    except pytesseract.TesseractNotFoundError:
+        tesseract = False
+
+    def yeni_onbellek():
+        analiz.onbellek = analiz.SonucOnbellegi(tempfile.mkdtemp(dir=klasor))
+
+    for tip, (ad, ham, beklenen) in ornekler:
+        ad = ad.rsplit(".", 1)[0]
+        if tip == "img" and not tesseract:
+            # Tesseract yoksa OCR'dan önceki kısım ölçülür
+            gri = np.array(Image.open(io.BytesIO(ham)).convert("L"))
+            k(f"img.{ad}.on_isleme", lambda: analiz.yazi_bolgeleri(analiz.on_isle(gri)[1]))
+            continue
+        bulunan = analiz.analiz_et(io.BytesIO(ham), tip)
+        k(f"{tip}.{ad}", lambda _: analiz.analiz_et(io.BytesIO(ham), tip), yeni_onbellek,
+          bayt=len(ham), dogru=dogru_alan(bulunan, beklenen))
+        k(f"{tip}.{ad}.onbellekten", lambda: analiz.analiz_et(io.BytesIO(ham), tip))
+    if not tesseract:
+        k.satirlar.append({"bolum": "analiz", "ad": "not", "not": "tesseract bulunamadı; resimlerde yalnızca ön işleme ölçüldü"})
+    return k.satirlar
+
+
+# --- KARŞILAŞTIRMA ---
+def karsilastir(sonuclar, onceki, esik=ESIK):
+    """Önceki çalıştırmaya göre oranlar; gerileyenler "gerileme": True"""
+    eski = {(s["bolum"], s["ad"]): s for s in onceki.get("sonuclar", []) if "ms" in s}
+    satirlar = []
+    for s in sonuclar:
+        e = eski.get((s["bolum"], s["ad"]))
+        if e is None or "ms" not in s: continue
+        oran = s["ms"] / e["ms"] if e["ms"] else float("inf")
+        istek = s.get("istek", 0) > e.get("istek", 0)
+        satirlar.append({"bolum": s["bolum"], "ad": s["ad"], "onceki_ms": e["ms"], "ms": s["ms"], "oran": round(oran, 3),
+                         "gerileme": bool((oran > esik and s["ms"] - e["ms"] > GURULTU) or istek)})
+    return satirlar
+
+
+def _surum():
+    try:
+        p = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                           cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        return p.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def _ortami_ayir(klasor):
+    """Yerel kopya, kuyruk, kur ve önbellekleri geçici klasöre yönlendirir (modüller yüklenmeden)"""
+    os.environ.update({
+        "DEPO_TUR": "sqlite", "DEPO_YOL": os.path.join(klasor, "veri.db"),
+        "ANLIK_KLASORU": os.path.join(klasor, "anlik"), "KUYRUK_DOSYASI": os.path.join(klasor, "kuyruk.jsonl"),
+        "KUR_DOSYASI": os.path.join(klasor, "kur.json"), "KUR_URL": "http://127.0.0.1:9/",
+        "ANALIZ_ONBELLEK": os.path.join(klasor, "analiz"), "OLCUM_DOSYASI": "",
+    })
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(prog="python -m bench", description="Sentetik veriyle ölçüm takımı")
+    p.add_argument("bolumler", nargs="*", metavar="bolum", help=", ".join(BOLUMLER))
+    p.add_argument("--json", action="store_true", help="sonucu ekrana JSON olarak yaz")
+    p.add_argument("--cikti", help="sonucun yazılacağı JSON dosyası")
+    p.add_argument("--onceki", help="karşılaştırılacak önceki sonuç dosyası")
+    p.add_argument("--olcek", type=float, default=1.0, help="veri büyüklüğü çarpanı (varsayılan 1)")
+    p.add_argument("--tekrar", type=int, default=5, help="ölçüm başına tekrar (varsayılan 5)")
+    p.add_argument("--gecikme", type=float, default=0.0, help="sahte GitHub'da istek başına gecikme (sn)")
+    p.add_argument("--esik", type=float, default=ESIK, help=f"gerileme sayılan süre oranı (varsayılan {ESIK})")
+    a = p.parse_args(sys.argv[1:] if argv is None else argv)
+    for ad in a.bolumler:
+        if ad not in BOLUMLER: p.error(f"bilinmeyen bölüm: {ad} (seçenekler: {', '.join(BOLUMLER)})")
+
+    with tempfile.TemporaryDirectory() as klasor:
+        _ortami_ayir(klasor)
+        import pandas as pd
+        sonuc = {"surum": _surum(), "zaman": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                 "python": platform.python_version(), "pandas": pd.__version__, "islemci": os.cpu_count(),
+                 "olcek": a.olcek, "tekrar": a.tekrar, "gecikme": a.gecikme, "sonuclar": []}
+        bolumler = {"veri": veri_bolumu, "arama": arama_bolumu, "silme": silme_bolumu,
+                    "fiyat": fiyat_bolumu, "analiz": analiz_bolumu}
+        for ad in a.bolumler or BOLUMLER:
+            if not a.json: print(f"--- {ad} ---", file=sys.stderr)
+            sonuc["sonuclar"] += bolumler[ad](a, klasor)
+
+    sonuc["hatali"] = [f"{s['bolum']}.{s['ad']}" for s in sonuc["sonuclar"]
+                       if s["ad"].startswith("metin.") and (s["dogru"] < s["alan"] or s["liste_disi"])]
+    if a.onceki:
+        with open(a.onceki, encoding="utf-8") as f:
+            sonuc["karsilastirma"] = karsilastir(sonuc["sonuclar"], json.load(f), a.esik)
+        sonuc["gerileme"] = sum(s["gerileme"] for s in sonuc["karsilastirma"])
+    if a.cikti:
+        with open(a.cikti, "w", encoding="utf-8") as f:
+            json.dump(sonuc, f, ensure_ascii=False, indent=2)
+
+    if a.json:
+        print(json.dumps(sonuc, ensure_ascii=False, indent=2))
+        return sonuc
+    for s in sonuc["sonuclar"]:
+        if "ms" not in s:
+            print(f"{s['bolum']:<7} {s.get('not', '')}")
+            continue
+        ek = "  ".join(f"{k} {v}" for k, v in s.items() if k not in ("bolum", "ad", "tekrar", "ms", "en_az_ms", "en_cok_ms"))
+        print(f"{s['bolum']:<7} {s['ad']:<34} {s['ms']:>10.2f} ms  ({s['en_az_ms']:.2f}-{s['en_cok_ms']:.2f})  {ek}")
+    for s in sonuc.get("karsilastirma", []):
+        if s["gerileme"]:
+            print(f"GERİLEME {s['bolum']}.{s['ad']}: {s['onceki_ms']:.2f} -> {s['ms']:.2f} ms (×{s['oran']:.2f})")
+    for ad in sonuc["hatali"]:
+        print(f"HATALI {ad}: kayıtlı metin yanlış çıkarıldı ya da harfleri OCR karakter listesinde yok")
+    if a.onceki: print(f"{sonuc['gerileme']} gerileme ({len(sonuc['karsilastirma'])} ölçüm karşılaştırıldı)")
+    return sonuc
+
+
+if __name__ == "__main__":
+    sonuc = main()
+    sys.exit(1 if sonuc.get("gerileme") or sonuc.get("hatali") else 0)
@@ -0,0 +1,85 @@
+"""Soğuk başlangıç ölçümü.
+
+Her modülün içe aktarma süresini ayrı, temiz bir yorumlayıcıda
+(`python -X importtime`) ölçer; bağımlılıklarıyla birlikte toplam süreyi
+verir. Ardından uygulamanın ilk çizimini (Streamlit AppTest ile betiğin
+ilk tam çalışması) ölçer ve ilk çizimde ağır modüllerin yüklenip
+yüklenmediğini raporlar.
+
+İlk çizim ölçümü geçici bir SQLite deposu, boş bir yerel kopya klasörü ve
+erişilemeyen bir kur adresiyle yapılır; ağ beklenmez.
+
+    python -m bench.baslangic [--json]
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+MODULLER = ["streamlit", "pandas", "numpy", "requests", "github", "cv2", "pytesseract", "PIL.Image", "docx",
+            "veri", "hesap", "arama", "kuyruk", "kur", "analiz", "depo_sqlite", "depo_github"]
+AGIR = ["cv2", "pytesseract", "docx", "github", "requests", "analiz", "depo_github"]
+
+ILK_CIZIM = """
+import json, sys, time
+bas = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file("app.py", default_timeout=60)
+hazir = time.perf_counter()
+at.run()
+bitti = time.perf_counter()
+print(json.dumps({"apptest_ms": round((hazir - bas) * 1000, 1),
+                  "ilk_cizim_ms": round((bitti - hazir) * 1000, 1),
+                  "hata": [str(e.value) for e in at.exception],
+                  "yuklenen_agir": [m for m in %r if m in sys.modules]}))
+"""
+
+
+def ice_aktarma_suresi(modul):
+    """Temiz yorumlayıcıda `import modul` süresi (ms, bağımlılıklar dahil); yoksa None"""
+    p = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {modul}"],
+                       capture_output=True, text=True)
+    if p.returncode != 0:
+        return None
+    for satir in reversed(p.stderr.splitlines()):
+        parca = [x.strip() for x in satir.split("|")]
+        if len(parca) == 3 and parca[2] == modul:
+            return round(int(parca[1]) / 1000, 1)
+    return None
+
+
+def ilk_cizim():
+    with tempfile.TemporaryDirectory() as klasor:
+        ortam = dict(os.environ, DEPO_TUR="sqlite", DEPO_YOL=os.path.join(klasor, "veri.db"),
+                     ANLIK_KLASORU=os.path.join(klasor, "anlik"), KUYRUK_DOSYASI=os.path.join(klasor, "kuyruk.jsonl"),
+                     KUR_DOSYASI=os.path.join(klasor, "kur.json"), KUR_URL="http://127.0.0.1:9/")
+        sonuc = {}
+        for tur in ["soguk", "kopyali"]:  # ikincisinde yerel kopya diskte hazır
+            p = subprocess.run([sys.executable, "-c", ILK_CIZIM % AGIR], capture_output=True, text=True, env=ortam)
+            try:
+                sonuc[tur] = json.loads(p.stdout.strip().splitlines()[-1])
+            except (IndexError, ValueError):
+                sonuc[tur] = {"hata": [p.stderr.strip()[-500:]]}
+        return sonuc
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    sonuc = {"ice_aktarma_ms": {m: ice_aktarma_suresi(m) for m in MODULLER}, "ilk_cizim": ilk_cizim()}
+
+    if "--json" in argv:
+        print(json.dumps(sonuc, ensure_ascii=False, indent=2))
+        return sonuc
+    for m, ms in sonuc["ice_aktarma_ms"].items():
+        print(f"import {m:<14} {'yok' if ms is None else f'{ms:>7.1f} ms'}")
+    for tur, s in sonuc["ilk_cizim"].items():
+        if "ilk_cizim_ms" in s:
+            print(f"ilk çizim ({tur}): {s['ilk_cizim_ms']:.0f} ms, yüklenen ağır modüller: {', '.join(s['yuklenen_agir']) or '-'}")
+        for h in s.get("hata", []):
+            print(f"  hata: {h}")
+    return sonuc
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""OCR ön işleme karşılaştırması.
+
+Eski yol (tam kare, sabit eşik, varsayılan tesseract) ile yeni yolu
+(ölçekleme, uyarlamalı eşik, yalnızca yazı satırları, psm 6 + karakter
+listesi) etiketli örnekler üzerinde karşılaştırır: resim başına süre ve
+doğru çıkarılan alan oranı.
+
+    python -m bench.ocr [--json]
+"""
+import io
+import json
+import sys
+import time
+
+import cv2
+import numpy as np
+import pytesseract
+from PIL import Image
+
+import analiz
+from bench.ornekler import resim_ornekleri
+
+ALANLAR = ["x", "y", "sure", "kal", "malz"]
+
+
+def eski_metin(gri):
+    """Önceki analiz_et'teki OCR"""
+    _, img_thresh = cv2.threshold(gri, 150, 255, cv2.THRESH_BINARY)
+    return pytesseract.image_to_string(Image.fromarray(img_thresh))
+
+
+def dogru_alan(bulunan, beklenen):
+    return sum(1 for a in ALANLAR
+               if (abs(bulunan[a] - beklenen[a]) < 0.01 if a != "malz" else bulunan[a] == beklenen[a]))
+
+
+def olc(ad_yontem, fonk, ornekler):
+    satirlar = []
+    for ad, ham, beklenen in ornekler:
+        gri = np.array(Image.open(io.BytesIO(ham)).convert("L"))
+        bas = time.perf_counter()
+        metin = fonk(gri)
+        sure = time.perf_counter() - bas
+        satirlar.append({"yontem": ad_yontem, "ornek": ad, "sure_ms": round(sure * 1000, 1),
+                         "dogru": dogru_alan(analiz.alanlari_bul(metin), beklenen), "alan": len(ALANLAR)})
+    return satirlar
+
+
+def on_isleme_suresi(ornekler):
+    """Tesseract olmadan da ölçülebilen kısım: ön işleme + satır bulma"""
+    satirlar = []
+    for ad, ham, _ in ornekler:
+        gri = np.array(Image.open(io.BytesIO(ham)).convert("L"))
+        bas = time.perf_counter()
+        gri2, ikili = analiz.on_isle(gri)
+        kutular, boy = analiz.yazi_bolgeleri(ikili)
+        goruntu = analiz.satir_goruntusu(gri2, kutular, boy) if kutular else ikili
+        sure = time.perf_counter() - bas
+        satirlar.append({"ornek": ad, "on_isleme_ms": round(sure * 1000, 1), "satir": len(kutular),
+                         "ocr_piksel_orani": round(goruntu.size / gri.size, 3)})
+    return satirlar
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    ornekler = resim_ornekleri()
+    sonuc = {"on_isleme": on_isleme_suresi(ornekler), "ocr": []}
+    try:
+        pytesseract.get_tesseract_version()
+    except pytesseract.TesseractNotFoundError:
+        sonuc["not"] = "tesseract bulunamadı; yalnızca ön işleme ölçüldü"
+    else:
+        sonuc["ocr"] = olc("eski", eski_metin, ornekler) + olc("yeni", analiz.ocr_metni, ornekler)
+
+    if "--json" in argv:
+        print(json.dumps(sonuc, ensure_ascii=False, indent=2))
+        return sonuc
+    for s in sonuc["on_isleme"]:
+        print(f"{s['ornek']:<22} ön işleme {s['on_isleme_ms']:>7.1f} ms  satır {s['satir']:>3}  OCR alanı %{s['ocr_piksel_orani'] * 100:.1f}")
+    for yontem in ["eski", "yeni"]:
+        satirlar = [s for s in sonuc["ocr"] if s["yontem"] == yontem]
+        if not satirlar: continue
+        ort = sum(s["sure_ms"] for s in satirlar) / len(satirlar)
+        dogru = sum(s["dogru"] for s in satirlar) / sum(s["alan"] for s in satirlar)
+        print(f"{yontem}: resim başına {ort:.0f} ms, doğruluk %{dogru * 100:.0f}")
+    if "not" in sonuc: print(sonuc["not"])
+    return sonuc
+
+
+if __name__ == "__main__":
+    main()
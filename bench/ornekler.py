@@ -0,0 +1,114 @@
+"""Etiketli örnek dosyalar.
+
+Nesting raporu ekran görüntülerini (açık/koyu tema, farklı çözünürlük,
+gürültü) belirli bir tohumla çizer. Her örneğin beklenen alanları
+`ETIKETLER` içindedir; dosya depoya eklenmeden her çalıştırmada aynı
+görüntü üretilir. `METIN_ORNEKLERI` çıkarıcının yanlış okuduğu görülmüş
+ya da Türkçe etiketli kayıtlı OCR metinleridir; hepsi tam doğru çıkmalı ve
+bütün harfleri OCR karakter listesinde olmalıdır.
+"""
+import io
+import random
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+# ad, beklenen alanlar ve çizim seçenekleri
+ETIKETLER = [
+    {"ad": "cypcut_acik", "sure": "00:12:30", "x": 1234.5, "y": 567.8, "kal": 4.0, "malz": "ST52",
+     "tema": "acik", "olcek": 1.0, "gurultu": 0},
+    {"ad": "cypcut_koyu", "sure": "01:05:10", "x": 2890.25, "y": 1410.0, "kal": 10.0, "malz": "Hardox 450",
+     "tema": "koyu", "olcek": 1.0, "gurultu": 0},
+    {"ad": "kucuk_ekran", "sure": "00:03:45", "x": 640.0, "y": 320.5, "kal": 2.0, "malz": "Galvaniz",
+     "tema": "acik", "olcek": 0.6, "gurultu": 0},
+    {"ad": "4k_ekran", "sure": "00:45:00", "x": 2999.9, "y": 1499.9, "kal": 8.0, "malz": "Paslanmaz",
+     "tema": "acik", "olcek": 2.0, "gurultu": 0},
+    {"ad": "gurultulu", "sure": "00:20:15", "x": 1500.0, "y": 750.0, "kal": 6.0, "malz": "ST52",
+     "tema": "acik", "olcek": 1.0, "gurultu": 25},
+    {"ad": "gurultulu_koyu", "sure": "02:10:05", "x": 3000.0, "y": 1500.0, "kal": 15.0, "malz": "Hardox 500",
+     "tema": "koyu", "olcek": 1.0, "gurultu": 20},
+]
+
+# ad, kayıtlı metin, beklenen alanlar (yalnızca kontrol edilenler)
+METIN_ORNEKLERI = [
+    ("sure_etiketi_levhali", "Cut: 3000 x 1500 x 6  Time 00:05:00", {"kal": 6.0, "sure": 5.0}),
+    ("sure_etiketi_xy", "Kesim X: 1234.5 Y: 678.9 00:10:00", {"x": 1234.5, "y": 678.9, "sure": 10.0}),
+    ("turkce_etiketler", "Kesim Süresi: 00:12:30\nKalınlık: 4 mm\nMalzeme: ST52 Çelik\n"
+                         "Ölçü X: 1234.5 Y: 567.8\nİşlem Günü: 12/03/2025\nAğırlık: 18,4 kg",
+     {"sure": 12.5, "kal": 4.0, "malz": "ST52", "x": 1234.5, "y": 567.8}),
+]
+
+MALZEME_YAZISI = {"ST52": "ST52", "Hardox 450": "HARDOX 450", "Hardox 500": "HARDOX 500",
+                  "Galvaniz": "Galvaniz", "Paslanmaz": "Paslanmaz 304"}
+
+
+def beklenen(etiket):
+    """analiz_et'in döndürmesi gereken alanlar"""
+    s, d, sn = map(int, etiket["sure"].split(":"))
+    return {"x": etiket["x"], "y": etiket["y"], "sure": s * 60 + d + sn / 60,
+            "kal": etiket["kal"], "malz": etiket["malz"]}
+
+
+def metin_dogru(bulunan, beklenen):
+    """Beklenen alanlardan doğru çıkanların sayısı"""
+    return sum(1 for a, d in beklenen.items()
+               if (bulunan[a] == d if isinstance(d, str) else abs(bulunan[a] - d) < 0.01))
+
+
+def liste_disi(metin, liste):
+    """Metindeki, OCR karakter listesinde olmayan (boşluk dışı) harfler"""
+    return sorted({c for c in metin if not c.isspace() and c not in liste})
+
+
+def nesting_resmi(etiket, tohum=0):
+    """Sol tarafta parça yerleşimi, sağda bilgi paneli olan ekran görüntüsü"""
+    rnd = random.Random(f"{etiket['ad']}-{tohum}")
+    olcek = etiket["olcek"]
+    W, H = int(1600 * olcek), int(900 * olcek)
+    zemin, yazi = ((30, 32, 36), (230, 230, 230)) if etiket["tema"] == "koyu" else ((245, 245, 245), (20, 20, 20))
+    img = Image.new("RGB", (W, H), zemin)
+    d = ImageDraw.Draw(img)
+
+    # Çizim alanı: levha ve rastgele parçalar
+    lx, ly, lw, lh = int(40 * olcek), int(60 * olcek), int(1000 * olcek), int(500 * olcek)
+    d.rectangle([lx, ly, lx + lw, ly + lh], outline=(0, 160, 255), width=max(1, int(2 * olcek)))
+    for _ in range(40):
+        w, h = rnd.randint(30, 200) * olcek, rnd.randint(30, 150) * olcek
+        x, y = lx + rnd.uniform(0, lw - w), ly + rnd.uniform(0, lh - h)
+        if rnd.random() < 0.3:
+            d.ellipse([x, y, x + w, y + w * 0.8], outline=(255, 180, 0), width=max(1, int(olcek)))
+        else:
+            d.rectangle([x, y, x + w, y + h], outline=(0, 200, 80), width=max(1, int(olcek)))
+
+    # Bilgi paneli
+    font = ImageFont.load_default(size=max(10, int(22 * olcek)))
+    satirlar = [
+        "Nesting Report",
+        f"Sheet: 3000 x 1500 x {etiket['kal']:g}",
+        f"Material: {MALZEME_YAZISI[etiket['malz']]}",
+        "Parts: %d" % rnd.randint(5, 80),
+        f"Cut Time: {etiket['sure']}",
+        f"X: {etiket['x']:.2f}",
+        f"Y: {etiket['y']:.2f}",
+        "Utilization: %d%%" % rnd.randint(50, 95),
+    ]
+    px, py = int(1100 * olcek), int(80 * olcek)
+    for i, satir in enumerate(satirlar):
+        d.text((px, py + i * int(40 * olcek)), satir, fill=yazi, font=font)
+
+    if etiket["gurultu"]:
+        arr = np.asarray(img).astype(np.int16)
+        arr += np.random.default_rng(rnd.randint(0, 2**31)).normal(0, etiket["gurultu"], arr.shape).astype(np.int16)
+        img = Image.fromarray(np.clip(arr, 0, 255).astype(np.uint8))
+    return img
+
+
+def png(img):
+    tampon = io.BytesIO()
+    img.save(tampon, format="PNG")
+    return tampon.getvalue()
+
+
+def resim_ornekleri():
+    """(ad, png baytları, beklenen alanlar) listesi"""
+    return [(e["ad"] + ".png", png(nesting_resmi(e)), beklenen(e)) for e in ETIKETLER]
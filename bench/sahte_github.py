@@ -0,0 +1,261 @@
+"""Süreç içi sahte GitHub deposu.
+
+`depo_github`'ın kullandığı PyGithub `Repository` yüzeyini (contents API:
+`get_contents` / `create_file` / `update_file` / `delete_file`; git veri
+API'si: ref, commit, tree, blob) bellekte taklit eder. Blob SHA'ları git'in
+hesapladığıyla aynıdır; 1 MB üstü dosyalarda contents API gerçeğindeki gibi
+içerik vermez. Her çağrı `istekler`de sayılır; `gecikme` verilirse her
+istek o kadar bekler (ağ gecikmesi).
+
+    repo = SahteRepo({"ayarlar.csv": "Key,Val\\nkar,25\\n"})
+    with bagla(repo) as depo:   # depo_github.GithubDepo, bu repoya bağlı
+        depo.oku("ayarlar.csv")
+    repo.istekler["get_contents"]
+"""
+import base64
+import hashlib
+import threading
+import time
+import types
+from collections import Counter
+from contextlib import contextmanager
+
+from github import GithubException, UnknownObjectException
+
+ICERIK_SINIRI = 1 << 20  # contents API bundan büyük dosyada içerik vermez
+
+
+class _Nesne(types.SimpleNamespace):
+    pass
+
+
+def blob_sha(veri):
+    return hashlib.sha1(b"blob %d\0" % len(veri) + veri).hexdigest()
+
+
+class SahteRepo:
+    """Bellekte tutulan tek dallı depo"""
+
+    default_branch = "main"
+
+    def __init__(self, dosyalar=None, gecikme=0.0):
+        self.gecikme = gecikme
+        self.istekler = Counter()
+        self.cakisma = 0      # sonraki bu kadar ref güncellemesinin önüne başka commit girer
+        self._kilit = threading.RLock()
+        self._bloblar = {}    # sha -> bayt
+        self._agaclar = {}    # sha -> {yol: blob sha}
+        self._commitler = {}  # sha -> (ağaç sha, [ebeveyn sha])
+        agac = self._agac({yol: self._blob(icerik) for yol, icerik in (dosyalar or {}).items()})
+        self.bas = self._commit(agac, [])
+
+    # --- İÇ DEPO ---
+    def _istek(self, ad):
+        self.istekler[ad] += 1
+        if self.gecikme: time.sleep(self.gecikme)
+
+    def _blob(self, icerik):
+        veri = icerik.encode() if isinstance(icerik, str) else bytes(icerik)
+        sha = blob_sha(veri)
+        self._bloblar[sha] = veri
+        return sha
+
+    def _agac(self, dosyalar):
+        sha = hashlib.sha1(repr(sorted(dosyalar.items())).encode()).hexdigest()
+        self._agaclar[sha] = dict(dosyalar)
+        return sha
+
+    def _commit(self, agac, ebeveynler):
+        sha = hashlib.sha1(f"{agac}{ebeveynler}{len(self._commitler)}".encode()).hexdigest()
+        self._commitler[sha] = (agac, list(ebeveynler))
+        return sha
+
+    def dosyalar(self):
+        """Daldaki dosyalar: yol -> blob sha"""
+        with self._kilit:
+            return dict(self._agaclar[self._commitler[self.bas][0]])
+
+    def metin(self, yol):
+        with self._kilit:
+            return self._bloblar[self.dosyalar()[yol]].decode()
+
+    def _ilerlet(self, dosyalar):
+        """Dalı verilen dosyalarla yeni bir commit'e ilerletir"""
+        self.bas = self._commit(self._agac(dosyalar), [self.bas])
+        return self.bas
+
+    def _bulunamadi(self):
+        return UnknownObjectException(404, {"message": "Not Found"}, None)
+
+    # --- CONTENTS API ---
+    def _icerik(self, yol, sha):
+        veri = self._bloblar[sha]
+        buyuk = len(veri) > ICERIK_SINIRI
+        c = _Nesne(path=yol, name=yol.rsplit("/", 1)[-1], sha=sha, size=len(veri), type="file",
+                   encoding="none" if buyuk else "base64",
+                   content="" if buyuk else base64.b64encode(veri).decode(),
+                   decoded_content=None if buyuk else veri)
+
+        def update():
+            """Koşullu istek: dosya değişmediyse False (304)"""
+            with self._kilit:
+                self._istek("get_contents")
+                yeni = self.dosyalar().get(yol)
+                if yeni is None: raise self._bulunamadi()
+                if yeni == c.sha: return False
+                c.__dict__.update(self._icerik(yol, yeni).__dict__)
+                return True
+
+        c.update = update
+        return c
+
+    def get_contents(self, path, ref=None):
+        with self._kilit:
+            self._istek("get_contents")
+            dosyalar = self.dosyalar()
+            if path in dosyalar: return self._icerik(path, dosyalar[path])
+            onek = path.rstrip("/") + "/"
+            # Klasör: yalnızca doğrudan altındakiler
+            icindekiler = sorted({yol[len(onek):].split("/", 1)[0] for yol in dosyalar if yol.startswith(onek)})
+            if not icindekiler: raise self._bulunamadi()
+            return [self._icerik(onek + ad, dosyalar[onek + ad]) if onek + ad in dosyalar
+                    else _Nesne(path=onek + ad, name=ad, sha=None, type="dir") for ad in icindekiler]
+
+    def create_file(self, path, message, content, branch=None):
+        with self._kilit:
+            self._istek("create_file")
+            dosyalar = self.dosyalar()
+            if path in dosyalar: raise GithubException(422, {"message": "sha wasn't supplied"}, None)
+            dosyalar[path] = self._blob(content)
+            commit = self._ilerlet(dosyalar)
+            return {"content": self._icerik(path, dosyalar[path]), "commit": _Nesne(sha=commit)}
+
+    def update_file(self, path, message, content, sha, branch=None):
+        with self._kilit:
+            self._istek("update_file")
+            dosyalar = self.dosyalar()
+            if path not in dosyalar: raise self._bulunamadi()
+            if dosyalar[path] != sha: raise GithubException(409, {"message": f"{path} does not match {sha}"}, None)
+            dosyalar[path] = self._blob(content)
+            commit = self._ilerlet(dosyalar)
+            return {"content": self._icerik(path, dosyalar[path]), "commit": _Nesne(sha=commit)}
+
+    def delete_file(self, path, message, sha, branch=None):
+        with self._kilit:
+            self._istek("delete_file")
+            dosyalar = self.dosyalar()
+            if path not in dosyalar: raise self._bulunamadi()
+            if dosyalar.pop(path) != sha: raise GithubException(409, {"message": f"{path} does not match {sha}"}, None)
+            return {"content": None, "commit": _Nesne(sha=self._ilerlet(dosyalar))}
+
+    # --- GIT VERİ API'Sİ ---
+    def get_git_ref(self, ref):
+        with self._kilit:
+            self._istek("get_git_ref")
+            if ref != f"heads/{self.default_branch}": raise self._bulunamadi()
+            nesne = _Nesne(ref=f"refs/{ref}", object=_Nesne(sha=self.bas, type="commit"))
+
+        def update():
+            """Koşullu istek: dal ilerlemediyse False (304)"""
+            with self._kilit:
+                self._istek("get_git_ref")
+                if nesne.object.sha == self.bas: return False
+                nesne.object.sha = self.bas
+                return True
+
+        def edit(sha, force=False):
+            with self._kilit:
+                self._istek("edit_git_ref")
+                if self.cakisma:
+                    # Başka bir oturum araya commit atmış gibi
+                    self.cakisma -= 1
+                    self._ilerlet(self.dosyalar())
+                if not force and self._commitler[sha][1] != [self.bas]:
+                    raise GithubException(422, {"message": "Update is not a fast forward"}, None)
+                self.bas = nesne.object.sha = sha
+
+        nesne.update, nesne.edit = update, edit
+        return nesne
+
+    def get_git_commit(self, sha):
+        with self._kilit:
+            self._istek("get_git_commit")
+            agac, ebeveynler = self._commitler[sha]
+            return _Nesne(sha=sha, tree=_Nesne(sha=agac), parents=[_Nesne(sha=e) for e in ebeveynler])
+
+    def get_git_tree(self, sha, recursive=False):
+        with self._kilit:
+            self._istek("get_git_tree")
+            dosyalar = self._agaclar[sha]
+            if recursive:
+                return _Nesne(sha=sha, tree=[_Nesne(path=yol, sha=b, type="blob", mode="100644")
+                                             for yol, b in sorted(dosyalar.items())])
+            # Yalnızca doğrudan altındakiler; klasörler alt ağaç olarak
+            klasorler = {}
+            for yol, b in dosyalar.items():
+                if "/" in yol:
+                    ad, kalan = yol.split("/", 1)
+                    klasorler.setdefault(ad, {})[kalan] = b
+            ogeler = [_Nesne(path=yol, sha=b, type="blob", mode="100644") for yol, b in dosyalar.items() if "/" not in yol]
+            ogeler += [_Nesne(path=ad, sha=self._agac(alt), type="tree", mode="040000") for ad, alt in klasorler.items()]
+            return _Nesne(sha=sha, tree=sorted(ogeler, key=lambda o: o.path))
+
+    def get_git_blob(self, sha):
+        with self._kilit:
+            self._istek("get_git_blob")
+            if sha not in self._bloblar: raise self._bulunamadi()
+            veri = self._bloblar[sha]
+            return _Nesne(sha=sha, size=len(veri), encoding="base64", content=base64.b64encode(veri).decode())
+
+    def create_git_tree(self, tree, base_tree=None):
+        with self._kilit:
+            self._istek("create_git_tree")
+            dosyalar = dict(self._agaclar[base_tree.sha]) if base_tree is not None else {}
+            for oge in tree:
+                o = oge._identity
+                if "content" in o:
+                    dosyalar[o["path"]] = self._blob(o["content"])
+                elif o.get("sha") is None:
+                    dosyalar.pop(o["path"], None)  # sha=None: dosyayı siler
+                else:
+                    dosyalar[o["path"]] = o["sha"]
+            return _Nesne(sha=self._agac(dosyalar))
+
+    def create_git_commit(self, message, tree, parents):
+        with self._kilit:
+            self._istek("create_git_commit")
+            return _Nesne(sha=self._commit(tree.sha, [p.sha for p in parents]), message=message)
+
+
+@contextmanager
+def bagla(repo):
+    """`depo_github`'ı bu repoya bağlar ve önbelleklerini boşaltır; GithubDepo verir.
+
+    Çıkışta önceki bağlantı ve önbellekler geri konur.
+    """
+    import depo_github as dg
+    eski = (dg._repo, dg._icerikler, dg._tablolar, dg._yol_sha, dg._birlesik, dg._dal, dg._liste)
+    dg._repo, dg._icerikler, dg._tablolar, dg._yol_sha = repo, {}, {}, {}
+    dg._birlesik, dg._dal, dg._liste = (None, None), None, (None, None, {})
+    try:
+        yield dg.GithubDepo()
+    finally:
+        dg._repo, dg._icerikler, dg._tablolar, dg._yol_sha, dg._birlesik, dg._dal, dg._liste = eski
+
+
+def onbellegi_bosalt():
+    """Bağlı depo kalırken `depo_github`'ın tablo önbelleklerini boşaltır (soğuk okuma)"""
+    import depo_github as dg
+    with dg._onbellek:
+        dg._icerikler.clear()
+        dg._tablolar.clear()
+        dg._yol_sha.clear()
+    dg._birlesik = (None, None)
+    dg._dal, dg._liste = None, (None, None, {})
+
+
+def sikistirmayi_bekle():
+    """Arka planda başlamış sipariş sıkıştırması varsa bitmesini bekler"""
+    import depo_github as dg
+    with dg._sikistirma:
+        pass
@@ -0,0 +1,141 @@
+"""Sentetik atölye verisi.
+
+Müşteri, sipariş, malzeme tabloları ve sepetler belirli bir tohumla
+üretilir; aynı tohum her çalıştırmada aynı tabloyu verir. `depo_dosyalari`
+bunları depodaki biçimiyle (siparişler aylık/yıllık parçalarda) CSV metni
+olarak döner. Word raporları (`docx_ornekleri`) ve nesting ekran
+görüntüleri (`bench.ornekler`) beklenen alanlarıyla birlikte verilir.
+"""
+import io
+import random
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from veri import SIPARIS_KOLONLARI, varsayilan
+
+SEHIRLER = ["İstanbul", "Kocaeli", "Bursa", "İzmir", "Ankara", "Konya", "Kayseri", "Manisa"]
+EKLER = ["Makina", "Metal", "Çelik", "Otomotiv", "Yapı", "Enerji", "Tarım Makinaları", "Savunma"]
+TURLER = ["Ltd. Şti.", "A.Ş.", "San. ve Tic."]
+ISLER = ["Flanş", "Braket", "Kapak", "Taban Sacı", "Bağlantı Plakası", "Kasa", "Raf", "Koruyucu", "Şase", "Menteşe"]
+MALZEME_ADLARI = ["ST37", "S235", "S355", "DKP", "HRP", "Alüminyum 5754", "Alüminyum 1050", "Bakır", "Pirinç",
+                  "Corten", "Domex 700", "AISI 316", "AISI 430", "Trapez Sac"]
+
+
+# --- TABLOLAR ---
+def musteriler(n, tohum=0):
+    r = random.Random(tohum)
+    adlar, goruldu = [], set()
+    while len(adlar) < n:
+        ad = f"{r.choice(SEHIRLER)} {r.choice(EKLER)} {r.choice(TURLER)}"
+        if ad in goruldu: ad = f"{ad} {len(adlar)}"
+        goruldu.add(ad)
+        adlar.append(ad)
+    return pd.DataFrame({"Firma": adlar,
+                         "Yetkili": [f"{r.choice('ABCDEFGHİKMNOSTY')}. {r.choice(['Yılmaz', 'Kaya', 'Demir', 'Şahin', 'Çelik', 'Öztürk'])}" for _ in adlar],
+                         "Tel": [f"05{r.randint(30, 59)}{r.randint(1000000, 9999999)}" for _ in adlar],
+                         "Adres": [r.choice(SEHIRLER) for _ in adlar]})
+
+
+def siparisler(n, firmalar, tohum=0, yil=3, son=None):
+    """Son `yil` yıla yayılmış, zamana göre sıralı n sipariş"""
+    g = np.random.default_rng(tohum)
+    son = son or datetime(datetime.now().year, datetime.now().month, 1)
+    dakika = np.sort(g.integers(0, yil * 365 * 24 * 60, n))
+    zaman = [son - timedelta(minutes=int(d)) for d in dakika[::-1]]
+    firmalar = list(firmalar)
+    df = pd.DataFrame({
+        "Tarih": [z.strftime("%d-%m-%Y %H:%M") for z in zaman],
+        "Müşteri": [firmalar[i] for i in g.integers(0, len(firmalar), n)],
+        "İş": [f"{ISLER[i]} {j}" for i, j in zip(g.integers(0, len(ISLER), n), g.integers(1, 500, n))],
+        "Tutar": np.round(g.lognormal(8, 1.2, n), 2),
+        "Detay": [f"{k} parça" for k in g.integers(1, 60, n)],
+    })
+    df["ID"] = [f"s{i:015x}" for i in g.integers(0, 1 << 60, n)]
+    return df[SIPARIS_KOLONLARI + ["ID"]]
+
+
+def malzemeler(n=0, tohum=0):
+    """Varsayılan malzemeler ve (n > 0 ise) n uydurma malzeme; bir kısmı dolar fiyatlı"""
+    r = random.Random(tohum)
+    df = varsayilan("malzemeler.csv")
+    ek = [{"Ad": f"{MALZEME_ADLARI[i % len(MALZEME_ADLARI)]}" + (f" {i // len(MALZEME_ADLARI)}" if i >= len(MALZEME_ADLARI) else ""),
+           "Fiyat": round(r.uniform(25, 400), 2), "Yog": r.choice([2.7, 7.85, 7.93, 8.9]),
+           "Para": "USD" if r.random() < 0.2 else "TL"} for i in range(n)]
+    return pd.concat([df, pd.DataFrame(ek, columns=df.columns)], ignore_index=True) if ek else df
+
+
+def sepet(n, df_malz, tohum=0, hatali=0.02):
+    """n satırlık sepet; `hatali` oranında reddedilecek (sıfır ölçülü) satır"""
+    g = np.random.default_rng(tohum)
+    adlar = list(df_malz["Ad"])
+    df = pd.DataFrame({
+        "Malzeme": [adlar[i] for i in g.integers(0, len(adlar), n)],
+        "Kalınlık": g.choice([1.0, 1.5, 2.0, 3.0, 4.0, 5.0, 6.0, 8.0, 10.0], n),
+        "En": np.round(g.uniform(20, 1500, n), 1),
+        "Boy": np.round(g.uniform(20, 1000, n), 1),
+        "Adet": g.integers(1, 50, n),
+        "Süre": np.round(g.uniform(0.1, 15, n), 2),
+        "Büküm": g.integers(0, 8, n),
+        "Sil": False,
+    })
+    bozuk = g.random(n) < hatali
+    df.loc[bozuk, "En"] = 0.0
+    return df
+
+
+def depo_dosyalari(musteri=200, siparis=5000, malzeme=0, tohum=0):
+    """Depo yolu -> CSV metni; siparişler aylık parçalarda, geçmiş yıllar yıllık"""
+    df_m = musteriler(musteri, tohum)
+    df_s = siparisler(siparis, df_m["Firma"], tohum)
+    dosyalar = {"ayarlar.csv": varsayilan("ayarlar.csv").to_csv(index=False),
+                "malzemeler.csv": malzemeler(malzeme, tohum).to_csv(index=False),
+                "musteriler.csv": df_m.to_csv(index=False)}
+    zaman = pd.to_datetime(df_s["Tarih"], format="%d-%m-%Y %H:%M")
+    bu_yil = datetime.now().year
+    parca = np.where(zaman.dt.year < bu_yil, zaman.dt.strftime("%Y"), zaman.dt.strftime("%Y-%m"))
+    for ad, grup in df_s.groupby(parca, sort=True):
+        dosyalar[f"siparisler/{ad}.csv"] = grup.to_csv(index=False)
+    return dosyalar
+
+
+# --- DOSYA ÖRNEKLERİ ---
+DOCX_ETIKETLERI = [
+    {"ad": "rapor_paragraf.docx", "sure": "00:12:30", "x": 1234.5, "y": 567.8, "kal": 3.0, "malz": "Paslanmaz",
+     "malz_yazisi": "Paslanmaz 304", "tablo": False},
+    {"ad": "rapor_tablo.docx", "sure": "01:02:03", "x": 2450.0, "y": 1220.25, "kal": 8.0, "malz": "Hardox 450",
+     "malz_yazisi": "HARDOX 450", "tablo": True},
+    {"ad": "rapor_uzun.docx", "sure": "00:45:10", "x": 2999.9, "y": 1499.9, "kal": 12.0, "malz": "ST52",
+     "malz_yazisi": "ST-52", "tablo": True, "ek_paragraf": 300},
+]
+
+
+def docx_raporu(etiket):
+    """Nesting raporunu Word dosyası olarak üretir"""
+    from docx import Document
+    doc = Document()
+    doc.add_heading("Kesim Raporu", 1)
+    alanlar = [("Malzeme", etiket["malz_yazisi"]), ("Kalınlık (mm)", f"{etiket['kal']:g}"),
+               ("Levha", f"3000 x 1500 x {etiket['kal']:g}"), ("Kesim Süresi", etiket["sure"]),
+               ("X", f"{etiket['x']:.2f}"), ("Y", f"{etiket['y']:.2f}")]
+    if etiket["tablo"]:
+        tablo = doc.add_table(rows=0, cols=2)
+        for ad, deger in alanlar:
+            hucre = tablo.add_row().cells
+            hucre[0].text, hucre[1].text = f"{ad}:", deger
+    else:
+        for ad, deger in alanlar:
+            doc.add_paragraph(f"{ad}: {deger}")
+    r = random.Random(etiket["ad"])
+    for i in range(etiket.get("ek_paragraf", 0)):
+        doc.add_paragraph(f"Parça {i + 1}: {r.choice(ISLER)} {r.randint(10, 900)} adet")
+    tampon = io.BytesIO()
+    doc.save(tampon)
+    return tampon.getvalue()
+
+
+def docx_ornekleri():
+    """(ad, docx baytları, beklenen alanlar) listesi"""
+    from bench.ornekler import beklenen
+    return [(e["ad"], docx_raporu(e), beklenen(e)) for e in DOCX_ETIKETLERI]
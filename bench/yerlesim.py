@@ -0,0 +1,92 @@
+"""Plaka yerleşimi ölçümü.
+
+Sentetik parça listelerinde (farklı boyut ve adetlerde) yerleşim süresini,
+plaka sayısını, doluluğu ve alan alt sınırına (toplam parça alanı / plaka
+alanı) göre fazlalığı ölçer. Ardından çok gruplu bir sepette tek satır
+değişince (önbellekle) yeniden yerleşim süresini ölçer.
+
+    python -m bench.yerlesim [--json]
+"""
+import json
+import math
+import random
+import sys
+import time
+
+import pandas as pd
+
+from yerlesim import PLAKALAR, grup_yerlesimi, sepet_yerlesimi
+
+PARCA_SAYILARI = [50, 200, 500]
+
+
+def parca_listesi(n, tohum=0):
+    """Karışık boyutlu n parça: çoğu küçük, birkaçı büyük"""
+    r = random.Random(tohum)
+    parcalar = []
+    for _ in range(n):
+        if r.random() < 0.1:
+            parcalar.append((float(r.randint(800, 2800)), float(r.randint(400, 1400))))
+        else:
+            parcalar.append((float(r.randint(40, 700)), float(r.randint(40, 500))))
+    return tuple(parcalar)
+
+
+def sepet_tablosu(n, tohum=0):
+    r = random.Random(tohum)
+    gruplar = [("Siyah Sac", 2.0), ("Siyah Sac", 3.0), ("Paslanmaz", 1.5), ("Galvaniz", 1.0)]
+    satirlar = []
+    for w, h in parca_listesi(n, tohum):
+        malz, kal = r.choice(gruplar)
+        satirlar.append({"Malzeme": malz, "Kalınlık": kal, "En": w, "Boy": h, "Adet": r.randint(1, 3),
+                         "Yog": 7.85, "Fiyat": 30.0})
+    return pd.DataFrame(satirlar)
+
+
+def grup_olcumu():
+    satirlar = []
+    for n in PARCA_SAYILARI:
+        parcalar = parca_listesi(n, tohum=n)
+        grup_yerlesimi.cache_clear()
+        bas = time.perf_counter()
+        y = grup_yerlesimi(parcalar)
+        sure = time.perf_counter() - bas
+        alt_sinir = math.ceil(sum(w * h for w, h in parcalar) / (y["plaka"][0] * y["plaka"][1]))
+        satirlar.append({"parca": n, "sure_ms": round(sure * 1000, 1), "plaka": list(y["plaka"]),
+                         "plaka_sayisi": y["sayi"], "alt_sinir": alt_sinir, "doluluk": round(y["doluluk"], 3)})
+    return satirlar
+
+
+def sepet_olcumu(n=400):
+    df = sepet_tablosu(n)
+    grup_yerlesimi.cache_clear()
+    bas = time.perf_counter()
+    sepet_yerlesimi(df)
+    ilk = time.perf_counter() - bas
+
+    df.loc[0, "Adet"] += 1  # tek satır değişir, yalnızca onun grubu yeniden yerleşir
+    bas = time.perf_counter()
+    tablo = sepet_yerlesimi(df)
+    tekrar = time.perf_counter() - bas
+    return {"satir": n, "parca": int(df["Adet"].sum()), "grup": len(tablo), "ilk_ms": round(ilk * 1000, 1),
+            "tek_satir_degisince_ms": round(tekrar * 1000, 1), "plaka_sayisi": int(tablo["Plaka Sayısı"].sum())}
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    sonuc = {"plakalar": [list(p) for p in PLAKALAR], "grup": grup_olcumu(), "sepet": sepet_olcumu()}
+
+    if "--json" in argv:
+        print(json.dumps(sonuc, ensure_ascii=False, indent=2))
+        return sonuc
+    for s in sonuc["grup"]:
+        print(f"{s['parca']:>4} parça {s['sure_ms']:>7.1f} ms  {s['plaka'][0]}×{s['plaka'][1]} × {s['plaka_sayisi']:>3} "
+              f"(alt sınır {s['alt_sinir']})  doluluk %{s['doluluk'] * 100:.1f}")
+    s = sonuc["sepet"]
+    print(f"sepet: {s['satir']} satır / {s['parca']} parça / {s['grup']} grup, ilk {s['ilk_ms']:.0f} ms, "
+          f"tek satır değişince {s['tek_satir_degisince_ms']:.0f} ms, toplam {s['plaka_sayisi']} plaka")
+    return sonuc
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""Alan çıkarıcı.
+
+Metinden kesim süresi, X/Y ölçüsü, kalınlık ve malzemeyi tek geçişte çeker.
+Alan kuralları tek bir derlenmiş düzenli ifadede birleştirilir; malzeme
+adları malzeme tablosundan üretilen takma adlarla Aho-Corasick otomatında
+aranır. Otomat yalnızca malzeme listesi değişince yeniden kurulur. Her iki
+tarama da metin uzunluğunda doğrusaldır.
+
+Her alan için hangi kuralın eşleştiği ("kural") ve kuralın güveni
+("guven", 0-1) de döner; bulunamayan alanın güveni 0'dır.
+"""
+import re
+from collections import deque
+from functools import lru_cache
+
+VARSAYILAN_MALZEMELER = ("Siyah Sac", "Paslanmaz", "Galvaniz", "ST52", "Hardox 400", "Hardox 450", "Hardox 500")
+
+SAYI = r"\d+(?:[.,]\d+)?"
+KALINLIK_ARALIGI = (0.3, 100.0)  # mm; dışındaki "kalınlık" başka bir sayıdır (ör. Hardox 450)
+
+# (kural, alan, desen, güven). Aynı konumda listede önce gelen kazanır;
+# farklı konumlardaki eşleşmelerden güveni yüksek olan seçilir.
+KURALLAR = [
+    # Etiketten sonraki kısım ileriye bakışta: eşleşme yalnızca etiketi tüketir,
+    # aradaki alanlar (levha, X/Y) da taranır
+    ("sure_etiketli", "sure", r"(?i:kesim|cut|time)(?=[^\n]{0,60}?(?P<sure_etiketli>\d{1,3}:\d{2}:\d{2}))", 1.0),
+    ("kal_etiketli", "kal", rf"(?i:kal[ıi]nl[ıi]k|thickness)\s*(?:\(mm\))?\s*[:=]?\s*(?P<kal_etiketli>{SAYI})", 1.0),
+    ("kal_levha", "kal", rf"\b\d{{3,4}}\s*[xX*]\s*\d{{3,4}}\s*[xX*]\s*(?P<kal_levha>{SAYI})", 0.9),
+    ("x_etiketli", "x", r"\bX\s*[:|=]?\s*(?P<x_etiketli>\d{3,5}[.,]\d+)", 0.9),
+    ("y_etiketli", "y", r"\bY\s*[:|=]?\s*(?P<y_etiketli>\d{3,5}[.,]\d+)", 0.9),
+    ("x_tam", "x", r"\bX\s*[:|=]\s*(?P<x_tam>\d{3,5})\b", 0.6),
+    ("y_tam", "y", r"\bY\s*[:|=]\s*(?P<y_tam>\d{3,5})\b", 0.6),
+    # "x" bir kelimenin sonu olmamalı: "Hardox 450" kalınlık değildir
+    ("kal_satir_sonu", "kal", rf"(?<![^\W\d_])x\s*(?P<kal_satir_sonu>{SAYI})[ \t]*$", 0.5),
+    ("sure_saat", "sure", r"\b(?P<sure_saat>\d{1,2}:\d{2}:\d{2})\b", 0.4),
+]
+_DESEN = re.compile("|".join(desen for _, _, desen, _ in KURALLAR), re.MULTILINE)
+_KURAL = {kural: (alan, guven) for kural, alan, _, guven in KURALLAR}
+
+# Tabloda varsa bu malzemelere bağlanan başka yazımlar
+ES_ANLAMLI = {
+    "Paslanmaz": ["inox", "stainless", "aisi 304", "aisi 316"],
+    "Galvaniz": ["galvanized", "galvanizli", "dx51"],
+    "Siyah Sac": ["dkp", "hrp", "s235"],
+    "ST52": ["st 52", "st-52", "s355"],
+}
+
+# Sınıfı yazılmamış aile adının bağlandığı malzeme (tabloda yoksa ailenin ilki)
+AILE_VARSAYILANI = {"hardox": "Hardox 450"}
+
+# Türkçe harfler ASCII'ye; OCR ve kullanıcı yazımı farkları (İ/I/ı/i) eşleşsin
+_TR = str.maketrans("İIıŞşĞğÇçÖöÜü", "iiissggccoouu")
+
+
+def katla(metin):
+    """Büyük/küçük harf ve Türkçe karakter farklarını siler (uzunluk korunur)"""
+    return metin.translate(_TR).lower()
+
+
+def sure_cevir(zaman_str):
+    try:
+        parts = list(map(int, str(zaman_str).strip().split(':')))
+        if len(parts) == 3: return (parts[0] * 60) + parts[1] + (parts[2] / 60)
+        elif len(parts) == 2: return parts[0] + (parts[1] / 60)
+        return 0.0
+    except (ValueError, AttributeError): return 0.0
+
+
+# --- MALZEME OTOMATI ---
+class Otomat:
+    """Aho-Corasick: tüm takma adları metinde tek geçişte bulur"""
+
+    def __init__(self, kelimeler):
+        self.gecis, self.hata, self.cikis = [{}], [0], [[]]
+        for kelime, deger in kelimeler.items():
+            d = 0
+            for ch in kelime:
+                if ch not in self.gecis[d]:
+                    self.gecis.append({}); self.hata.append(0); self.cikis.append([])
+                    self.gecis[d][ch] = len(self.gecis) - 1
+                d = self.gecis[d][ch]
+            self.cikis[d].append((len(kelime), deger))
+
+        kuyruk = deque(self.gecis[0].values())
+        while kuyruk:
+            d = kuyruk.popleft()
+            for ch, c in self.gecis[d].items():
+                kuyruk.append(c)
+                f = self.hata[d]
+                while f and ch not in self.gecis[f]: f = self.hata[f]
+                hedef = self.gecis[f].get(ch, 0)
+                self.hata[c] = hedef if hedef != c else 0
+                self.cikis[c] = self.cikis[c] + self.cikis[self.hata[c]]
+
+    def ara(self, metin):
+        """(başlangıç, bitiş, değer) eşleşmeleri"""
+        d = 0
+        for i, ch in enumerate(metin):
+            while d and ch not in self.gecis[d]: d = self.hata[d]
+            d = self.gecis[d].get(ch, 0)
+            for uzunluk, deger in self.cikis[d]:
+                yield i + 1 - uzunluk, i + 1, deger
+
+
+def takma_adlar(adlar):
+    """takma ad -> (malzeme, güven, kural)"""
+    tablo = {}
+
+    def koy(ad_yazimi, ad, guven, kural):
+        a = katla(ad_yazimi).strip()
+        if a and guven > tablo.get(a, (None, 0.0, None))[1]:
+            tablo[a] = (ad, guven, kural)
+
+    for ad in adlar:
+        k = katla(ad)
+        koy(k, ad, 1.0, "malzeme_adi")
+        koy(re.sub(r"[\s\-_]+", "", k), ad, 0.9, "malzeme_bitisik")
+        koy(re.sub(r"[\s\-_]+", "-", k), ad, 0.9, "malzeme_bitisik")
+        for es in ES_ANLAMLI.get(ad, []):
+            koy(es, ad, 0.7, "es_anlamli")
+        # Aile adı (ör. "hardox"): sınıfı yazılmamışsa ailenin ilk malzemesi
+        parca = k.split()
+        if len(parca) > 1:
+            koy(parca[0], ad, 0.4, "malzeme_ailesi")
+    for aile, ad in AILE_VARSAYILANI.items():
+        if ad in adlar and tablo.get(aile, (None, 0.0, None))[2] == "malzeme_ailesi":
+            tablo[aile] = (ad, 0.4, "malzeme_ailesi")
+    return tablo
+
+
+@lru_cache(maxsize=8)
+def malzeme_otomati(adlar):
+    """Malzeme listesi (tuple) değişmedikçe aynı otomat kullanılır"""
+    return Otomat(takma_adlar(adlar))
+
+
+def malzeme_bul(metin_katli, adlar):
+    """En güvenilir (eşitse en uzun, sonra ilk) malzeme eşleşmesi: (malzeme, güven, kural) ya da None"""
+    en_iyi, anahtar = None, None
+    for bas, son, (ad, guven, kural) in malzeme_otomati(adlar).ara(metin_katli):
+        # Kelime sınırı: "st52" "st520" içinde eşleşmesin
+        if bas > 0 and metin_katli[bas - 1].isalnum(): continue
+        if son < len(metin_katli) and metin_katli[son].isalnum(): continue
+        a = (guven, son - bas, -bas)
+        if anahtar is None or a > anahtar:
+            en_iyi, anahtar = (ad, guven, kural), a
+    return en_iyi
+
+
+# --- ALANLAR ---
+def alanlari_bul(text, malzemeler=None):
+    """Metinden süre, ölçü, kalınlık ve malzemeyi çeker"""
+    veriler = {"x":0.0, "y":0.0, "sure":0.0, "kal":2.0, "malz":"Siyah Sac", "guven": {}, "kural": {}}
+
+    for m in _DESEN.finditer(text):
+        kural = m.lastgroup
+        alan, guven = _KURAL[kural]
+        if guven <= veriler["guven"].get(alan, 0.0): continue
+        ham = m.group(kural)
+        deger = sure_cevir(ham) if alan == "sure" else float(ham.replace(',', '.'))
+        if alan == "kal" and not KALINLIK_ARALIGI[0] <= deger <= KALINLIK_ARALIGI[1]: continue
+        veriler[alan] = deger
+        veriler["guven"][alan], veriler["kural"][alan] = guven, kural
+
+    bulunan = malzeme_bul(katla(text), tuple(malzemeler or VARSAYILAN_MALZEMELER))
+    if bulunan:
+        veriler["malz"], veriler["guven"]["malz"], veriler["kural"]["malz"] = bulunan
+
+    for alan in ["x", "y", "sure", "kal", "malz"]:
+        veriler["guven"].setdefault(alan, 0.0)
+    return veriler
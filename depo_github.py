@@ -0,0 +1,421 @@
+"""GitHub CSV deposu.
+
+Süreç başına tek (havuzlu) GitHub istemcisi kullanır. Dosyalar ETag ile
+koşullu istekle kontrol edilir; değişmeyen dosya 304 döner ve yeniden
+ayrıştırılmaz. Ayrıştırılmış tablolar blob SHA'sına göre saklanır.
+
+Yazmalar git tree/commit uçlarıyla tek commit olarak atılır. Dal başka bir
+oturum tarafından ilerletilmişse adımlar en güncel sürümün üzerine yeniden
+uygulanır.
+
+Siparişler tek dosyada tutulmaz: yeni kayıtlar ayın parçasına
+(`siparisler/2025-12.csv`) eklenir, silinenlerin kimlikleri
+`siparisler/silinen.csv`'ye yazılır. Böylece bir kayıt geçmişin
+büyüklüğünden bağımsız olarak yalnızca o ayın dosyasını değiştirir. Arka
+planda çalışan sıkıştırma eski tek dosyayı (`siparisler.csv`) parçalara
+böler, silinenleri parçalardan düşer ve geçmiş yılların küçük aylık
+parçalarını yıllık parçada (`siparisler/2024.csv`) birleştirir.
+"""
+import base64
+import hashlib
+import io
+import re
+import threading
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+from github import Github, GithubException, InputGitTreeElement, UnknownObjectException
+
+from olcum import github_say, olcum
+from veri import CakismaHatasi, Depo, adim_uygula, duzelt, satir_ekle, satir_sil, siparis_suz, son_siniri, varsayilan
+
+SIPARIS = "siparisler.csv"
+KLASOR = "siparisler/"
+SILINEN = KLASOR + "silinen.csv"
+TARIHSIZ = KLASOR + "tarihsiz.csv"
+SILINEN_ESIGI = 200   # bu kadar silinen birikince sıkıştırılır
+KUCUK_YIL = 5000      # satırı bundan az olan geçmiş yılın ayları birleştirilir
+
+_kilit = threading.Lock()
+_onbellek = threading.RLock()  # _icerikler, _tablolar, _yol_sha (sıkıştırma iş parçacığı da yazar)
+_sikistirma = threading.Lock()
+_repo = None
+_dosya_kilitleri = {}
+_icerikler = {}   # dosya adı -> ContentFile (ETag'i üzerinde taşır)
+_tablolar = {}    # blob sha -> düzeltilmiş DataFrame
+_yol_sha = {}     # dosya adı -> önbellekteki son blob sha
+_birlesik = (None, None)  # (parça sha'ları, birleşik sipariş tablosu)
+_dal = None       # dalın GitRef'i (ETag'i üzerinde taşır)
+_liste = (None, None, {})  # (commit sha, klasör ağacı sha, sipariş dosyaları)
+
+
+# --- GITHUB BAĞLANTISI ---
+def get_repo():
+    """Süreç boyunca paylaşılan depo nesnesi"""
+    global _repo
+    with _kilit:
+        if _repo is None:
+            token = st.secrets["github"]["token"]
+            repo_name = st.secrets["github"]["repo_name"]
+            github_say()
+            _repo = Github(token, pool_size=10).get_repo(repo_name)
+        return _repo
+
+
+def _dosya_kilidi(filename):
+    with _kilit:
+        return _dosya_kilitleri.setdefault(filename, threading.Lock())
+
+
+def _ham_icerik(contents):
+    """1 MB üstü dosyalarda contents API içerik vermez, blob'dan okunur"""
+    if contents.encoding == "base64" and contents.content:
+        return contents.decoded_content
+    blob = get_repo().get_git_blob(contents.sha)
+    return base64.b64decode(blob.content)
+
+
+def _icerik_getir(filename):
+    """Dosyanın güncel ContentFile'ı; önbellekte varsa koşullu istek atar"""
+    with _onbellek:
+        contents = _icerikler.get(filename)
+    if contents is None:
+        contents = get_repo().get_contents(filename)
+    else:
+        contents.update()  # 304 ise hiçbir şey değişmez
+    with _onbellek:
+        _icerikler[filename] = contents
+    return contents
+
+
+def unut(filename):
+    """Dosyanın önbellek kaydını siler"""
+    with _dosya_kilidi(filename), _onbellek:
+        contents = _icerikler.pop(filename, None)
+        if contents is not None:
+            _tablolar.pop(contents.sha, None)
+
+
+def _blob_sha(icerik):
+    """git'in blob SHA'sı; yazdığımız dosyayı indirmeden önbelleğe koymak için"""
+    veri = icerik.encode()
+    return hashlib.sha1(b"blob %d\0" % len(veri) + veri).hexdigest()
+
+
+def _ayristir(filename, ham):
+    df = pd.read_csv(io.BytesIO(ham if isinstance(ham, bytes) else ham.encode()))
+    return df if filename == SILINEN else duzelt(filename, df)
+
+
+def _sakla(filename, sha, df):
+    """Dosyanın yeni sürümünü önbelleğe koyar, eskisini atar"""
+    with _onbellek:
+        eski = _yol_sha.get(filename)
+        if eski is not None and eski != sha:
+            _tablolar.pop(eski, None)
+        _yol_sha[filename] = sha
+        _tablolar[sha] = df
+
+
+def _blob_tablo(repo, sha, filename):
+    """Blob'un ayrıştırılmış tablosu; SHA önbellekteyse indirmez"""
+    with _onbellek:
+        df = _tablolar.get(sha)
+    olcum().onbellek("github.blob", df is not None)
+    if df is None:
+        df = _ayristir(filename, base64.b64decode(repo.get_git_blob(sha).content))
+        _sakla(filename, sha, df)
+    return df
+
+
+def _bos(filename):
+    return pd.DataFrame(columns=["ID"]) if filename == SILINEN else varsayilan(filename)
+
+
+def _agactan_oku(repo, agac, filename):
+    """Dosyayı verilen ağaçtaki sürümüyle okur"""
+    sha = agac.get(filename)
+    if sha is None:
+        return _bos(filename)
+    return _blob_tablo(repo, sha, filename).copy()
+
+
+# --- SİPARİŞ PARÇALARI ---
+def _parca_mi(filename):
+    return filename.startswith(KLASOR) and filename.endswith(".csv") and filename != SILINEN
+
+
+def _donem(filename):
+    """Parçanın kapsadığı dönem; eski tek dosya ve tarihsiz parça için None"""
+    try:
+        return pd.Period(filename[len(KLASOR):-4]) if _parca_mi(filename) else None
+    except ValueError:
+        return None
+
+
+def _aylik_mi(filename):
+    return _parca_mi(filename) and re.fullmatch(r"\d{4}-\d{2}", filename[len(KLASOR):-4]) is not None
+
+
+def _parca_sirasi(filename):
+    """Eski tek dosya en başa, tarihsiz parçalar en sona"""
+    donem = _donem(filename)
+    if filename == SIPARIS: return (0, pd.Timestamp.min, filename)
+    if donem is None: return (2, pd.Timestamp.max, filename)
+    return (1, donem.start_time, filename)
+
+
+class _Taslak:
+    """Commit'e girecek dosya değişiklikleri (ağaçtaki sürümlerin üzerine)"""
+
+    def __init__(self, repo, agac):
+        self.repo = repo
+        self.agac = agac
+        self.tablolar = {}  # dosya -> tablo; None: silinecek
+        self.degisen = {}
+
+    def var_mi(self, filename):
+        if filename in self.tablolar: return self.tablolar[filename] is not None
+        return filename in self.agac
+
+    def yollar(self):
+        return sorted(f for f in set(self.agac) | set(self.tablolar) if self.var_mi(f))
+
+    def oku(self, filename):
+        if filename not in self.tablolar:
+            self.tablolar[filename] = _agactan_oku(self.repo, self.agac, filename)
+        df = self.tablolar[filename]
+        return _bos(filename) if df is None else df
+
+    def koy(self, filename, df):
+        """Dosyayı df ile değiştirir; df None ise dosyayı siler"""
+        if df is None and not self.var_mi(filename): return
+        self.tablolar[filename] = self.degisen[filename] = df
+        if df is None and filename not in self.agac:
+            del self.degisen[filename]  # bu taslakta açılıp silinen dosya
+
+
+def _parca_yolu(taslak, ay):
+    """Ayın satırlarının yazılacağı parça: o yılın birleşik parçası varsa o"""
+    if ay is None: return TARIHSIZ
+    yillik = f"{KLASOR}{ay[:4]}.csv"
+    return yillik if taslak.var_mi(yillik) else f"{KLASOR}{ay}.csv"
+
+
+def _parcalara_ekle(taslak, df, benzersiz=None):
+    """Sipariş satırlarını aylarına göre parçaların sonuna ekler"""
+    zaman = pd.to_datetime(df["Tarih"], format="%d-%m-%Y %H:%M", errors="coerce")
+    aylar = zaman.dt.strftime("%Y-%m").fillna("")
+    for ay, grup in df.groupby(aylar, sort=True):
+        filename = _parca_yolu(taslak, ay or None)
+        eski = taslak.oku(filename)
+        yeni = satir_ekle(eski, grup.reset_index(drop=True), benzersiz)
+        if yeni is not eski: taslak.koy(filename, yeni)
+
+
+def _siparis_adimi(taslak, tur, df, secenek):
+    if tur == "ekle":
+        _parcalara_ekle(taslak, df, secenek)
+    elif tur == "sil":
+        eski = taslak.oku(SILINEN)
+        yeni = satir_ekle(eski, pd.DataFrame({"ID": df[secenek].astype(str)}), "ID")
+        if yeni is not eski: taslak.koy(SILINEN, yeni)
+    else:
+        for filename in taslak.yollar():
+            if filename in (SIPARIS, SILINEN) or _parca_mi(filename): taslak.koy(filename, None)
+        _parcalara_ekle(taslak, df)
+
+
+def _adimlari_uygula(taslak, adimlar):
+    """Adımları taslaktaki sürümlere uygular"""
+    for tur, filename, df, secenek in adimlar:
+        if filename == SIPARIS:
+            _siparis_adimi(taslak, tur, df, secenek)
+            continue
+        eski = taslak.oku(filename)
+        yeni = adim_uygula(eski, tur, df, secenek)
+        if yeni is not eski: taslak.koy(filename, yeni)
+
+
+def _sikistir(taslak):
+    """Eski tek dosyayı böler, silinenleri düşer, küçük geçmiş yılları birleştirir"""
+    if taslak.var_mi(SIPARIS):
+        eski = taslak.oku(SIPARIS)
+        taslak.koy(SIPARIS, None)
+        _parcalara_ekle(taslak, eski)
+
+    if taslak.var_mi(SILINEN):
+        silinen = set(taslak.oku(SILINEN)["ID"])
+        for filename in taslak.yollar():
+            if not _parca_mi(filename): continue
+            df = taslak.oku(filename)
+            kalan = satir_sil(df, "ID", silinen)
+            if kalan is not df: taslak.koy(filename, kalan)
+        taslak.koy(SILINEN, None)
+
+    yillar = {}
+    for filename in taslak.yollar():
+        if _aylik_mi(filename) and _donem(filename).year < datetime.now().year:
+            yillar.setdefault(_donem(filename).year, []).append(filename)
+    for yil, aylar in yillar.items():
+        yillik = f"{KLASOR}{yil}.csv"
+        parcalar = [taslak.oku(f) for f in ([yillik] if taslak.var_mi(yillik) else []) + aylar]
+        if sum(len(p) for p in parcalar) >= KUCUK_YIL: continue
+        for f in aylar: taslak.koy(f, None)
+        taslak.koy(yillik, pd.concat(parcalar, ignore_index=True))
+
+
+class GithubDepo(Depo):
+    """Depo içindeki CSV dosyaları"""
+
+    deneme = 5
+
+    def oku(self, filename):
+        if filename == SIPARIS:
+            return self._siparis_oku()
+        with _dosya_kilidi(filename):
+            try:
+                contents = _icerik_getir(filename)
+            except UnknownObjectException:
+                # Dosya depoda yok (ya da silinmiş): arayüzün beklediği KeyError
+                with _onbellek:
+                    _icerikler.pop(filename, None)
+                raise KeyError(filename) from None
+            with _onbellek:
+                df = _tablolar.get(contents.sha)
+            if df is None:
+                df = _ayristir(filename, _ham_icerik(contents))
+                _sakla(filename, contents.sha, df)
+        return df
+
+    # --- SİPARİŞ OKUMA ---
+    def _siparis_dosyalari(self):
+        """Eski tek dosya, parçalar ve silinenler: dosya adı -> blob sha.
+
+        Dalın ref'i koşullu istekle kontrol edilir; dal ilerlemediyse (304)
+        liste önbellekten gelir. İlerlediyse kök ağaca bakılır; klasörün
+        ağacı değişmediyse klasör yeniden listelenmez.
+        """
+        global _dal, _liste
+        repo = get_repo()
+        with _dosya_kilidi(KLASOR):
+            if _dal is None:
+                _dal = repo.get_git_ref(f"heads/{repo.default_branch}")
+            elif not _dal.update() and _liste[0] == _dal.object.sha:
+                return dict(_liste[2])
+            commit = _dal.object.sha
+            if _liste[0] == commit: return dict(_liste[2])
+
+            dosyalar, klasor = {}, None
+            for o in repo.get_git_tree(repo.get_git_commit(commit).tree.sha).tree:
+                if o.path == SIPARIS and o.type == "blob": dosyalar[SIPARIS] = o.sha
+                elif o.path == KLASOR.rstrip("/") and o.type == "tree": klasor = o.sha
+            if klasor is not None and klasor == _liste[1]:
+                dosyalar.update({f: sha for f, sha in _liste[2].items() if f.startswith(KLASOR)})
+            elif klasor is not None:
+                dosyalar.update({KLASOR + o.path: o.sha for o in repo.get_git_tree(klasor).tree
+                                 if o.type == "blob" and o.path.endswith(".csv")})
+            _liste = (commit, klasor, dosyalar)
+            return dict(dosyalar)
+
+    def parcalar(self, bas=None, son=None, dosyalar=None):
+        """Sipariş parçalarını (silinenler düşülmüş) eskiden yeniye tek tek verir.
+
+        `bas`/`son` (son dahil) verilirse dönemi aralığa girmeyen parçalar
+        hiç okunmaz.
+        """
+        repo = get_repo()
+        dosyalar = self._siparis_dosyalari() if dosyalar is None else dosyalar
+        silinen = set(_blob_tablo(repo, dosyalar[SILINEN], SILINEN)["ID"]) if SILINEN in dosyalar else set()
+        for filename in sorted(dosyalar, key=_parca_sirasi):
+            if filename == SILINEN: continue
+            donem = _donem(filename)
+            if donem is not None:
+                if bas is not None and donem.end_time < pd.Timestamp(bas): continue
+                if son is not None and donem.start_time >= son_siniri(son): continue
+            df = _blob_tablo(repo, dosyalar[filename], filename)
+            yield satir_sil(df, "ID", silinen) if silinen else df
+
+    def _siparis_oku(self):
+        global _birlesik
+        with _dosya_kilidi(SIPARIS):
+            dosyalar = self._siparis_dosyalari()
+            if not set(dosyalar) - {SILINEN}:
+                raise KeyError(SIPARIS)
+            anahtar = tuple(sorted(dosyalar.items()))
+            if _birlesik[0] != anahtar:
+                _birlesik = (anahtar, pd.concat(list(self.parcalar(dosyalar=dosyalar)), ignore_index=True))
+            return _birlesik[1]
+
+    def siparisler(self, bas=None, son=None, musteri=None):
+        """Yalnızca aralığa giren parçaları okur; aralıksızsa birleşik önbelleği kullanır"""
+        if bas is None and son is None:
+            df = self._siparis_oku()
+        else:
+            parcalar = list(self.parcalar(bas, son))
+            df = pd.concat(parcalar, ignore_index=True) if parcalar else varsayilan(SIPARIS)
+        return siparis_suz(df, bas, son, musteri)
+
+    # --- YAZMA ---
+    def _commit(self, mesaj, hazirla):
+        """hazirla(taslak) ile tek commit atar; dal ilerlemişse yeniden dener"""
+        repo = get_repo()
+        for _ in range(self.deneme):
+            ref = repo.get_git_ref(f"heads/{repo.default_branch}")
+            bas = repo.get_git_commit(ref.object.sha)
+            agac = {o.path: o.sha for o in repo.get_git_tree(bas.tree.sha, recursive=True).tree if o.type == "blob"}
+
+            taslak = _Taslak(repo, agac)
+            hazirla(taslak)
+            if not taslak.degisen:
+                return None, taslak
+            icerikler = {f: None if df is None else df.to_csv(index=False) for f, df in taslak.degisen.items()}
+            ogeler = [InputGitTreeElement(f, "100644", "blob", content=c) if c is not None
+                      else InputGitTreeElement(f, "100644", "blob", sha=None)  # dosyayı siler
+                      for f, c in icerikler.items()]
+            commit = repo.create_git_commit(mesaj, repo.create_git_tree(ogeler, bas.tree), [bas])
+            try:
+                ref.edit(commit.sha)  # force yok: sadece ileri sarma
+            except GithubException as e:
+                if e.status == 422: continue  # araya başka commit girdi
+                raise
+
+            for filename, icerik in icerikler.items():
+                unut(filename)
+                if icerik is not None:
+                    _sakla(filename, _blob_sha(icerik), _ayristir(filename, icerik))
+            return commit, taslak
+        raise CakismaHatasi(mesaj)
+
+    def uygula(self, mesaj, adimlar):
+        """Tek commit atar. Commit (ya da değişiklik yoksa None) döner"""
+        commit, taslak = self._commit(mesaj, lambda t: _adimlari_uygula(t, adimlar))
+        if commit is not None and self._sikistirilmali(taslak):
+            self.arka_planda_sikistir()
+        return commit
+
+    def _sikistirilmali(self, taslak):
+        yeni_parca = any(_parca_mi(f) and f not in taslak.agac for f in taslak.degisen)
+        silinen = taslak.tablolar.get(SILINEN)
+        return (taslak.var_mi(SIPARIS) or yeni_parca
+                or (silinen is not None and len(silinen) >= SILINEN_ESIGI))
+
+    # --- SIKIŞTIRMA ---
+    def sikistir(self):
+        """Sipariş parçalarını tek commit'te sıkıştırır"""
+        return self._commit("Siparişler sıkıştırıldı", _sikistir)[0]
+
+    def arka_planda_sikistir(self):
+        """Sıkıştırmayı arka planda başlatır; zaten çalışıyorsa bir şey yapmaz"""
+        if not _sikistirma.acquire(blocking=False): return
+
+        def calis():
+            try:
+                self.sikistir()
+            except Exception as e:
+                olcum().hata("sikistirma", e)
+            finally:
+                _sikistirma.release()
+
+        threading.Thread(target=calis, name="siparis-sikistirma", daemon=True).start()
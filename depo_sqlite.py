@@ -0,0 +1,167 @@
+"""Yerel SQLite deposu.
+
+Her CSV dosyası aynı adlı bir tabloya karşılık gelir. Sipariş eklemek tek
+INSERT'tür, silmek kimlik indeksinden DELETE; müşteri, tarih ve kimlik
+sütunlarında indeks vardır. Dış servis gerektirmez. Hiç yazılmamış tablo
+(okununca KeyError, uygulama varsayılanı kullanır) ile kullanıcının
+boşalttığı tablo `yazilan` tablosundaki işaretle ayrılır.
+
+Mevcut CSV'leri taşımak için:
+    python depo_sqlite.py [csv_klasörü] [veri.db]
+"""
+import os
+import sqlite3
+import sys
+import threading
+
+import pandas as pd
+
+from veri import DOSYALAR, SIPARIS_KOLONLARI, Depo, duzelt, eski_kimlikler, son_siniri
+
+# tablo -> (sütunlar, tekil anahtar)
+SEMA = {
+    "ayarlar": ({"Key": "TEXT PRIMARY KEY", "Val": "REAL"}, "Key"),
+    "malzemeler": ({"Ad": "TEXT PRIMARY KEY", "Fiyat": "REAL", "Yog": "REAL", "Para": "TEXT DEFAULT 'TL'"}, "Ad"),
+    "musteriler": ({"Firma": "TEXT", "Yetkili": "TEXT", "Tel": "TEXT", "Adres": "TEXT"}, "Firma"),
+    "siparisler": ({"Tarih": "TEXT", "Müşteri": "TEXT", "İş": "TEXT", "Tutar": "REAL", "Detay": "TEXT", "ID": "TEXT"}, None),
+}
+
+EK_SEMA = """
+CREATE UNIQUE INDEX IF NOT EXISTS musteri_firma ON musteriler(Firma);
+-- Tarih "gg-aa-yyyy ss:dd" biçiminde; sıralanabilir hâli indekslenir
+ALTER TABLE siparisler ADD COLUMN Zaman TEXT GENERATED ALWAYS AS
+    (substr(Tarih, 7, 4) || '-' || substr(Tarih, 4, 2) || '-' || substr(Tarih, 1, 2) || substr(Tarih, 11)) VIRTUAL;
+CREATE INDEX IF NOT EXISTS siparis_zaman ON siparisler(Zaman);
+CREATE INDEX IF NOT EXISTS siparis_musteri ON siparisler("Müşteri");
+"""
+
+
+def _tablo(filename):
+    tablo = os.path.splitext(os.path.basename(filename))[0]
+    if tablo not in SEMA:
+        raise KeyError(filename)
+    return tablo
+
+
+def _ad(kolon):
+    return '"' + kolon.replace('"', '""') + '"'
+
+
+class SqliteDepo(Depo):
+    """Tek dosyalık gömülü veritabanı"""
+
+    def __init__(self, yol="veri.db"):
+        self.yol = yol
+        self._kilit = threading.Lock()
+        self._baglanti = sqlite3.connect(yol, check_same_thread=False)
+        self._baglanti.execute("PRAGMA journal_mode=WAL")
+        self._sema_kur()
+
+    def _sema_kur(self):
+        with self._baglanti as b:
+            b.execute("CREATE TABLE IF NOT EXISTS yazilan (tablo TEXT PRIMARY KEY)")
+            eklenen = set()
+            for tablo, (kolonlar, anahtar) in SEMA.items():
+                tanim = ", ".join(f"{_ad(k)} {t}" for k, t in kolonlar.items())
+                b.execute(f"CREATE TABLE IF NOT EXISTS {tablo} ({tanim})")
+                # Eski veritabanında sonradan eklenen sütunlar
+                mevcut = {r[1] for r in b.execute(f"PRAGMA table_xinfo({tablo})")}
+                for k, t in kolonlar.items():
+                    if k not in mevcut:
+                        b.execute(f"ALTER TABLE {tablo} ADD COLUMN {_ad(k)} {t}")
+                        eklenen.add((tablo, k))
+                # İşaretten önceki veritabanı: dolu tablolar yazılmış sayılır
+                b.execute(f"INSERT OR IGNORE INTO yazilan SELECT ? WHERE EXISTS (SELECT 1 FROM {tablo})", (tablo,))
+            if "Zaman" not in {r[1] for r in b.execute("PRAGMA table_xinfo(siparisler)")}:
+                b.executescript(EK_SEMA)
+            if ("siparisler", "ID") in eklenen:
+                self._kimlik_doldur(b)
+            b.execute("CREATE UNIQUE INDEX IF NOT EXISTS siparis_id ON siparisler(ID)")
+
+    def _kimlik_doldur(self, b):
+        """Eski siparişlere kimlik yazar"""
+        liste = ", ".join(_ad(c) for c in SIPARIS_KOLONLARI)
+        df = pd.read_sql_query(f"SELECT rowid, {liste} FROM siparisler ORDER BY rowid", b)
+        df = eski_kimlikler(df)
+        b.executemany("UPDATE siparisler SET ID = ? WHERE rowid = ?", zip(df["ID"], df["rowid"].tolist()))
+
+    def _ekle(self, tablo, df, benzersiz=None):
+        kolonlar, anahtar = SEMA[tablo]
+        cols = [c for c in kolonlar if c in df.columns]
+        if anahtar in cols:
+            df = df.drop_duplicates(anahtar)
+        degerler = df[cols].astype(object).where(df[cols].notna(), None)
+        liste = ", ".join(_ad(c) for c in cols)
+        yer = ", ".join("?" for _ in cols)
+        if benzersiz is None:
+            self._baglanti.executemany(f"INSERT INTO {tablo} ({liste}) VALUES ({yer})",
+                                       degerler.itertuples(index=False, name=None))
+        else:
+            i = cols.index(benzersiz)
+            self._baglanti.executemany(
+                f"INSERT INTO {tablo} ({liste}) SELECT {yer} "
+                f"WHERE NOT EXISTS (SELECT 1 FROM {tablo} WHERE {_ad(benzersiz)} = ?)",
+                (r + (r[i],) for r in degerler.itertuples(index=False, name=None)))
+
+    def oku(self, filename):
+        tablo = _tablo(filename)
+        liste = ", ".join(_ad(c) for c in SEMA[tablo][0])
+        with self._kilit:
+            df = pd.read_sql_query(f"SELECT {liste} FROM {tablo} ORDER BY rowid", self._baglanti)
+            yazildi = df.empty and self._baglanti.execute("SELECT 1 FROM yazilan WHERE tablo = ?", (tablo,)).fetchone()
+        if df.empty and not yazildi:
+            raise KeyError(filename)  # hiç yazılmadı; boşaltılmış tablo boş döner
+        return duzelt(filename, df)
+
+    def uygula(self, mesaj, adimlar):
+        """Adımları tek veritabanı işleminde yazar"""
+        with self._kilit, self._baglanti:
+            for tur, filename, df, secenek in adimlar:
+                tablo = _tablo(filename)
+                self._baglanti.execute("INSERT OR IGNORE INTO yazilan VALUES (?)", (tablo,))
+                if tur == "sil":
+                    self._baglanti.executemany(f"DELETE FROM {tablo} WHERE {_ad(secenek)} = ?",
+                                               ((d,) for d in df[secenek]))
+                    continue
+                if tur == "yaz":
+                    self._baglanti.execute(f"DELETE FROM {tablo}")
+                self._ekle(tablo, df, secenek)
+
+    def siparisler(self, bas=None, son=None, musteri=None):
+        """Tarih aralığı (son dahil) / müşteriye göre siparişler (indeksli)"""
+        kosul, parametre = [], []
+        if bas is not None:
+            kosul.append("Zaman >= ?"); parametre.append(bas.strftime("%Y-%m-%d %H:%M"))
+        if son is not None:
+            kosul.append("Zaman < ?"); parametre.append(son_siniri(son).strftime("%Y-%m-%d %H:%M"))
+        if musteri is not None:
+            kosul.append('"Müşteri" = ?'); parametre.append(musteri)
+        liste = ", ".join(_ad(c) for c in SEMA["siparisler"][0])
+        nerede = " WHERE " + " AND ".join(kosul) if kosul else ""
+        with self._kilit:
+            df = pd.read_sql_query(f"SELECT {liste} FROM siparisler{nerede} ORDER BY rowid",
+                                   self._baglanti, params=parametre)
+        return duzelt("siparisler.csv", df)
+
+
+def tasi(kaynak=".", yol="veri.db"):
+    """CSV klasöründen (ya da başka bir depodan) SQLite'a tek seferlik taşıma"""
+    hedef = SqliteDepo(yol)
+    adimlar = []
+    for filename in DOSYALAR:
+        try:
+            if isinstance(kaynak, Depo):
+                df = kaynak.oku(filename)
+            else:
+                df = duzelt(filename, pd.read_csv(os.path.join(kaynak, filename)))
+        except Exception as e:
+            print(f"{filename} atlandı: {e}")
+            continue
+        adimlar.append(("yaz", filename, df, None))
+        print(f"{filename}: {len(df)} satır")
+    hedef.uygula("Taşıma", adimlar)
+    return hedef
+
+
+if __name__ == "__main__":
+    tasi(*sys.argv[1:3])
@@ -0,0 +1,141 @@
+"""Teklif fiyat motoru.
+
+Sepeti malzeme tablosuyla tek seferde birleştirir; ağırlık, malzeme, lazer,
+büküm, kâr ve KDV tutarlarını satır satır sütun olarak hesaplar. Dolar
+fiyatlı malzemeler (Para = "USD") verilen kurla TL'ye çevrilir; kur yoksa
+yalnızca o malzemeli satırlar reddedilir. Tabloda olmayan ya da fiyatı boş
+malzemeli satırlar da fiyatlanmaz, reddedilir.
+"""
+import numpy as np
+import pandas as pd
+
+from olcum import olculen
+
+# Malzemenin yoğunluğu boşsa kullanılan değer (çelik)
+VARSAYILAN_YOG = 7.85
+
+# Ayarlar tablosunda (Key/Val) okunamazsa kullanılan değerler
+VARSAYILAN_AYARLAR = {"kar": 25.0, "kdv": 20.0, "lazer_dk": 25.0, "abkant": 15.0}
+
+SAYISAL = ["Kalınlık", "En", "Boy", "Adet", "Süre", "Büküm"]
+ZORUNLU = ["En", "Boy", "Kalınlık", "Adet"]
+
+
+def fiyat_ayarlari(df_ayar):
+    """Ayarlar tablosundan kar, kdv, lazer_dk, abkant; biri okunamazsa hepsi varsayılan"""
+    try:
+        val = df_ayar.set_index("Key")["Val"]
+        return {k: float(val.loc[k]) for k in VARSAYILAN_AYARLAR}
+    except Exception:
+        return dict(VARSAYILAN_AYARLAR)
+
+
+def _sepet_tablosu(sepet):
+    """Liste/DataFrame sepeti sayısal sütunlu tabloya çevirir"""
+    df = sepet.copy() if isinstance(sepet, pd.DataFrame) else pd.DataFrame(list(sepet))
+    df = df.reset_index(drop=True)
+    if "Sil" in df.columns:
+        df = df[~df["Sil"].fillna(False).astype(bool)]
+    if "Malzeme" not in df.columns: df["Malzeme"] = "Siyah Sac"
+    for col in SAYISAL:
+        df[col] = pd.to_numeric(df[col], errors="coerce") if col in df.columns else np.nan
+    # Boş süre/büküm "yok" demek
+    df[["Süre", "Büküm"]] = df[["Süre", "Büküm"]].fillna(0.0)
+    return df
+
+
+def red_sebebi(d, fiyat=None, kursuz=None):
+    """Her satır için red sebebini dizi olarak döner (geçerli satırlarda boş).
+
+    `d` DataFrame ya da sütun adı -> sayı dizisi sözlüğü olabilir. `fiyat`
+    satırların malzeme fiyatıdır; boş olan satır (malzeme tabloda yok ya da
+    fiyatı girilmemiş) reddedilir. `kursuz` dolar fiyatlı olup kur
+    olmadığı için fiyatlanamayan satırlardır.
+    """
+    kosullar, sebepler = [], []
+    sayi = {col: np.asarray(d[col], dtype=float) for col in ZORUNLU + ["Süre", "Büküm"]}
+    for col in ZORUNLU:
+        kosullar.append(np.isnan(sayi[col]))
+        sebepler.append(f"{col} eksik")
+    for col in ZORUNLU:
+        kosullar.append(sayi[col] <= 0)
+        sebepler.append(f"{col} sıfır/negatif")
+    for col in ["Süre", "Büküm"]:
+        kosullar.append(sayi[col] < 0)
+        sebepler.append(f"{col} negatif")
+    if kursuz is not None:
+        kosullar.append(np.asarray(kursuz, dtype=bool))
+        sebepler.append("Kur yok")
+    if fiyat is not None:
+        kosullar.append(np.isnan(np.asarray(fiyat, dtype=float)))
+        sebepler.append("Malzeme tabloda yok/fiyatsız")
+    return np.select(kosullar, sebepler, default="")
+
+
+def kirilim(d, fiyat, yog, kar, kdv_oran, lazer_dk, abkant_tl):
+    """Satır kırılımları (Kg ve tutarlar); sütunlar Series ya da dizi olabilir"""
+    adet = d["Adet"]
+    k = {"Kg": d["En"] * d["Boy"] * d["Kalınlık"] * yog / 1_000_000 * adet}
+    k["Malzeme Tutarı"] = k["Kg"] * fiyat
+    k["Lazer Tutarı"] = d["Süre"] * adet * lazer_dk
+    k["Büküm Tutarı"] = d["Büküm"] * adet * abkant_tl
+    k["Maliyet"] = k["Malzeme Tutarı"] + k["Lazer Tutarı"] + k["Büküm Tutarı"]
+    k["Kâr"] = k["Maliyet"] * (kar / 100)
+    k["KDV"] = (k["Maliyet"] + k["Kâr"]) * (kdv_oran / 100)
+    k["Tutar"] = k["Maliyet"] + k["Kâr"] + k["KDV"]
+    return k
+
+
+def malzeme_tablosu(df_malz, dolar=None):
+    """Malzeme tablosunu Ad indeksli Fiyat (TL)/Yog/Kursuz tablosuna çevirir.
+
+    Kur verilmemişse dolar fiyatlı malzemelerin fiyatı boş, Kursuz True olur.
+    """
+    eksik = [c for c in ["Ad", "Fiyat", "Yog"] if c not in df_malz.columns]
+    if eksik:
+        raise ValueError(f"Malzeme tablosunda sütun yok: {', '.join(eksik)}")
+    df_malz = df_malz.drop_duplicates("Ad").set_index("Ad")
+    m = df_malz[["Fiyat", "Yog"]].apply(pd.to_numeric, errors="coerce")
+    m["Kursuz"] = False
+    if "Para" in df_malz.columns:
+        usd = df_malz["Para"].fillna("TL").astype(str).str.upper().eq("USD")
+        if usd.any():
+            if dolar:
+                m.loc[usd, "Fiyat"] *= dolar
+            else:
+                m.loc[usd, "Fiyat"] = np.nan
+                m.loc[usd, "Kursuz"] = True
+    return m
+
+
+@olculen("hesap.sepet_hesapla")
+def sepet_hesapla(sepet, df_malz, kar, kdv_oran, lazer_dk, abkant_tl, dolar=None):
+    """Sepeti fiyatlar; `dolar` USD fiyatlı malzemeler için TL kuru.
+
+    Dönen sözlük: "satirlar" (fiyatlanan satırlar ve kırılımları),
+    "reddedilen" (atlanan satırlar ve "Sebep" sütunu) ve toplamlar
+    ("kg", "malzeme", "lazer", "bukum", "ham", "kar", "kdv", "son").
+    """
+    df = _sepet_tablosu(sepet).join(malzeme_tablosu(df_malz, dolar), on="Malzeme")
+    kursuz = df.pop("Kursuz").fillna(False).astype(bool)
+    sebep = pd.Series(red_sebebi(df, df["Fiyat"], kursuz), index=df.index)
+    red = sebep != ""
+
+    reddedilen = df[red].drop(columns=["Fiyat", "Yog"]).assign(Sebep=sebep[red])
+    df = df[~red].fillna({"Yog": VARSAYILAN_YOG})
+
+    for col, deger in kirilim(df, df["Fiyat"], df["Yog"], kar, kdv_oran, lazer_dk, abkant_tl).items():
+        df[col] = deger
+
+    return {
+        "satirlar": df,
+        "reddedilen": reddedilen,
+        "kg": float(df["Kg"].sum()),
+        "malzeme": float(df["Malzeme Tutarı"].sum()),
+        "lazer": float(df["Lazer Tutarı"].sum()),
+        "bukum": float(df["Büküm Tutarı"].sum()),
+        "ham": float(df["Maliyet"].sum()),
+        "kar": float(df["Kâr"].sum()),
+        "kdv": float(df["KDV"].sum()),
+        "son": float(df["Tutar"].sum()),
+    }
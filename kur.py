@@ -0,0 +1,122 @@
+"""Dolar kuru servisi.
+
+Kur süreç başına tek bir arka plan iş parçacığında belli aralıklarla
+yenilenir; tüm oturumlar bellekteki son değeri okur, sayfa hiç beklemez.
+İstekler havuzlu bir `requests.Session` ile zaman aşımlı atılır. Son
+başarılı kur zamanıyla diske yazılır; uygulama yeniden açıldığında oradan
+başlar.
+
+Ortam değişkenleri:
+    KUR_URL      kur adresi (testte yerel bir sahte sunucu verilebilir);
+                 yanıt {"rates": {"TRY": ...}} biçiminde olmalı
+    KUR_SURESI   yenileme aralığı (sn, varsayılan 600)
+    KUR_DOSYASI  disk önbelleği (varsayılan .onbellek/kur.json)
+"""
+import json
+import os
+import threading
+import time
+
+from olcum import olcum
+
+KUR_URL = os.environ.get("KUR_URL", "https://api.exchangerate-api.com/v4/latest/USD")
+KUR_SURESI = float(os.environ.get("KUR_SURESI", 600))
+KUR_DOSYASI = os.environ.get("KUR_DOSYASI", os.path.join(".onbellek", "kur.json"))
+ZAMAN_ASIMI = (3.05, 5)  # bağlanma, okuma (sn)
+VARSAYILAN_KUR = 34.50
+
+_kilit = threading.Lock()
+_servis = None
+
+
+def _oturum():
+    # requests ilk yenilemede, arka plan iş parçacığında yüklenir
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    oturum = requests.Session()
+    tekrar = Retry(total=2, read=0, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+    oturum.mount("https://", HTTPAdapter(max_retries=tekrar, pool_maxsize=2))
+    oturum.mount("http://", HTTPAdapter(max_retries=tekrar, pool_maxsize=2))
+    return oturum
+
+
+class KurServisi:
+    """Arka planda yenilenen, diskte saklanan USD/TRY kuru"""
+
+    def __init__(self, url=KUR_URL, sure=KUR_SURESI, dosya=KUR_DOSYASI):
+        self.url = url
+        self.sure = sure
+        self.dosya = dosya
+        self.oturum = None
+        self.deger, self.zaman = VARSAYILAN_KUR, None  # zaman None: hiç çekilmedi
+        self.hata = None
+        self._uyandir = threading.Event()
+        self._diskten_oku()
+        self._is = threading.Thread(target=self._calis, name="kur", daemon=True)
+        self._is.start()
+
+    def _diskten_oku(self):
+        try:
+            with open(self.dosya, encoding="utf-8") as f:
+                k = json.load(f)
+            self.deger, self.zaman = float(k["kur"]), float(k["zaman"])
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    def _diske_yaz(self):
+        os.makedirs(os.path.dirname(self.dosya) or ".", exist_ok=True)
+        gecici = self.dosya + ".tmp"
+        with open(gecici, "w", encoding="utf-8") as f:
+            json.dump({"kur": self.deger, "zaman": self.zaman}, f)
+        os.replace(gecici, self.dosya)
+
+    def yenile(self):
+        """Kuru hemen çeker; başarılıysa True"""
+        try:
+            with olcum().olc("kur.yenile"):
+                if self.oturum is None: self.oturum = _oturum()
+                yanit = self.oturum.get(self.url, timeout=ZAMAN_ASIMI)
+                yanit.raise_for_status()
+                deger = float(yanit.json()["rates"]["TRY"])
+                if deger <= 0: raise ValueError(f"geçersiz kur: {deger}")
+        except Exception as e:
+            self.hata = f"{type(e).__name__}: {e}"
+            olcum().hata("kur", e, url=self.url)
+            return False
+        self.deger, self.zaman, self.hata = deger, time.time(), None
+        try:
+            self._diske_yaz()
+        except OSError:
+            pass
+        return True
+
+    def tetikle(self):
+        """Arka plandaki yenilemeyi beklemeden başlatır"""
+        self._uyandir.set()
+
+    def yas(self):
+        """Son başarılı çekimden bu yana geçen süre (sn); hiç çekilmediyse None"""
+        return None if self.zaman is None else time.time() - self.zaman
+
+    def _calis(self):
+        while True:
+            yas = self.yas()
+            if yas is None or yas >= self.sure:
+                self.yenile()
+            # Hata varsa daha sık dene
+            bekle = min(self.sure, 60) if self.hata else self.sure - (self.yas() or 0)
+            self._uyandir.wait(max(bekle, 1))
+            if self._uyandir.is_set():
+                self._uyandir.clear()
+                self.yenile()
+
+
+def kur_servisi():
+    """Süreç boyunca paylaşılan kur servisi"""
+    global _servis
+    with _kilit:
+        if _servis is None:
+            _servis = KurServisi()
+        return _servis
@@ -0,0 +1,280 @@
+"""Arka plan yazıcısı.
+
+Kayıtlar (`Islem` adımları) önce yerel günlüğe (JSONL) yazılıp diske
+zorlanır, sonra hemen onaylanır. Tek bir arka plan iş parçacığı
+bekleyenleri toplar ve birkaç kaydı tek `uygula` çağrısında (GitHub'da tek
+commit, SQLite'ta tek işlem) yazar. Hata olursa artan bekleme süreleriyle
+yeniden dener. Birden çok kayıtlık parti yazılamazsa kayıtlar tek tek
+denenir; tek başına `EN_COK_DENEME` kez yazılamayan kayıt bekletmeye alınır
+ki arkasındakileri tıkamasın (bağlantı, sunucu ve eşzamanlı yazma hataları
+sayılmaz). Bekletilen kayıtlar günlükte kalır; `yeniden_dene` ya da bir
+sonraki açılış onları yeniden sıraya koyar. Süreç yazılmadan kapanırsa
+günlükteki kayıtlar bir sonraki açılışta yeniden gönderilir.
+
+Yeniden gönderim güvenlidir: siparişler kimliğe, müşteriler firma adına
+göre benzersiz eklenir; "yaz" ve "sil" adımları tekrarlanabilir.
+
+Günlük `KUYRUK_DOSYASI` ortam değişkeniyle değiştirilebilir
+(varsayılan `.onbellek/kuyruk.jsonl`). Her süreç kendi günlüğünü yanındaki
+`.kilit` dosyasını kilitleyerek sahiplenir; asıl günlük başka bir süreçteyse
+sıradaki boş yuvayı (`kuyruk.1.jsonl`, `kuyruk.2.jsonl` ...) alır. Günlüğü
+yalnızca sahibi yeniden oynatır ve yeniden yazar; kapanan sürecin yuvasını
+sonra açılan süreç devralır.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+import pandas as pd
+
+from olcum import olcum
+from veri import CakismaHatasi, adim_uygula, aktif_depo, anlik_uygula
+
+GUNLUK = os.environ.get("KUYRUK_DOSYASI", os.path.join(".onbellek", "kuyruk.jsonl"))
+TOPLAMA_SURESI = 0.5   # ilk kayıttan sonra başkaları için beklenen süre (sn)
+EN_COK_KAYIT = 50      # tek seferde yazılan en çok kayıt
+BEKLEME = (1, 60)      # hatadan sonra ilk ve en uzun bekleme (sn)
+EN_COK_YUVA = 16       # aynı anda günlük tutabilen en çok süreç
+EN_COK_DENEME = 3      # tek başına bu kadar kez yazılamayan kayıt bekletilir
+
+_kilit = threading.Lock()
+_yazici = None
+
+
+def _tablo_yaz(df):
+    return json.loads(df.to_json(orient="split", index=False, force_ascii=False))
+
+
+def _tablo_oku(d):
+    return pd.DataFrame(d["data"], columns=d["columns"])
+
+
+def _gecici(e):
+    """Kayda değil bağlantıya/sunucuya ya da eşzamanlı yazmaya bağlı hata mı"""
+    if isinstance(e, (OSError, sqlite3.OperationalError, CakismaHatasi)): return True
+    durum = getattr(e, "status", None)  # GithubException
+    return durum in (403, 429) or (durum or 0) >= 500
+
+
+def _kilitle(yol):
+    """Kilit dosyasını bu süreç için kilitler; başka süreçteyse None"""
+    os.makedirs(os.path.dirname(yol) or ".", exist_ok=True)
+    f = open(yol, "a+")
+    try:
+        if fcntl: fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else: msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        f.close()
+        return None
+    return f
+
+
+def _yuva_al(gunluk):
+    """Kilitlenebilen ilk günlük yuvası: (günlük yolu, kilit dosyası)"""
+    kok, uzanti = os.path.splitext(gunluk)
+    for i in range(EN_COK_YUVA):
+        yol = gunluk if i == 0 else f"{kok}.{i}{uzanti}"
+        kilit = _kilitle(yol + ".kilit")
+        if kilit: return yol, kilit
+    return None, None
+
+
+class Yazici:
+    """Günlüklü, toplu ve yeniden deneyen yazma kuyruğu"""
+
+    def __init__(self, gunluk=GUNLUK, depo=None):
+        self.gunluk, self._gunluk_kilidi = _yuva_al(gunluk)
+        if self.gunluk is None:
+            # Bütün yuvalar dolu: kayıtlar yalnızca bellekte bekler
+            olcum().hata("kuyruk", RuntimeError(f"{gunluk} için boş günlük yuvası yok"))
+        self.depo = depo
+        self._kosul = threading.Condition()
+        self._bekleyen = []   # (no, mesaj, adimlar)
+        self._bekletilen = [] # (no, mesaj, adimlar, hata)
+        self._denemeler = {}  # no -> tek başına yazılamama sayısı
+        self._tekli = 0       # tek tek denenecek kayıt sayısı
+        self._sira = 0
+        self.hata = None
+        self.sonraki_deneme = None
+        self._gunlugu_oku()
+        self._is = threading.Thread(target=self._calis, name="yazici", daemon=True)
+        self._is.start()
+
+    # --- GÜNLÜK ---
+    def _gunlugu_oku(self):
+        """Sahiplenilen günlükte yazılmamış kalanları sıraya geri koyar"""
+        if self.gunluk is None or not os.path.exists(self.gunluk): return
+        kayitlar, biten = {}, set()
+        with open(self.gunluk, encoding="utf-8") as f:
+            for satir in f:
+                try:
+                    k = json.loads(satir)
+                except ValueError:
+                    continue  # yarım kalmış son satır
+                if "tamam" in k:
+                    biten.update(k["tamam"])
+                else:
+                    kayitlar[k["no"]] = k
+        for no in sorted(set(kayitlar) - biten):
+            k = kayitlar[no]
+            adimlar = [(tur, f, _tablo_oku(t), s) for tur, f, t, s in k["adimlar"]]
+            self._bekleyen.append((no, k["mesaj"], adimlar))
+        self._sira = max(kayitlar, default=0)
+        self._gunluge_yaz(sifirla=True)
+
+    def _gunluge_yaz(self, satir=None, sifirla=False):
+        """Satırı günlüğe ekler ve diske zorlar; `sifirla` ile günlüğü bekleyenlerle yeniden yazar"""
+        if self.gunluk is None: return
+        os.makedirs(os.path.dirname(self.gunluk) or ".", exist_ok=True)
+        if sifirla:
+            gecici = self.gunluk + ".tmp"
+            with open(gecici, "w", encoding="utf-8") as f:
+                kalanlar = self._bekleyen + [k[:3] for k in self._bekletilen]
+                for no, mesaj, adimlar in sorted(kalanlar, key=lambda k: k[0]):
+                    f.write(self._satir(no, mesaj, adimlar))
+                f.flush(); os.fsync(f.fileno())
+            os.replace(gecici, self.gunluk)
+            return
+        with open(self.gunluk, "a", encoding="utf-8") as f:
+            f.write(satir)
+            f.flush(); os.fsync(f.fileno())
+
+    @staticmethod
+    def _satir(no, mesaj, adimlar):
+        k = {"no": no, "mesaj": mesaj, "zaman": time.time(),
+             "adimlar": [(tur, f, _tablo_yaz(t), s) for tur, f, t, s in adimlar]}
+        return json.dumps(k, ensure_ascii=False) + "\n"
+
+    # --- KUYRUK ---
+    def ekle(self, mesaj, adimlar):
+        """Kaydı günlüğe yazar ve sıraya koyar; kayıt numarasını döner"""
+        with self._kosul:
+            self._sira += 1
+            no = self._sira
+            self._gunluge_yaz(self._satir(no, mesaj, adimlar))
+            self._bekleyen.append((no, mesaj, list(adimlar)))
+            self._kosul.notify()
+        return no
+
+    def ustune_uygula(self, filename, df):
+        """Henüz yazılmamış adımları okunan tabloya uygular"""
+        with self._kosul:
+            adimlar = [a for _, _, adimlar in self._bekleyen for a in adimlar if a[1] == filename]
+        for tur, _, tablo, secenek in adimlar:
+            df = adim_uygula(df, tur, tablo, secenek)
+        return df
+
+    def durum(self):
+        """Bekleyen kayıt sayısı, son hata, bir sonraki deneme zamanı ve bekletilen kayıtlar"""
+        with self._kosul:
+            olcum().deger("kuyruk.bekleyen", len(self._bekleyen))
+            return {"bekleyen": len(self._bekleyen), "hata": self.hata, "sonraki_deneme": self.sonraki_deneme,
+                    "bekletilen": [{"no": no, "mesaj": m, "hata": h} for no, m, _, h in self._bekletilen]}
+
+    def yeniden_dene(self):
+        """Bekletilen kayıtları sıraya geri koyar"""
+        with self._kosul:
+            self._bekleyen = sorted(self._bekleyen + [k[:3] for k in self._bekletilen], key=lambda k: k[0])
+            self._bekletilen = []
+            self.sonraki_deneme = None
+            self._kosul.notify()
+
+    def tetikle(self):
+        """Beklemeyi keser, hemen yeniden dener"""
+        with self._kosul:
+            self.sonraki_deneme = None
+            self._kosul.notify()
+
+    def bekle(self, zaman_asimi=None):
+        """Kuyruk boşalana kadar bekler; boşaldıysa True"""
+        bitis = None if zaman_asimi is None else time.monotonic() + zaman_asimi
+        with self._kosul:
+            while self._bekleyen:
+                kalan = None if bitis is None else bitis - time.monotonic()
+                if kalan is not None and kalan <= 0: return False
+                self._kosul.wait(kalan)
+            return True
+
+    # --- ARKA PLAN ---
+    def _calis(self):
+        bekleme = BEKLEME[0]
+        while True:
+            with self._kosul:
+                while not self._bekleyen or (self.sonraki_deneme and time.monotonic() < self.sonraki_deneme):
+                    kalan = self.sonraki_deneme - time.monotonic() if self.sonraki_deneme else None
+                    self._kosul.wait(kalan)
+                ilk_deneme = self.sonraki_deneme is None
+            if ilk_deneme:
+                time.sleep(TOPLAMA_SURESI)  # arka arkaya gelen kayıtlar da aynı partiye girsin
+            with self._kosul:
+                parti = self._bekleyen[:1 if self._tekli else EN_COK_KAYIT]
+                if not parti: continue
+
+            mesaj = parti[0][1] if len(parti) == 1 else f"{len(parti)} kayıt: " + "; ".join(m for _, m, _ in parti)
+            adimlar = [a for _, _, adimlar in parti for a in adimlar]
+            try:
+                with olcum().olc("depo.uygula"):
+                    (self.depo or aktif_depo()).uygula(mesaj, adimlar)
+            except Exception as e:
+                olcum().hata("kuyruk", e, kayit=len(parti), bekleme=bekleme)
+                if not _gecici(e) and self._bozuk_kayit(parti, e):
+                    continue  # hemen tek tek / sıradakiyle dene
+                with self._kosul:
+                    self.hata = f"{type(e).__name__}: {e}"
+                    self.sonraki_deneme = time.monotonic() + bekleme
+                bekleme = min(bekleme * 2, BEKLEME[1])
+                continue
+
+            bekleme = BEKLEME[0]
+            olcum().olay("kayit", kayit=len(parti), adim=len(adimlar))
+            if self.depo is None: anlik_uygula(adimlar)
+            with self._kosul:
+                biten = {no for no, _, _ in parti}
+                self._bekleyen = [k for k in self._bekleyen if k[0] not in biten]
+                for no in biten: self._denemeler.pop(no, None)
+                self._tekli = max(self._tekli - len(parti), 0)
+                self.hata = self.sonraki_deneme = None
+                if self._bekleyen:
+                    self._gunluge_yaz(json.dumps({"tamam": sorted(biten)}) + "\n")
+                else:
+                    self._gunluge_yaz(sifirla=True)
+                self._kosul.notify_all()
+
+    def _bozuk_kayit(self, parti, e):
+        """Kayda özgü hatayı işler; hemen yeniden denenecekse True.
+
+        Çok kayıtlı parti tek tek denemeye bölünür; tek kayıt `EN_COK_DENEME`
+        kez yazılamadıysa bekletmeye alınır.
+        """
+        with self._kosul:
+            if len(parti) > 1:
+                self._tekli = len(parti)
+                return True
+            no, mesaj, adimlar = parti[0]
+            self._denemeler[no] = self._denemeler.get(no, 0) + 1
+            if self._denemeler[no] < EN_COK_DENEME: return False
+            del self._denemeler[no]
+            self._bekleyen = [k for k in self._bekleyen if k[0] != no]
+            self._bekletilen.append((no, mesaj, adimlar, f"{type(e).__name__}: {e}"))
+            self._tekli = max(self._tekli - 1, 0)
+            self.hata = self.sonraki_deneme = None
+            self._kosul.notify_all()
+        olcum().olay("kuyruk.bekletilen", no=no, mesaj=mesaj)
+        return True
+
+
+def yazici():
+    """Süreç boyunca paylaşılan yazıcı"""
+    global _yazici
+    with _kilit:
+        if _yazici is None:
+            _yazici = Yazici()
+        return _yazici
@@ -0,0 +1,222 @@
+"""Performans ölçümü.
+
+Süreler, sayaçlar ve anlık değerler (ör. kalan GitHub istek hakkı) süreç
+boyunca tek bir kayıtçıda toplanır. Her ölçümün son `SON` süresi tutulur;
+p50/p95 bunlardan hesaplanır.
+
+Her Streamlit çalıştırması (rerun) `calistirma_basla` / `calistirma_bitir`
+ile işaretlenir; o iş parçacığında ölçülen süreler çalıştırmanın dökümüne
+de eklenir. `st.rerun()` / `st.stop()` ile yarıda kalan çalıştırma, aynı
+oturumun bir sonraki çalıştırması başlarken son ölçüm anında kapatılır.
+
+Çalıştırma özetleri ve olaylar (hatalar, arka plan yazmaları) JSON
+satırları olarak `OLCUM_DOSYASI`na yazılır (varsayılan
+`.onbellek/olcum.jsonl`; boş değer dosyaya yazmayı kapatır). Dosya
+`EN_BUYUK_DOSYA`yı geçince `.1` uzantısıyla bir kez döndürülür.
+
+Yalnızca standart kütüphaneyi kullanır; ilk çizimi yavaşlatmaz.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from contextlib import contextmanager
+from functools import wraps
+
+OLCUM_DOSYASI = os.environ.get("OLCUM_DOSYASI", os.path.join(".onbellek", "olcum.jsonl"))
+SON = 500                 # ölçüm başına tutulan son süre
+CALISTIRMA = 200          # tutulan son çalıştırma
+EN_BUYUK_DOSYA = 5 << 20  # bayt
+
+_kilit = threading.Lock()
+_olcum = None
+
+
+def yuzdelik(degerler, oran):
+    """Sıralı olmayan listenin yüzdeliği (en yakın sıra); boşsa None"""
+    if not degerler: return None
+    s = sorted(degerler)
+    return s[min(len(s) - 1, max(0, round(oran * len(s)) - 1))]
+
+
+class Olcum:
+    """Süre, sayaç, anlık değer ve çalıştırma dökümü kayıtçısı"""
+
+    def __init__(self, dosya=OLCUM_DOSYASI):
+        self.dosya = dosya
+        self._kilit = threading.Lock()
+        self._yerel = threading.local()
+        self.sureler = defaultdict(lambda: deque(maxlen=SON))  # ad -> son süreler (sn)
+        self.toplam = Counter()                                # ad -> toplam süre (sn)
+        self.sayaclar = Counter()
+        self.degerler = {}                                     # ad -> (değer, zaman)
+        self.calistirmalar = deque(maxlen=CALISTIRMA)
+        self._acik = {}                                        # oturum -> açık çalıştırma
+
+    # --- KAYIT ---
+    def sure(self, ad, sn):
+        """Bir süre ölçümü ekler"""
+        with self._kilit:
+            self.sureler[ad].append(sn)
+            self.toplam[ad] += sn
+            self.sayaclar[ad] += 1
+        c = getattr(self._yerel, "calistirma", None)
+        if c is not None:
+            c["dokum"][ad] += sn
+            c["sayi"][ad] += 1
+            c["son"] = time.perf_counter()
+
+    @contextmanager
+    def olc(self, ad):
+        """Bloğun süresini ölçer (hata olsa da)"""
+        bas = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.sure(ad, time.perf_counter() - bas)
+
+    def say(self, ad, n=1):
+        with self._kilit:
+            self.sayaclar[ad] += n
+
+    def deger(self, ad, deger):
+        """Anlık değer (ör. kuyrukta bekleyen, kalan istek hakkı)"""
+        with self._kilit:
+            self.degerler[ad] = (deger, time.time())
+
+    def onbellek(self, ad, isabet):
+        """Önbellek isabeti/kaçırması sayar; oran `isabet_oranlari`nda"""
+        self.say(f"{ad}.{'isabet' if isabet else 'kacirma'}")
+
+    def olay(self, tur, **alanlar):
+        """Yapısal olay kaydı (hata, arka plan işi); sayılır ve günlüğe yazılır"""
+        self.say(f"olay.{tur}")
+        self._yaz({"tur": tur, "zaman": time.time(), **alanlar})
+
+    def hata(self, yer, e, **alanlar):
+        """Yakalanıp yutulan bir hatayı görünür kılar"""
+        self.olay("hata", yer=yer, hata=f"{type(e).__name__}: {e}", **alanlar)
+
+    # --- ÇALIŞTIRMALAR ---
+    def calistirma_basla(self, oturum, sayfa):
+        """Bu iş parçacığında yeni bir çalıştırma dökümü açar"""
+        with self._kilit:
+            onceki = self._acik.pop(oturum, None)
+        if onceki is not None: self._kapat(onceki, onceki["son"], tamam=False)
+        c = {"oturum": oturum, "sayfa": sayfa, "zaman": time.time(), "bas": time.perf_counter(),
+             "dokum": defaultdict(float), "sayi": Counter()}
+        c["son"] = c["bas"]
+        with self._kilit:
+            self._acik[oturum] = c
+        self._yerel.calistirma = c
+
+    def calistirma_bitir(self):
+        c = getattr(self._yerel, "calistirma", None)
+        if c is None: return
+        self._yerel.calistirma = None
+        with self._kilit:
+            if self._acik.get(c["oturum"]) is c: del self._acik[c["oturum"]]
+        self._kapat(c, time.perf_counter(), tamam=True)
+
+    def _kapat(self, c, bitis, tamam):
+        ozet = {"tur": "calistirma", "zaman": c["zaman"], "oturum": c["oturum"], "sayfa": c["sayfa"],
+                "sure_ms": round((bitis - c["bas"]) * 1000, 1), "tamam": tamam,
+                "dokum_ms": {ad: round(sn * 1000, 2) for ad, sn in sorted(c["dokum"].items(), key=lambda x: -x[1])},
+                "sayi": dict(c["sayi"])}
+        with self._kilit:
+            self.calistirmalar.append(ozet)
+        self.sure(f"calistirma.{c['sayfa']}", bitis - c["bas"])
+        self._yaz(ozet)
+
+    # --- GÜNLÜK ---
+    def _yaz(self, kayit):
+        if not self.dosya: return
+        satir = json.dumps(kayit, ensure_ascii=False, default=str) + "\n"
+        with self._kilit:
+            try:
+                os.makedirs(os.path.dirname(self.dosya) or ".", exist_ok=True)
+                if os.path.exists(self.dosya) and os.path.getsize(self.dosya) > EN_BUYUK_DOSYA:
+                    os.replace(self.dosya, self.dosya + ".1")
+                with open(self.dosya, "a", encoding="utf-8") as f:
+                    f.write(satir)
+            except OSError:
+                pass
+
+    # --- RAPOR ---
+    def sure_tablosu(self):
+        """Ölçüm başına sayı, p50, p95, en çok ve toplam (ms)"""
+        with self._kilit:
+            kopya = {ad: list(d) for ad, d in self.sureler.items()}
+            toplam, sayaclar = dict(self.toplam), dict(self.sayaclar)
+        return [{"Ölçüm": ad, "Sayı": sayaclar.get(ad, len(d)),
+                 "p50 (ms)": yuzdelik(d, 0.5) * 1000, "p95 (ms)": yuzdelik(d, 0.95) * 1000,
+                 "En çok (ms)": max(d) * 1000, "Toplam (sn)": toplam.get(ad, 0.0)}
+                for ad, d in sorted(kopya.items()) if d]
+
+    def isabet_oranlari(self):
+        """Önbellek adı -> (isabet, kaçırma, oran)"""
+        with self._kilit:
+            sayaclar = dict(self.sayaclar)
+        oranlar = {}
+        for ad, n in sayaclar.items():
+            if ad.endswith(".isabet") or ad.endswith(".kacirma"):
+                oranlar.setdefault(ad.rsplit(".", 1)[0], [0, 0])[ad.endswith(".kacirma")] += n
+        return {ad: (i, k, i / (i + k)) for ad, (i, k) in sorted(oranlar.items())}
+
+    def anlik(self):
+        with self._kilit:
+            return {"sayaclar": dict(self.sayaclar), "degerler": dict(self.degerler),
+                    "calistirmalar": list(self.calistirmalar)}
+
+
+def olcum():
+    """Süreç boyunca paylaşılan kayıtçı"""
+    global _olcum
+    with _kilit:
+        if _olcum is None:
+            _olcum = Olcum()
+        return _olcum
+
+
+def olculen(ad):
+    """Fonksiyonun her çağrısını `ad` altında ölçen süsleyici"""
+    def sus(fonk):
+        @wraps(fonk)
+        def sarili(*args, **kwargs):
+            with olcum().olc(ad):
+                return fonk(*args, **kwargs)
+        return sarili
+    return sus
+
+
+# --- GITHUB ---
+class _GithubSayaci(logging.Handler):
+    """PyGithub'ın istek günlüğünden istek sayısını ve kalan hakkı okur"""
+
+    def emit(self, kayit):
+        try:
+            fiil, durum, basliklar = kayit.args[0], kayit.args[6], kayit.args[7]
+        except (IndexError, TypeError):
+            return
+        o = olcum()
+        o.say("github.istek")
+        o.say(f"github.istek.{fiil}")
+        if durum >= 300: o.say(f"github.durum.{durum}")  # 304: koşullu istek önbellekten döndü
+        kalan, sinir = basliklar.get("x-ratelimit-remaining"), basliklar.get("x-ratelimit-limit")
+        if kalan is not None: o.deger("github.kalan_hak", f"{kalan}/{sinir}")
+
+
+def github_say():
+    """GitHub isteklerini saymaya başlar (birden çok çağrı zararsız).
+
+    PyGithub her isteği "github.Requester" günlüğüne DEBUG düzeyinde yazar;
+    bu günlük yalnızca sayaca bağlanır, üst günlüklere (yanıt gövdeleriyle)
+    iletilmez.
+    """
+    gunluk = logging.getLogger("github.Requester")
+    if any(isinstance(h, _GithubSayaci) for h in gunluk.handlers): return
+    gunluk.addHandler(_GithubSayaci(logging.DEBUG))
+    gunluk.setLevel(logging.DEBUG)
+    gunluk.propagate = False
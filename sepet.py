@@ -0,0 +1,169 @@
+"""Sütunlu sepet.
+
+Sepet tek bir DataFrame'de tutulur; her satırın girdileri yanında son
+hesaplanan kırılımları (Kg, tutarlar) da saklanır. Editörden dönen tablo
+önceki girdilerle karşılaştırılır, sadece değişen ("kirli") satırlar
+yeniden fiyatlanır ve toplamlar bu satırların eski katkısı çıkarılıp yenisi
+eklenerek güncellenir. Satır hesabı `hesap` modülüyle aynıdır.
+
+Toplamlar ayarlar, malzeme tablosu ve kurdan oluşan bir anahtara bağlıdır;
+bunlardan biri değişirse bütün sepet bir kez yeniden fiyatlanır, eski
+tutar hiçbir zaman gösterilmez.
+
+Editöre verilen tablo (`taban`) yalnızca satır eklenip silinince
+yenilenir ve o zaman `nesil` artar; Streamlit editörü düzenlemeleri
+tabana göre tuttuğu için taban her çalıştırmada değişmemelidir.
+"""
+import numpy as np
+import pandas as pd
+
+from hesap import SAYISAL, VARSAYILAN_YOG, kirilim, malzeme_tablosu, red_sebebi
+from olcum import olculen, olcum
+
+GIRDI = ["Malzeme", "Kalınlık", "En", "Boy", "Adet", "Süre", "Büküm", "Sil"]
+# toplam adı -> satır sütunu
+KATKI = {"kg": "Kg", "malzeme": "Malzeme Tutarı", "lazer": "Lazer Tutarı", "bukum": "Büküm Tutarı",
+         "ham": "Maliyet", "kar": "Kâr", "kdv": "KDV", "son": "Tutar"}
+SAYI = list(KATKI.values()) + ["Fiyat", "Yog"]
+
+
+def _farkli(a, b):
+    """İki dizinin farklı olan elemanları (iki tarafta da boş olan eşit sayılır)"""
+    with np.errstate(invalid="ignore"):
+        fark = np.asarray(a != b, dtype=bool)
+    return fark & ~(pd.isna(a) & pd.isna(b))
+
+
+def _girdiler(df):
+    """Tabloyu girdi sütunlarına indirir; Sil boşsa False olur"""
+    df = df.reindex(columns=GIRDI)
+    df["Sil"] = df["Sil"].fillna(False).astype(bool)
+    return df
+
+
+class Sepet:
+    """Kirli satır takipli, toplamları artımlı tutulan sepet"""
+
+    def __init__(self):
+        self.tablo = pd.DataFrame(columns=GIRDI).assign(**{c: np.nan for c in SAYI}, Sebep=None)
+        self.taban = self.tablo[GIRDI].copy()
+        self.nesil = 0
+        self.surum = 0       # fiyatlanmış satırlar her değiştiğinde artar
+        self.kirli = set()
+        self.anahtar = None  # fiyatların hesaplandığı ayar/malzeme/kur
+        self.toplam = dict.fromkeys(KATKI, 0.0)
+        self._malz = None    # Ad -> (TL fiyat, yoğunluk)
+        self._sira = 0
+
+    def __len__(self):
+        return len(self.tablo)
+
+    # --- GİRDİLER ---
+    def _yeni_satirlar(self, df):
+        df = _girdiler(df)
+        df.index = pd.RangeIndex(self._sira, self._sira + len(df))
+        self._sira += len(df)
+        self.kirli.update(df.index)
+        return df.assign(**{c: np.nan for c in SAYI}, Sebep=None)
+
+    def _tabani_yenile(self):
+        self.taban = self.tablo[GIRDI].copy()
+        self.nesil += 1
+
+    def ekle(self, satirlar):
+        """Satırları (sözlük listesi ya da DataFrame) sona ekler"""
+        df = satirlar.copy() if isinstance(satirlar, pd.DataFrame) else pd.DataFrame(list(satirlar))
+        if df.empty: return
+        yeni = self._yeni_satirlar(df)
+        self.tablo = yeni if self.tablo.empty else pd.concat([self.tablo, yeni])
+        self._tabani_yenile()
+
+    def _cikar(self, etiketler):
+        """Satırların toplamlardaki katkısını geri alır"""
+        if len(etiketler) == 0: return
+        konum = self.tablo.index.get_indexer(etiketler)
+        for ad, kolon in KATKI.items():
+            self.toplam[ad] -= float(np.nansum(self.tablo[kolon].to_numpy()[konum]))
+
+    def guncelle(self, duzenlenen):
+        """Editörden dönen tabloyu işler: değişen satırlar kirlenir, silinenler düşer.
+
+        Satır eklenip silindiyse taban yenilenir ve True döner; editör yeni
+        anahtarla hemen yeniden çizilmelidir.
+        """
+        d = _girdiler(duzenlenen)
+        if d.index.equals(self.tablo.index):
+            # Sık durum: satır yapısı aynı, hücreler karşılaştırılır
+            fark = np.zeros(len(d), dtype=bool)
+            for c in GIRDI:
+                fark |= _farkli(self.tablo[c].to_numpy(), d[c].to_numpy())
+            degisen = d.index[fark]
+            if len(degisen):
+                self.tablo.loc[degisen, GIRDI] = d.loc[degisen]
+                self.kirli.update(degisen)
+            return False
+
+        mevcut = d.index.isin(self.tablo.index) & ~d.index.duplicated()
+        kalan = d[mevcut]
+        silinen = self.tablo.index.difference(kalan.index)
+        self._cikar(silinen)
+        self.kirli.difference_update(silinen)
+        self.tablo = self.tablo.loc[kalan.index]  # editördeki sıra
+        self.surum += 1
+        self.guncelle(kalan)
+        if not mevcut.all():
+            self.tablo = pd.concat([self.tablo, self._yeni_satirlar(d[~mevcut])])
+        self._tabani_yenile()
+        return True
+
+    # --- FİYAT ---
+    @olculen("sepet.fiyatla")
+    def fiyatla(self, df_malz, kar, kdv_oran, lazer_dk, abkant_tl, dolar=None):
+        """Kirli satırları fiyatlar; sepet_hesapla ile aynı biçimde sonuç döner"""
+        malz_ozeti = int(pd.util.hash_pandas_object(df_malz, index=False).sum())
+        anahtar = (float(kar), float(kdv_oran), float(lazer_dk), float(abkant_tl), dolar, malz_ozeti)
+        if anahtar != self.anahtar:
+            m = malzeme_tablosu(df_malz, dolar)
+            self._malz = dict(zip(m.index, zip(m["Fiyat"], m["Yog"].fillna(VARSAYILAN_YOG), m["Kursuz"])))
+            self.tablo[SAYI] = np.nan
+            self.toplam = dict.fromkeys(KATKI, 0.0)
+            self.kirli = set(self.tablo.index)
+            self.anahtar = anahtar
+
+        olcum().say("sepet.kirli_satir", len(self.kirli))
+        if self.kirli:
+            konum = np.flatnonzero(self.tablo.index.isin(list(self.kirli)))
+            self._satirlari_fiyatla(konum, kar, kdv_oran, lazer_dk, abkant_tl)
+            self.kirli.clear()
+            self.surum += 1
+        return self.sonuc()
+
+    def _satirlari_fiyatla(self, konum, kar, kdv_oran, lazer_dk, abkant_tl):
+        t = self.tablo
+        d = {c: pd.to_numeric(t[c].to_numpy()[konum], errors="coerce").astype(float) for c in SAYISAL}
+        for c in ["Süre", "Büküm"]:
+            d[c] = np.where(np.isnan(d[c]), 0.0, d[c])  # boş süre/büküm "yok" demek
+        sil = t["Sil"].to_numpy()[konum].astype(bool)
+        # Tabloda olmayan malzemenin fiyatı boş kalır; red_sebebi reddeder
+        yok = (np.nan, VARSAYILAN_YOG, False)
+        fy = np.array([self._malz.get(a, yok) for a in t["Malzeme"].to_numpy()[konum]], dtype=float).reshape(-1, 3)
+        sebep = red_sebebi(d, fy[:, 0], fy[:, 2])
+        gecerli = (sebep == "") & ~sil
+        k = kirilim(d, fy[:, 0], fy[:, 1], kar, kdv_oran, lazer_dk, abkant_tl)
+        k["Fiyat"], k["Yog"] = fy[:, 0], fy[:, 1]
+
+        yeni = np.column_stack([np.where(gecerli, k[c], np.nan) for c in SAYI])
+        for ad, kolon in KATKI.items():
+            eski = t[kolon].to_numpy()[konum]
+            self.toplam[ad] += float(np.nansum(yeni[:, SAYI.index(kolon)]) - np.nansum(eski))
+        t.iloc[konum, t.columns.get_indexer(SAYI)] = yeni
+        t.iloc[konum, t.columns.get_loc("Sebep")] = np.where((sebep == "") | sil, None, sebep)
+
+    def sonuc(self):
+        """Fiyatlanan / reddedilen satırlar ve toplamlar"""
+        sil = self.tablo["Sil"].to_numpy(dtype=bool)
+        red = self.tablo["Sebep"].notna().to_numpy()
+        sonuc = {"satirlar": self.tablo[~red & ~sil], "reddedilen": self.tablo[red],
+                 "satir_sayisi": int((~sil).sum())}
+        sonuc.update(self.toplam)
+        return sonuc
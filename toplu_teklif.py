@@ -0,0 +1,221 @@
+"""Toplu teklif (arayüzsüz).
+
+ERP'den gelen büyük parça listelerini (CSV ya da Excel) parça parça okur;
+uygulamayla aynı malzeme tablosu, ayarlar ve fiyat kurallarıyla (`hesap`)
+fiyatlar, satır satır sonucu CSV'ye yazar ve toplamları özetler. Bellekte
+aynı anda yalnızca birkaç parça tutulur; `isci` > 1 ise parçalar ayrı
+süreçlerde fiyatlanır, çıktı sırası korunur.
+
+    python -m toplu_teklif girdi.csv -o sonuc.csv [--ozet ozet.json]
+        [--parca 100000] [--isci 4] [--ayrac ";"] [--ondalik ","]
+        [--malzemeler malz.csv] [--ayarlar ayar.csv] [--kur 34.5]
+
+Girdi sütunları sepetle aynıdır (Malzeme, Kalınlık, En, Boy, Adet, Süre,
+Büküm); diğer sütunlar (ör. ERP parça no) çıktıya olduğu gibi geçer.
+Reddedilen satırlar çıktıda tutarsız ve "Sebep" sütunu dolu olarak yer
+alır. Malzeme/ayar dosyası verilmezse uygulamanın kullandığı depo okunur.
+"""
+import argparse
+import concurrent.futures as cf
+import json
+import multiprocessing
+import os
+import time
+from collections import deque
+
+import pandas as pd
+
+from hesap import fiyat_ayarlari, sepet_hesapla
+
+try:  # varsa CSV yazımı pyarrow ile (pandas'tan birkaç kat hızlı)
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa = None
+
+PARCA = 100_000   # bir seferde okunan satır
+TOPLAMLAR = ["kg", "malzeme", "lazer", "bukum", "ham", "kar", "kdv", "son"]
+EK_SUTUNLAR = ["Fiyat", "Kg", "Malzeme Tutarı", "Lazer Tutarı", "Büküm Tutarı", "Maliyet", "Kâr", "KDV",
+               "Tutar", "Sebep"]
+
+_kaynak = None  # işçi süreçte (df_malz, ayar, dolar)
+
+
+# --- KAYNAKLAR ---
+def fiyat_kaynaklari(malzemeler=None, ayarlar=None, dolar=None):
+    """Malzeme tablosu, ayarlar ve (gerekirse) dolar kuru.
+
+    Dosya verilmezse tablolar uygulamanın deposundan (`depodan_oku`) okunur;
+    uygulamanın yazma kuyruğu kullanılmaz.
+    Dolar fiyatlı malzeme varsa ve kur verilmemişse kur servisinin son değeri
+    kullanılır; o da eskiyse bir kez beklenerek yenilenir. Kur hiç
+    çekilemediyse dolar None kalır; dolar fiyatlı satırlar "Kur yok"
+    sebebiyle reddedilir, diğerleri fiyatlanır.
+    """
+    if malzemeler is None or ayarlar is None:
+        from veri import depodan_oku
+    df_malz = depodan_oku("malzemeler.csv") if malzemeler is None else _dosya_oku("malzemeler.csv", malzemeler)
+    df_ayar = depodan_oku("ayarlar.csv") if ayarlar is None else _dosya_oku("ayarlar.csv", ayarlar)
+
+    usd = "Para" in df_malz.columns and df_malz["Para"].fillna("TL").astype(str).str.upper().eq("USD").any()
+    if usd and dolar is None:
+        from kur import kur_servisi
+        kur = kur_servisi()
+        if kur.yas() is None or kur.yas() > kur.sure: kur.yenile()
+        dolar = None if kur.yas() is None else kur.deger
+    return df_malz, fiyat_ayarlari(df_ayar), dolar
+
+
+def _dosya_oku(filename, yol):
+    """Yerel CSV'yi depodaki tabloyla aynı biçime getirir"""
+    from veri import duzelt
+    return duzelt(filename, pd.read_csv(yol))
+
+
+# --- OKUMA ---
+def parcalari_oku(yol, parca=PARCA, ayrac=",", ondalik="."):
+    """Girdi dosyasını `parca` satırlık DataFrame'ler halinde verir"""
+    if os.path.splitext(yol)[1].lower() in (".xlsx", ".xlsm"):
+        yield from _excel_parcalari(yol, parca)
+        return
+    yield from pd.read_csv(yol, sep=ayrac, decimal=ondalik, chunksize=parca, encoding="utf-8-sig")
+
+
+def _excel_parcalari(yol, parca):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportError("Excel okumak için openpyxl gerekli (pip install openpyxl); ya da CSV verin") from None
+    kitap = load_workbook(yol, read_only=True, data_only=True)
+    try:
+        satirlar = kitap.active.iter_rows(values_only=True)
+        basliklar = [str(b).strip() for b in next(satirlar, ())]
+        tampon = []
+        for satir in satirlar:
+            tampon.append(satir)
+            if len(tampon) == parca:
+                yield pd.DataFrame(tampon, columns=basliklar)
+                tampon = []
+        if tampon: yield pd.DataFrame(tampon, columns=basliklar)
+    finally:
+        kitap.close()
+
+
+# --- FİYAT ---
+def _isci_baslat(kaynak):
+    global _kaynak
+    _kaynak = kaynak
+
+
+def parca_fiyatla(df, kaynak=None, baslik=False):
+    """Bir parçayı fiyatlar: (satır satır çıktı CSV baytları, özet) döner.
+
+    Çıktı işçide CSV'ye çevrilir; ana süreç yalnızca sırayla dosyaya ekler.
+    """
+    df_malz, ayar, dolar = kaynak or _kaynak
+    res = sepet_hesapla(df, df_malz, ayar["kar"], ayar["kdv"], ayar["lazer_dk"], ayar["abkant"], dolar)
+    cikti = pd.concat([res["satirlar"], res["reddedilen"]]).sort_index()
+    cikti = cikti.reindex(columns=list(df.columns) + [c for c in EK_SUTUNLAR if c not in df.columns])
+    cikti = cikti.round({"Kg": 3, **{c: 2 for c in EK_SUTUNLAR if "Tutar" in c or c in ("Maliyet", "Kâr", "KDV")}})
+
+    grup = res["satirlar"].groupby("Malzeme")
+    malz = grup[["Kg", "Tutar"]].sum().join(grup.size().rename("Satır"))
+    ozet = {"satir": len(df), "fiyatlanan": len(res["satirlar"]), "reddedilen": len(res["reddedilen"]),
+            "toplam": {k: res[k] for k in TOPLAMLAR},
+            "malzeme": {str(m): {"Kg": float(r["Kg"]), "Tutar": float(r["Tutar"]), "Satır": int(r["Satır"])}
+                        for m, r in malz.iterrows()},
+            "sebep": {s: int(n) for s, n in res["reddedilen"]["Sebep"].value_counts().items()}}
+    return _csv(cikti, baslik), ozet
+
+
+def _csv(df, baslik):
+    if pa is None:
+        return df.to_csv(index=False, header=baslik).encode("utf-8")
+    tampon = pa.BufferOutputStream()
+    secenek = pa_csv.WriteOptions(include_header=baslik, quoting_style="needed")
+    pa_csv.write_csv(pa.Table.from_pandas(df, preserve_index=False), tampon, secenek)
+    return tampon.getvalue().to_pybytes()
+
+
+def _ozete_ekle(ozet, parca):
+    for k in ["satir", "fiyatlanan", "reddedilen"]:
+        ozet[k] += parca[k]
+    for k, v in parca["toplam"].items():
+        ozet["toplam"][k] += v
+    for m, r in parca["malzeme"].items():
+        hedef = ozet["malzeme"].setdefault(m, {"Kg": 0.0, "Tutar": 0.0, "Satır": 0})
+        for k, v in r.items():
+            hedef[k] += v
+    for s, n in parca["sebep"].items():
+        ozet["sebep"][s] = ozet["sebep"].get(s, 0) + n
+
+
+def toplu_fiyatla(girdi, cikti, kaynak=None, parca=PARCA, isci=1, ayrac=",", ondalik="."):
+    """Girdi dosyasını parça parça fiyatlayıp `cikti` CSV'sine yazar; özeti döner.
+
+    `kaynak` (df_malz, ayar, dolar) verilmezse `fiyat_kaynaklari()` kullanılır.
+    `isci` > 1 ise en çok 2 × isci parça aynı anda bellekte/işlemde olur.
+    """
+    kaynak = kaynak or fiyat_kaynaklari()
+    bas = time.perf_counter()
+    ozet = {"satir": 0, "fiyatlanan": 0, "reddedilen": 0, "toplam": dict.fromkeys(TOPLAMLAR, 0.0),
+            "malzeme": {}, "sebep": {}}
+    parcalar = enumerate(parcalari_oku(girdi, parca, ayrac, ondalik))
+    with open(cikti, "wb") as f:
+        def yaz(sonuc):
+            metin, parca_ozeti = sonuc
+            f.write(metin)
+            _ozete_ekle(ozet, parca_ozeti)
+
+        if isci <= 1:
+            for n, df in parcalar:
+                yaz(parca_fiyatla(df, kaynak, baslik=n == 0))
+        else:
+            # spawn: ana süreçteki arka plan iş parçacıkları (kur, yazıcı) çatallanmasın
+            with cf.ProcessPoolExecutor(isci, mp_context=multiprocessing.get_context("spawn"),
+                                        initializer=_isci_baslat, initargs=(kaynak,)) as havuz:
+                bekleyen = deque()
+                for n, df in parcalar:
+                    bekleyen.append(havuz.submit(parca_fiyatla, df, baslik=n == 0))
+                    if len(bekleyen) >= 2 * isci:
+                        yaz(bekleyen.popleft().result())
+                while bekleyen:
+                    yaz(bekleyen.popleft().result())
+        if ozet["satir"] == 0 and f.tell() == 0:
+            f.write((",".join(EK_SUTUNLAR) + "\n").encode("utf-8"))  # boş girdi: yalnızca başlık
+
+    ozet["ayarlar"], ozet["dolar"] = kaynak[1], kaynak[2]
+    ozet["sure_sn"] = round(time.perf_counter() - bas, 3)
+    return ozet
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(prog="python -m toplu_teklif", description="Parça listesini toplu fiyatlar")
+    p.add_argument("girdi", help="CSV ya da Excel (.xlsx) parça listesi")
+    p.add_argument("-o", "--cikti", required=True, help="satır satır sonuç CSV'si")
+    p.add_argument("--ozet", help="özetin yazılacağı JSON dosyası (verilmezse ekrana)")
+    p.add_argument("--parca", type=int, default=PARCA, help=f"bir seferde okunan satır (varsayılan {PARCA})")
+    p.add_argument("--isci", type=int, default=1, help="süreç sayısı (varsayılan 1)")
+    p.add_argument("--ayrac", default=",", help="CSV ayracı (varsayılan ,)")
+    p.add_argument("--ondalik", default=".", help="ondalık işareti (varsayılan .)")
+    p.add_argument("--malzemeler", help="malzeme CSV'si (verilmezse depodan)")
+    p.add_argument("--ayarlar", help="ayarlar CSV'si (verilmezse depodan)")
+    p.add_argument("--kur", type=float, help="USD/TRY kuru (verilmezse kur servisinden)")
+    a = p.parse_args(argv)
+
+    try:
+        kaynak = fiyat_kaynaklari(a.malzemeler, a.ayarlar, a.kur)
+    except ValueError as e:
+        p.error(str(e))
+    ozet = toplu_fiyatla(a.girdi, a.cikti, kaynak, a.parca, a.isci, a.ayrac, a.ondalik)
+    metin = json.dumps(ozet, ensure_ascii=False, indent=2)
+    if a.ozet:
+        with open(a.ozet, "w", encoding="utf-8") as f:
+            f.write(metin)
+    else:
+        print(metin)
+    return ozet
+
+
+if __name__ == "__main__":
+    main()
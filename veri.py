@@ -0,0 +1,365 @@
+"""Veri katmanı.
+
+Uygulama `load_data`/`save_data` ve `Islem` üzerinden konuşur; asıl okuma
+yazma seçili depoda (GitHub CSV ya da yerel SQLite) yapılır. Depo
+`st.secrets["depo"]["tur"]` ya da `DEPO_TUR` ortam değişkeniyle seçilir;
+GitHub bilgisi yoksa yerel SQLite kullanılır.
+"""
+import os
+import threading
+import time
+import uuid
+
+import pandas as pd
+import streamlit as st
+
+from olcum import olculen, olcum
+
+DOSYALAR = ["ayarlar.csv", "malzemeler.csv", "musteriler.csv", "siparisler.csv"]
+ANLIK_KLASORU = os.environ.get("ANLIK_KLASORU", os.path.join(".onbellek", "anlik"))
+ANLIK_SURESI = 60  # sn; yerel kopya bundan eskiyse arka planda tazelenir
+SIPARIS_KOLONLARI = ["Tarih", "Müşteri", "İş", "Tutar", "Detay"]
+
+_kilit = threading.Lock()
+_depo = None
+_anliklar = {}   # dosya adı -> (tablo, tazelenme zamanı)
+_tazelenen = set()
+
+
+class CakismaHatasi(Exception):
+    """Eşzamanlı yazmalar yüzünden kayıt yapılamadı"""
+
+
+# --- TABLO DÜZELTMELERİ ---
+def duzelt(filename, df):
+    """Sütun Düzeltmeleri"""
+    if "musteri" in filename:
+        rename_map = {"Firma Adı": "Firma", "Yetkili Kişi": "Yetkili", "Telefon": "Tel"}
+        df.rename(columns=rename_map, inplace=True)
+        for col in ["Firma", "Yetkili", "Tel", "Adres"]:
+            if col not in df.columns: df[col] = "-"
+
+    if "siparis" in filename:
+        rename_map = {"İş Adı": "İş", "Müşteri Adı": "Müşteri"}
+        df.rename(columns=rename_map, inplace=True)
+        for col in SIPARIS_KOLONLARI:
+            if col not in df.columns: df[col] = "-"
+        df = eski_kimlikler(df)
+
+    if "malz" in filename:
+        rename_map = {"Malzeme": "Ad", "Birim Fiyat": "Fiyat", "Yoğunluk": "Yog"}
+        df.rename(columns=rename_map, inplace=True)
+        if "Ad" not in df.columns: df["Ad"] = "Siyah Sac"
+        if "Fiyat" not in df.columns: df["Fiyat"] = 30.0
+        if "Yog" not in df.columns: df["Yog"] = 7.85
+        df["Para"] = df["Para"].fillna("TL") if "Para" in df.columns else "TL"
+        if "Birim" in df.columns: df = df.drop(columns=["Birim"])
+
+    return df
+
+
+def varsayilan(filename):
+    """Varsayılanlar"""
+    if "ayar" in filename: return pd.DataFrame([
+        {"Key":"kar", "Val":25.0}, {"Key":"kdv", "Val":20.0},
+        {"Key":"lazer_dk", "Val":25.0}, {"Key":"abkant", "Val":15.0}
+    ])
+    if "malz" in filename: return pd.DataFrame([
+        {"Ad":"Siyah Sac", "Fiyat":32.0, "Yog":7.85, "Para":"TL"},
+        {"Ad":"Paslanmaz", "Fiyat":180.0, "Yog":7.93, "Para":"TL"},
+        {"Ad":"Galvaniz", "Fiyat":45.0, "Yog":7.85, "Para":"TL"},
+        {"Ad":"ST52", "Fiyat":38.0, "Yog":7.85, "Para":"TL"},
+        {"Ad":"Hardox 400", "Fiyat":90.0, "Yog":7.85, "Para":"TL"},
+        {"Ad":"Hardox 450", "Fiyat":120.0, "Yog":7.85, "Para":"TL"},
+        {"Ad":"Hardox 500", "Fiyat":150.0, "Yog":7.85, "Para":"TL"}
+    ])
+    if "siparis" in filename: return pd.DataFrame(columns=SIPARIS_KOLONLARI + ["ID"])
+    if "musteri" in filename: return pd.DataFrame(columns=["Firma", "Yetkili", "Tel", "Adres"])
+    return pd.DataFrame()
+
+
+# --- SİPARİŞ KİMLİKLERİ ---
+# Kimlikler harfle başlar; CSV okunurken sayıya çevrilmesinler
+def yeni_kimlikler(n):
+    """Yeni siparişler için rastgele kimlikler"""
+    return ["s" + uuid.uuid4().hex[:15] for _ in range(n)]
+
+
+def kimlik_ver(df):
+    """ID'si olmayan satırlara yeni kimlik verir"""
+    df = df.copy()
+    if "ID" not in df.columns: df["ID"] = None
+    eksik = df["ID"].isna()
+    df.loc[eksik, "ID"] = yeni_kimlikler(int(eksik.sum()))
+    return df
+
+
+def eski_kimlikler(df):
+    """ID'siz eski kayıtlara içerikten türeyen kimlik verir.
+
+    Aynı tablo her okunduğunda aynı kimlikler çıkar; kimlikler ilk yazmada
+    dosyaya kalıcı olarak geçer. Birebir aynı satırlar sıra numarasıyla ayrılır.
+    """
+    if "ID" not in df.columns: df["ID"] = None
+    eksik = df["ID"].isna() | df["ID"].astype(str).isin(["", "-", "nan"])
+    if not eksik.any(): return df
+    anahtar = df.loc[eksik, SIPARIS_KOLONLARI].astype(str)
+    anahtar["_sira"] = anahtar.groupby(SIPARIS_KOLONLARI).cumcount()
+    ozet = pd.util.hash_pandas_object(anahtar, index=False)
+    df["ID"] = df["ID"].astype(object)
+    df.loc[eksik, "ID"] = ["e" + format(h, "016x")[:15] for h in ozet]
+    return df
+
+
+def satir_ekle(df, satirlar, benzersiz=None):
+    """Satırları sona ekler; `benzersiz` sütununda zaten olanları atlar"""
+    if benzersiz is not None:
+        satirlar = satirlar[~satirlar[benzersiz].isin(df[benzersiz])]
+    if satirlar.empty: return df
+    if df.empty: return satirlar.reset_index(drop=True)
+    return pd.concat([df, satirlar], ignore_index=True)
+
+
+def satir_sil(df, anahtar, degerler):
+    """`anahtar` sütunu `degerler` içinde olan satırları çıkarır"""
+    maske = df[anahtar].isin(degerler)
+    if not maske.any(): return df
+    return df[~maske].reset_index(drop=True)
+
+
+def adim_uygula(df, tur, tablo, secenek):
+    """Tek adımı bellekteki tabloya uygular"""
+    if tur == "ekle": return satir_ekle(df, tablo, secenek)
+    if tur == "sil": return satir_sil(df, secenek, tablo[secenek])
+    return tablo
+
+
+# --- DEPO ARAYÜZÜ ---
+class Depo:
+    """Depolama arayüzü.
+
+    `oku` dosyanın düzeltilmiş tablosunu döner (yoksa KeyError).
+    `uygula` (tür, dosya, tablo, seçenek) adımlarını ya hep ya hiç yazar.
+    Türler: "ekle" (seçenek: benzersiz sütun), "yaz" ve "sil" (tablo:
+    silinecek değerler, seçenek: anahtar sütun).
+    """
+
+    def oku(self, filename):
+        raise NotImplementedError
+
+    def uygula(self, mesaj, adimlar):
+        raise NotImplementedError
+
+    def siparisler(self, bas=None, son=None, musteri=None):
+        """Tarih aralığı / müşteriye göre siparişler"""
+        return siparis_suz(self.oku("siparisler.csv"), bas, son, musteri)
+
+
+def son_siniri(son):
+    """`son` için dışlayan üst sınır; yalnız tarih verilmişse o gün dahildir"""
+    if not hasattr(son, "hour"):
+        return pd.Timestamp(son) + pd.Timedelta(days=1)
+    return pd.Timestamp(son).floor("min") + pd.Timedelta(minutes=1)
+
+
+def siparis_suz(df, bas=None, son=None, musteri=None):
+    """Siparişleri tarih aralığı (son dahil) / müşteriye göre süzer"""
+    zaman = pd.to_datetime(df["Tarih"], format="%d-%m-%Y %H:%M", errors="coerce")
+    maske = pd.Series(True, index=df.index)
+    if bas is not None: maske &= zaman >= pd.Timestamp(bas)
+    if son is not None: maske &= zaman < son_siniri(son)
+    if musteri is not None: maske &= df["Müşteri"] == musteri
+    return df[maske]
+
+
+def gizli_ayar(bolum):
+    """st.secrets bölümü; secrets dosyası yoksa boş"""
+    try:
+        return dict(st.secrets.get(bolum, {}))
+    except Exception:
+        return {}
+
+
+def depo_olustur(tur=None, yol=None):
+    """Türüne göre depo nesnesi kurar"""
+    secenek = gizli_ayar("depo")
+    tur = tur or os.environ.get("DEPO_TUR") or secenek.get("tur") or ("github" if gizli_ayar("github") else "sqlite")
+    if tur == "github":
+        from depo_github import GithubDepo
+        return GithubDepo()
+    if tur == "sqlite":
+        from depo_sqlite import SqliteDepo
+        return SqliteDepo(yol or os.environ.get("DEPO_YOL") or secenek.get("yol", "veri.db"))
+    raise ValueError(f"Bilinmeyen depo türü: {tur}")
+
+
+def aktif_depo():
+    """Süreç boyunca paylaşılan depo"""
+    global _depo
+    with _kilit:
+        if _depo is None:
+            _depo = depo_olustur()
+        return _depo
+
+
+# --- OKUMA / YAZMA ---
+def load_data(filename):
+    """Veriyi okur (kuyrukta bekleyen yazmalar dahil)"""
+    from kuyruk import yazici
+    with olcum().olc("veri.load_data"):
+        try:
+            # Önbellekteki tabloyu çağıran değiştiremesin
+            df = aktif_depo().oku(filename).copy()
+        except Exception as e:
+            if not isinstance(e, KeyError): olcum().hata("load_data", e, dosya=filename)  # KeyError: tablo henüz yok
+            df = varsayilan(filename)
+        return yazici().ustune_uygula(filename, df)
+
+
+def siparis_oku(bas=None, son=None, musteri=None):
+    """Aralıktaki siparişler (kuyrukta bekleyenler dahil); depo yalnızca aralığı okur"""
+    from kuyruk import yazici
+    with olcum().olc("veri.siparis_oku"):
+        try:
+            df = aktif_depo().siparisler(bas, son, musteri).copy()
+        except Exception as e:
+            if not isinstance(e, KeyError): olcum().hata("siparis_oku", e)
+            df = varsayilan("siparisler.csv")
+        return siparis_suz(yazici().ustune_uygula("siparisler.csv", df), bas, son, musteri)
+
+
+@olculen("veri.save_data")
+def save_data(filename, df):
+    """Veriyi kaydeder (arka planda)"""
+    Islem("Update").yaz(filename, df).kuyruga_al()
+
+
+# --- YEREL KOPYA ---
+def _anlik_yolu(filename):
+    return os.path.join(ANLIK_KLASORU, filename)
+
+
+def _anlik_koy(filename, df):
+    _anliklar[filename] = (df, time.time())
+    try:
+        os.makedirs(ANLIK_KLASORU, exist_ok=True)
+        gecici = _anlik_yolu(filename) + ".tmp"
+        df.to_csv(gecici, index=False)
+        os.replace(gecici, _anlik_yolu(filename))
+    except OSError:
+        pass
+
+
+def anlik_uygula(adimlar):
+    """Depoya yazılan adımları bellekteki yerel kopyalara da uygular"""
+    for tur, filename, tablo, secenek in adimlar:
+        if filename in _anliklar:
+            _anlik_koy(filename, adim_uygula(_anliklar[filename][0], tur, tablo, secenek))
+
+
+def _tazele(filename):
+    """Tabloyu depodan okuyup yerel kopyayı günceller"""
+    try:
+        with olcum().olc("veri.tazele"):
+            df = aktif_depo().oku(filename).copy()
+    except KeyError:
+        return None  # tablo henüz yok
+    except Exception as e:
+        olcum().hata("tazele", e, dosya=filename)
+        return None
+    _anlik_koy(filename, df)
+    return df
+
+
+def _arka_planda_tazele(filename):
+    with _kilit:
+        if filename in _tazelenen: return
+        _tazelenen.add(filename)
+
+    def calis():
+        try:
+            _tazele(filename)
+        finally:
+            with _kilit: _tazelenen.discard(filename)
+
+    threading.Thread(target=calis, name=f"tazele-{filename}", daemon=True).start()
+
+
+def anlik_oku(filename):
+    """Küçük tablolar (ayarlar, malzemeler, müşteriler) için hızlı okuma.
+
+    Önce bellekteki, yoksa diskteki yerel kopyayı döner; kopya eskiyse depo
+    arka planda okunur. Hiç kopya yoksa depodan beklenerek okunur.
+    """
+    from kuyruk import yazici
+    df, zaman = _anliklar.get(filename, (None, 0))
+    if df is None and os.path.exists(_anlik_yolu(filename)):
+        try:
+            df = duzelt(filename, pd.read_csv(_anlik_yolu(filename)))
+            _anliklar[filename] = (df, 0)
+        except Exception as e:
+            olcum().hata("anlik_oku", e, dosya=filename)
+            df = None
+    olcum().onbellek("anlik", df is not None)
+    if df is None:
+        df = _tazele(filename)
+        if df is None: df = varsayilan(filename)
+    elif time.time() - zaman > ANLIK_SURESI:
+        _arka_planda_tazele(filename)
+    return yazici().ustune_uygula(filename, df.copy())
+
+
+def depodan_oku(filename):
+    """Arayüzsüz araçlar için okuma: depo, olmazsa yerel kopya, o da yoksa varsayılan.
+
+    Kuyruğa bakmaz, yazıcı başlatmaz; diğer süreçlerin günlüğüne dokunmaz.
+    """
+    df = _tazele(filename)
+    if df is None and os.path.exists(_anlik_yolu(filename)):
+        try:
+            df = duzelt(filename, pd.read_csv(_anlik_yolu(filename)))
+        except Exception as e:
+            olcum().hata("depodan_oku", e, dosya=filename)
+    return varsayilan(filename) if df is None else df
+
+
+class Islem:
+    """Birden fazla tablo değişikliğini tek seferde yazar.
+
+    Adımlar (tür, dosya, tablo, seçenek) olarak saklanır; depo çakışmada
+    bunları en güncel sürümün üzerine yeniden uygulayabilir.
+    """
+
+    def __init__(self, mesaj, depo=None):
+        self.mesaj = mesaj
+        self.depo = depo
+        self.adimlar = []
+
+    def ekle(self, filename, satirlar, benzersiz=None):
+        """Satırları dosyanın sonuna ekler; `benzersiz` sütununda zaten olanları atlar"""
+        if "siparis" in filename:
+            # Kimliğe göre benzersiz: aynı işlem yeniden gönderilirse çift kayıt olmaz
+            satirlar = kimlik_ver(satirlar)
+            benzersiz = benzersiz or "ID"
+        self.adimlar.append(("ekle", filename, satirlar, benzersiz))
+        return self
+
+    def sil(self, filename, degerler, anahtar="ID"):
+        """`anahtar` sütunu `degerler` içinde olan satırları siler"""
+        self.adimlar.append(("sil", filename, pd.DataFrame({anahtar: list(degerler)}), anahtar))
+        return self
+
+    def yaz(self, filename, df):
+        """Dosyayı tamamen df ile değiştirir (son yazan kazanır)"""
+        self.adimlar.append(("yaz", filename, df, None))
+        return self
+
+    def kaydet(self):
+        """Adımları hemen yazar; depo ne dönerse (commit vb.) onu döner"""
+        with olcum().olc("depo.uygula"):
+            return (self.depo or aktif_depo()).uygula(self.mesaj, self.adimlar)
+
+    def kuyruga_al(self):
+        """Adımları arka plan yazıcısına bırakır; kayıt numarasını döner"""
+        from kuyruk import yazici
+        return yazici().ekle(self.mesaj, self.adimlar)
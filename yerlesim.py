@@ -0,0 +1,202 @@
+"""Plaka yerleşimi (nesting) tahmini.
+
+Sepetteki parçalar malzeme ve kalınlığa göre gruplanır; her grup standart
+plaka ölçülerine "skyline" sezgisiyle yerleştirilir: parça, plakadaki
+doluluk çizgisinin üstünde en alçakta biteceği yere (eşitlikte en sola)
+konur, 90° döndürülmüş hali de denenir. Farklı parça sıralamaları ve plaka
+ölçüleri süre bütçesi dolana kadar denenir, en az plaka alanı kullanan
+seçilir. Sonuç plaka sayısı, doluluk ve fire olarak döner.
+
+Süre bütçesi yerleştirme döngüsünün içinde de denetlenir: ilk deneme
+bile bitmezse yerleşen plakalar sayılır, kalan parçalar o plakaların
+doluluğuyla alandan tahmin edilir. `EN_COK_PARCA`dan çok parçalı grupta
+eşit aralıklı bir örnek yerleştirilip plaka sayısı alanla ölçeklenir. Bu
+durumlarda sonuç "tahmini" işaretlenir. Sepetin toplam bütçesi
+(`SEPET_SURESI`) dolunca kalan gruplar yalnızca alandan tahmin edilir.
+
+Grup sonuçları içerikleriyle önbelleğe alınır; sepette bir satır değişince
+yalnızca o satırın grubu yeniden yerleştirilir.
+"""
+import math
+import time
+from functools import lru_cache
+
+import pandas as pd
+
+from olcum import olcum
+
+PLAKALAR = ((3000, 1500), (2500, 1250), (2000, 1000))  # mm
+ARALIK = 5     # parçalar arası kesim payı (mm)
+SURE = 0.2     # grup başına süre bütçesi (sn)
+SEPET_SURESI = 1.0  # bütün sepetin bütçesi (sn)
+EN_COK_PARCA = 600  # grup başına yerleştirilen en çok parça
+TAHMINI_DOLULUK = 0.8  # hiç plaka yerleşmeden süre biterse varsayılan doluluk
+
+# Denenen parça sıralamaları (w >= h olacak şekilde), en iyi bilinenden başlayarak
+SIRALAR = [
+    lambda p: (-p[0] * p[1], -p[0]),       # alan
+    lambda p: (-p[0], -p[1]),              # uzun kenar
+    lambda p: (-p[1], -p[0]),              # kısa kenar
+    lambda p: (-(p[0] + p[1]), -p[0]),     # çevre
+]
+
+
+class _Plaka:
+    """Tek plakanın doluluk çizgisi: soldan sağa [x, y, genişlik] parçaları"""
+
+    def __init__(self, en, boy):
+        self.en, self.boy = en, boy
+        self.cizgi = [[0, 0, en]]
+        self.bos = en * boy
+
+    def bul(self, w, h):
+        """Parçanın en alçakta biteceği yer: (bitiş, x, y, sıra, w, h) ya da None"""
+        en_iyi = None
+        for pw, ph in ((w, h), (h, w)) if w != h else ((w, h),):
+            for i, (x, _, _) in enumerate(self.cizgi):
+                if x + pw > self.en: break
+                y, j, kalan = 0, i, pw
+                # Ondalıklı ölçülerde genişlik toplamı yuvarlanır; çizginin sonu aşılmasın
+                while kalan > 1e-6 and j < len(self.cizgi):
+                    y = max(y, self.cizgi[j][1])
+                    kalan -= self.cizgi[j][2]
+                    j += 1
+                if kalan > 1e-6 or y + ph > self.boy: continue
+                if en_iyi is None or (y + ph, x) < en_iyi[:2]:
+                    en_iyi = (y + ph, x, y, i, pw, ph)
+        return en_iyi
+
+    def koy(self, yer):
+        ust, x, _, i, w, h = yer
+        son = x + w
+        j = i
+        while j < len(self.cizgi) and self.cizgi[j][0] < son:
+            j += 1
+        sx, sy, sw = self.cizgi[j - 1]
+        yeni = [[x, ust, w]] + ([[son, sy, sx + sw - son]] if sx + sw - son > 1e-6 else [])
+        self.cizgi[i:j] = yeni
+        # Aynı yükseklikteki komşular birleşir
+        k = max(i - 1, 0)
+        while k < len(self.cizgi) - 1 and k <= i + 1:
+            if self.cizgi[k][1] == self.cizgi[k + 1][1]:
+                self.cizgi[k][2] += self.cizgi.pop(k + 1)[2]
+            else:
+                k += 1
+        self.bos -= w * h
+
+
+def _yerlestir(parcalar, en, boy, aralik, bitis=None):
+    """Parçaları sırayla ilk uyan plakaya koyar: (plakalar, yerleşmeyen alan).
+
+    `bitis` geçerse kalan parçalar yerleştirilmez; kesim paylı alanları
+    toplamı döner (bitmiş yerleşimde 0).
+    """
+    plakalar = []
+    for n, (w, h) in enumerate(parcalar):
+        if bitis is not None and n % 16 == 0 and time.perf_counter() > bitis:
+            return plakalar, sum((w + aralik) * (h + aralik) for w, h in parcalar[n:])
+        w, h = w + aralik, h + aralik
+        for p in plakalar:
+            if p.bos < w * h: continue
+            yer = p.bul(w, h)
+            if yer: break
+        else:
+            p = _Plaka(en + aralik, boy + aralik)
+            plakalar.append(p)
+            yer = p.bul(w, h)
+        p.koy(yer)
+    return plakalar, 0
+
+
+def _sigar(w, h, en, boy):
+    return (w <= en and h <= boy) or (h <= en and w <= boy)
+
+
+@lru_cache(maxsize=512)
+def grup_yerlesimi(parcalar, plakalar=PLAKALAR, aralik=ARALIK, sure=SURE):
+    """Bir malzeme/kalınlık grubunun yerleşimi.
+
+    `parcalar` (en, boy) demetleridir (adet kadar tekrarlı). Dönen sözlük:
+    "plaka" (en, boy), "sayi", "parca_alani", "sigmayan" (hiçbir plakaya
+    sığmayan parçalar), "doluluk" (0-1) ve "tahmini" (süre ya da parça
+    sınırı yüzünden sayının bir kısmı alandan tahmin edildiyse True).
+    """
+    bitis = time.perf_counter() + sure
+    parcalar = [(max(w, h), min(w, h)) for w, h in parcalar]
+    adim = -(-len(parcalar) // EN_COK_PARCA)
+    ornek = parcalar[::adim] if adim > 1 else parcalar
+    en_iyi = None
+    for sira in SIRALAR:
+        for en, boy in plakalar:
+            if en_iyi is not None and time.perf_counter() > bitis: break
+            uyan = [p for p in ornek if _sigar(p[0], p[1], en, boy)]
+            yerlesen, kalan = _yerlestir(sorted(uyan, key=sira), en, boy, aralik, bitis) if uyan else ([], 0)
+            if kalan and en_iyi is not None: break  # yarım kalan deneme bitmişlerle kıyaslanamaz
+            sayi = len(yerlesen)
+            if kalan:
+                # İlk deneme bile bitmedi: kalan alan yerleşenlerin doluluğuyla plakaya çevrilir
+                dolu = sum(p.en * p.boy - p.bos for p in yerlesen) / sum(p.en * p.boy for p in yerlesen) if yerlesen \
+                    else TAHMINI_DOLULUK
+                sayi += math.ceil(kalan / ((en + aralik) * (boy + aralik) * max(dolu, 0.5)))
+            # Önce sığmayan az olsun, sonra toplam plaka alanı küçük olsun
+            puan = (len(ornek) - len(uyan), sayi * en * boy)
+            if en_iyi is None or puan < en_iyi[0]:
+                en_iyi = (puan, (en, boy), sayi, uyan, bool(kalan))
+        else:
+            continue
+        break
+
+    _, plaka, sayi, uyan, tahmini = en_iyi
+    ornek_alani = sum(w * h for w, h in uyan)
+    uyan = [p for p in parcalar if _sigar(p[0], p[1], *plaka)] if adim > 1 else uyan
+    alan = sum(w * h for w, h in uyan)
+    if adim > 1 and ornek_alani:
+        sayi = math.ceil(sayi * alan / ornek_alani)  # örnekten bütün gruba
+    return {"plaka": plaka, "sayi": sayi, "parca_alani": alan,
+            "sigmayan": len(parcalar) - len(uyan),
+            "doluluk": alan / (sayi * plaka[0] * plaka[1]) if sayi else 0.0,
+            "tahmini": tahmini or adim > 1}
+
+
+def sepet_yerlesimi(satirlar, plakalar=PLAKALAR, aralik=ARALIK, sure=SURE, sepet_suresi=SEPET_SURESI):
+    """Fiyatlanmış sepet satırlarını malzeme/kalınlık gruplarında plakalara yerleştirir.
+
+    `satirlar` Malzeme, Kalınlık, En, Boy, Adet ve (varsa) Yog, Fiyat
+    sütunlu tablodur (sepet_hesapla'nın "satirlar"ı). Grup başına plaka
+    ölçüsü, plaka sayısı, doluluk, plaka/parça/fire kg'ı ve fire tutarı
+    (Fiyat varsa; tam plaka fiyatlamada eklenen malzeme bedeli) döner.
+    "Tahmini" sütunu plaka sayısı kısmen alandan tahmin edilen grupları
+    işaretler.
+    """
+    kolonlar = ["Malzeme", "Kalınlık", "Plaka", "Plaka Sayısı", "Parça", "Sığmayan", "Doluluk (%)",
+                "Plaka Kg", "Parça Kg", "Fire Kg", "Fire Tutarı", "Tahmini"]
+    if satirlar.empty: return pd.DataFrame(columns=kolonlar)
+    with olcum().olc("yerlesim.sepet"):
+        return _sepet_yerlesimi(satirlar, kolonlar, plakalar, aralik, sure, time.perf_counter() + sepet_suresi)
+
+
+def _sepet_yerlesimi(satirlar, kolonlar, plakalar, aralik, sure, bitis):
+    df = satirlar.assign(Adet=pd.to_numeric(satirlar["Adet"], errors="coerce").fillna(1).astype(int).clip(lower=1))
+    if "Yog" not in df.columns: df = df.assign(Yog=7.85)
+
+    sonuc = []
+    for (malz, kal), g in df.groupby(["Malzeme", "Kalınlık"], sort=False):
+        olculer = zip(g["En"].round(1), g["Boy"].round(1), g["Adet"])
+        parcalar = tuple(sorted(p for w, h, adet in olculer for p in [(float(w), float(h))] * adet))
+        isabet = grup_yerlesimi.cache_info().hits
+        # Sepet bütçesi dolduysa (önbellekte yoksa) grup yalnızca alandan tahmin edilir
+        grup_suresi = sure if time.perf_counter() < bitis else 0.0
+        y = grup_yerlesimi(parcalar, tuple(plakalar), aralik, grup_suresi)
+        olcum().onbellek("yerlesim", grup_yerlesimi.cache_info().hits > isabet)
+        yog, fiyat = float(g["Yog"].iloc[0]), float(g["Fiyat"].iloc[0]) if "Fiyat" in g.columns else float("nan")
+        # Sığmayan parçalar tek başına (kendi dikdörtgeni kadar) hesaplanır
+        plaka_kg = y["sayi"] * y["plaka"][0] * y["plaka"][1] * kal * yog / 1_000_000
+        parca_kg = y["parca_alani"] * kal * yog / 1_000_000
+        sonuc.append({
+            "Malzeme": malz, "Kalınlık": kal, "Plaka": f"{y['plaka'][0]}×{y['plaka'][1]}",
+            "Plaka Sayısı": y["sayi"], "Parça": len(parcalar), "Sığmayan": y["sigmayan"],
+            "Doluluk (%)": round(y["doluluk"] * 100, 1), "Plaka Kg": plaka_kg, "Parça Kg": parca_kg,
+            "Fire Kg": plaka_kg - parca_kg, "Fire Tutarı": (plaka_kg - parca_kg) * fiyat,
+            "Tahmini": y["tahmini"],
+        })
+    return pd.DataFrame(sonuc, columns=kolonlar)